@@ -297,6 +297,19 @@ class Options:
     .. versionadded:: 2.0.16
     """
 
+    shader_cache_path: str | None = None
+    """A directory in which to cache linked :py:class:`~pyglet.graphics.shader.ShaderProgram` binaries.
+
+    If set, the binary of each linked program is saved to this directory, along with its introspected attributes and
+    uniforms. Later runs with the same shader sources and the same OpenGL driver load the binary directly, and skip
+    compiling and linking. Shader compilation errors are only reported when a program is actually linked.
+
+    Requires OpenGL 4.1, or the ``GL_ARB_get_program_binary`` extension. The directory is created if it does not
+    exist. Stale or invalid cache files are replaced automatically. Defaults to ``None``, which disables the cache.
+
+    .. versionadded:: 2.1.16
+    """
+
     def get(self, item: str, default: Any = None) -> Any:
         return self.__dict__.get(item, default)
 
@@ -325,6 +338,8 @@ for _option_name, _type_str in options.__annotations__.items():
             setattr(options, _option_name, int(_value))
         elif 'Literal' in _type_str and _value in _type_str:
             setattr(options, _option_name, _value)
+        elif _type_str.startswith('str'):
+            setattr(options, _option_name, _value)
         else:
             warnings.warn(f"Invalid value '{_value}' for {_option_name}. Expecting {_type_str}")
 
@@ -42,6 +42,7 @@ geometry_source = """#version 150
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
 
@@ -159,6 +159,7 @@ def _get_default_mt_shader(images: dict[str, Texture]) -> ShaderProgram:
     uniform WindowBlock {{
         mat4 projection;
         mat4 view;
+        float time;
     }} window;
     mat4 m_scale = mat4(1.0);
     mat4 m_rotation = mat4(1.0);
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import sys
-import time
 
 import pyglet
 from pyglet import clock, event, graphics, image
@@ -56,10 +55,9 @@ geometry_source = """#version 150
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
-    uniform float time;
-
     // Since geometry shader can take multiple values from a vertex
     // shader we need to define the inputs from it as arrays.
     // For our purposes, we just take single values (points).
@@ -87,7 +85,7 @@ geometry_source = """#version 150
         vec2 spread = geo_velocity[0].zw;
 
         float birth = geo_birth[0];
-        float elapsed = time - birth;
+        float elapsed = window.time - birth;
         float repeater = mod(elapsed, 1.0);
 
         int vert_id = geo_vert_id[0];
@@ -280,7 +278,7 @@ class Emitter(event.EventDispatcher):
 
             texture_uv=('f', texture.uv * count),
             rotation=('f', (self._rotation,) * count),
-            birth=('f', (time.perf_counter(),) * count))
+            birth=('f', (pyglet.window.get_shader_time(),) * count))
 
     @property
     def program(self):
@@ -395,15 +393,11 @@ class ParticleManager:
         self._batch = batch
         self._group = group
         self._program = get_default_shader()
-        clock.schedule_interval(self._update_shader_time, 1 / 60)
 
         # TODO: remove debug
         self.total_number = 0
         self.total_label = pyglet.text.Label("particles: 0", 10, 10, dpi=256, color=(10, 200, 10), batch=batch)
 
-    def _update_shader_time(self, dt):
-        self._program['time'] = time.perf_counter()
-
     def _delete_callback(self, dt, emitter):
         emitter.delete()
 
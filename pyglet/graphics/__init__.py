@@ -9,18 +9,17 @@ See the :ref:`guide_graphics` for details on how to use this graphics API.
 from __future__ import annotations
 
 import ctypes
+import time
 import weakref
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Literal, Sequence, Tuple
 
 import pyglet
 from pyglet.gl.gl import (
-    GL_TEXTURE0,
+    GL_DYNAMIC_DRAW,
     GL_UNSIGNED_BYTE,
     GL_UNSIGNED_INT,
     GL_UNSIGNED_SHORT,
     GLuint,
-    glActiveTexture,
-    glBindTexture,
     glBindVertexArray,
     glDeleteVertexArrays,
     glDrawArrays,
@@ -28,7 +27,10 @@ from pyglet.gl.gl import (
     glFlush,
     glGenVertexArrays,
 )
-from pyglet.graphics import shader, vertexdomain
+from pyglet.graphics import allocation, shader, state, vertexdomain
+from pyglet.graphics.culling import SpatialGrid, get_visible_regions
+from pyglet.graphics.sorting import SORTABLE_MODES, DrawOrder
+from pyglet.graphics.stats import RenderStats, get_upload_totals
 from pyglet.graphics.vertexarray import VertexArray  # noqa: F401
 from pyglet.graphics.vertexbuffer import BufferObject
 
@@ -177,6 +179,7 @@ _vertex_source: str = """#version 330 core
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     void main()
@@ -211,6 +214,7 @@ _blit_vertex_source: str = """#version 330 core
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     void main()
@@ -272,7 +276,34 @@ _domain_class_map: dict[tuple[bool, bool], type[vertexdomain.VertexDomain]] = {
     (True, True): vertexdomain.InstancedIndexedVertexDomain,
 }
 
-DomainKey = Tuple[bool, int, int, str]
+DomainKey = Tuple[bool, int, int, int, shader.VertexLayout]
+
+
+def _shared_signature(vertex_list: VertexList | IndexedVertexList, instance_attributes: Sequence[str]) -> tuple | None:
+    """Get the data that must match for vertex lists to be drawn as instances of each other.
+
+    Returns ``None`` if an instance attribute varies between the vertices of
+    the vertex list, so it cannot be instanced.
+    """
+    signature = [vertex_list.count]
+    for name, buffer in vertex_list.domain.attrib_name_buffers.items():
+        data = bytes(buffer.get_region(vertex_list.start, vertex_list.count))
+        if name in instance_attributes:
+            if data != data[:buffer.stride] * vertex_list.count:
+                return None
+        else:
+            signature.append(data)
+    if vertex_list.indexed:
+        signature.append(tuple(vertex_list.indices))
+    return tuple(signature)
+
+# Draw list command opcodes:
+_CMD_SET_STATE = 0
+_CMD_UNSET_STATE = 1
+_CMD_COMMIT = 2
+_CMD_DRAW = 3
+
+DrawCommand = Tuple[int, Any, int]
 
 class Batch:
     """Manage a collection of drawables for batched rendering.
@@ -300,14 +331,67 @@ class Batch:
     information about how the domains are to be drawn. To implement batching on
     a custom drawable, get your vertex domains from the given batch instead of
     setting them up yourself.
+
+    The group tree is compiled into a flat list of draw commands, which is only
+    rebuilt when groups or domains are added, removed, or re-ordered.
+
+    A batch created with ``culling`` enabled can skip drawables that are
+    outside of its :py:attr:`viewport`. Sprites, shapes and text layouts
+    report their bounding boxes to such a batch; other vertex lists are
+    always drawn unless given a box with :py:meth:`set_bounds`.
+
+    A batch created with ``sort_by`` draws the vertex lists of each domain in
+    order of their sort key, for blending overlapping transparent drawables
+    correctly. Sprites and shapes report their keys to such a batch; other
+    vertex lists can be given one with :py:meth:`set_sort_key`.
+
+    The work done by :py:meth:`draw` is counted in :py:attr:`stats`, once it
+    is set to a :py:class:`~pyglet.graphics.stats.RenderStats`.
     """
-    _draw_list: list[Callable]
+    stats: RenderStats | None
+    _draw_commands: list[DrawCommand]
+    _draw_list: list[tuple[Callable, tuple]]
     top_groups: list[Group]
     group_children: dict[Group, list[Group]]
     group_map: dict[Group, dict[DomainKey, vertexdomain.VertexDomain]]
 
-    def __init__(self) -> None:
-        """Create a graphics batch."""
+    def __init__(self, compacting: bool = False, growth_policy: allocation.GrowthPolicy | None = None,
+                 instance_attributes: Sequence[str] | None = None, culling: bool = False,
+                 cull_cell_size: float = 256.0, sort_by: Literal['z', 'y'] | None = None) -> None:
+        """Create a graphics batch.
+
+        Args:
+            compacting:
+                Create vertex domains that track their vertex lists, so that
+                the batch can be defragmented with :py:meth:`compact`.
+            growth_policy:
+                Policy used by the batch's vertex domains to grow, and optionally
+                shrink, their buffers. See :py:class:`~pyglet.graphics.allocation.GrowthPolicy`.
+            instance_attributes:
+                Names of attributes that may vary between otherwise identical
+                vertex lists, such as ``('translate', 'rotation', 'scale', 'colors')``
+                for sprites. Enables :py:meth:`instance_identical`. Vertex domains
+                track their vertex lists, as with ``compacting``.
+            culling:
+                Keep the bounding boxes of drawables in a spatial grid, so that
+                those outside of the :py:attr:`viewport` are not drawn.
+            cull_cell_size:
+                Size of the spatial grid cells used for culling. This should be
+                a few times larger than a typical drawable.
+            sort_by:
+                Draw the vertex lists of each domain back to front, by the
+                ``'z'`` coordinate of sprites and shapes, or by their ``'y'``
+                coordinate, where lower drawables are drawn last. Domains
+                still take a single draw call, but group order still comes
+                first. Domains of strips, loops and fans are not sorted.
+                Vertex domains track their vertex lists, as with
+                ``compacting``.
+        """
+        self._compacting = compacting or bool(instance_attributes) or sort_by is not None
+        self._growth_policy = growth_policy
+        self._instance_attributes = tuple(instance_attributes or ())
+        self._shared_domains = {}
+
         # Mapping to find domain.
         # group -> (attributes, mode, indexed) -> domain
         self.group_map = {}
@@ -318,6 +402,7 @@ class Batch:
         # List of top-level groups
         self.top_groups = []
 
+        self._draw_commands = []
         self._draw_list = []
         self._draw_list_dirty = False
 
@@ -325,6 +410,175 @@ class Batch:
 
         self._instance_count = 0
 
+        self._cull_grid = SpatialGrid(cull_cell_size) if culling else None
+        self._cull_domains = {}
+        self._cull_coverage = {}
+        self._viewport = None
+
+        assert sort_by in (None, 'z', 'y'), "sort_by must be 'z', 'y' or None."
+        self._sort_by = sort_by
+        self._sort_keys = {}
+        self._sort_orders = {}
+
+        #: Counters updated on every draw, or ``None`` to not count.
+        self.stats = None
+
+    @property
+    def culling(self) -> bool:
+        """Whether the batch keeps bounding boxes for culling. Read-only."""
+        return self._cull_grid is not None
+
+    @property
+    def viewport(self) -> tuple[float, float, float, float] | None:
+        """The ``(x, y, width, height)`` rectangle to draw, or ``None`` to draw everything.
+
+        The rectangle is in the same coordinates as the drawables, before the
+        view and projection are applied. When scrolling with a view matrix,
+        set it to the area of the world that is currently visible.
+
+        Only has an effect if the batch was created with ``culling`` enabled.
+        Instanced domains are never culled.
+        """
+        return self._viewport
+
+    @viewport.setter
+    def viewport(self, rect: tuple[float, float, float, float] | None) -> None:
+        self._viewport = tuple(rect) if rect is not None else None
+
+    @property
+    def sort_by(self) -> Literal['z', 'y'] | None:
+        """The coordinate that vertex lists are sorted by within each domain, or ``None``. Read-only.
+
+        Sorted domains are never culled.
+        """
+        return self._sort_by
+
+    def get_sort_key(self, x: float, y: float, z: float) -> float:
+        """Get the sort key of a drawable at the given position, according to :py:attr:`sort_by`."""
+        return -y if self._sort_by == 'y' else z
+
+    def set_sort_key(self, vertex_list: VertexList | IndexedVertexList, key: float) -> None:
+        """Set the sort key of a vertex list.
+
+        Vertex lists with lower keys are drawn first, and those without a key
+        are drawn as if their key was ``0.0``. The key must be removed with
+        :py:meth:`remove_sort_key` before the vertex list is deleted.
+
+        Does nothing if the batch was not created with ``sort_by``.
+
+        Args:
+            vertex_list:
+                A vertex list belonging to this batch.
+            key:
+                The new sort key.
+        """
+        if self._sort_by is None or self._sort_keys.get(vertex_list) == key:
+            return
+        self._sort_keys[vertex_list] = key
+        order = self._sort_orders.get(vertex_list.domain)
+        if order is not None:
+            order.dirty = True
+
+    def remove_sort_key(self, vertex_list: VertexList | IndexedVertexList) -> None:
+        """Remove the sort key of a vertex list.
+
+        Does nothing if the vertex list has no sort key.
+        """
+        if self._sort_keys.pop(vertex_list, None) is not None:
+            order = self._sort_orders.get(vertex_list.domain)
+            if order is not None:
+                order.dirty = True
+
+    def set_bounds(self, vertex_list: VertexList | IndexedVertexList,
+                   x: float, y: float, width: float, height: float) -> None:
+        """Set the axis-aligned bounding box of a vertex list, for culling.
+
+        The vertex list is only drawn while its box intersects the
+        :py:attr:`viewport`. The box must be removed with
+        :py:meth:`remove_bounds` before the vertex list is deleted.
+
+        Does nothing if the batch was not created with ``culling`` enabled.
+
+        Args:
+            vertex_list:
+                A vertex list belonging to this batch.
+            x:
+                Left edge of the box.
+            y:
+                Bottom edge of the box.
+            width:
+                Width of the box.
+            height:
+                Height of the box.
+        """
+        if self._cull_grid is None:
+            return
+        self._cull_grid.update(vertex_list, x, y, width, height)
+        try:
+            self._cull_domains[vertex_list.domain].add(vertex_list)
+        except KeyError:
+            self._cull_domains[vertex_list.domain] = {vertex_list}
+
+    def remove_bounds(self, vertex_list: VertexList | IndexedVertexList) -> None:
+        """Remove the bounding box of a vertex list, so that it is always drawn.
+
+        Does nothing if the vertex list has no bounding box.
+        """
+        if self._cull_grid is None:
+            return
+        self._cull_grid.remove(vertex_list)
+        lists = self._cull_domains.get(vertex_list.domain)
+        if lists is not None:
+            lists.discard(vertex_list)
+
+    def _is_fully_bounded(self, domain: vertexdomain.VertexDomain | vertexdomain.IndexedVertexDomain,
+                          lists: set[VertexList | IndexedVertexList]) -> bool:
+        """Check whether every allocated region of a domain belongs to a vertex list with bounds.
+
+        The result is cached until the domain's allocations change.
+        """
+        allocator = domain.get_draw_allocator()
+        cached = self._cull_coverage.get(domain)
+        if cached is not None and cached[0] == (allocator.generation, len(lists)):
+            return cached[1]
+
+        # Vertex lists that migrated to another domain are moved to its set:
+        moved = [vertex_list for vertex_list in lists if vertex_list.domain is not domain]
+        lists.difference_update(moved)
+        for vertex_list in moved:
+            self._cull_domains.setdefault(vertex_list.domain, set()).add(vertex_list)
+
+        get_region = domain.get_draw_region
+        bounded_size = sum(get_region(vertex_list)[1] for vertex_list in lists)
+        fully_bounded = bounded_size == allocator.get_used_size()
+        self._cull_coverage[domain] = ((allocator.generation, len(lists)), fully_bounded)
+        return fully_bounded
+
+    def _get_visible_regions(self) -> dict[vertexdomain.VertexDomain, tuple[list[int], list[int]]]:
+        """Get the regions to draw of each domain with bounded vertex lists."""
+        visible = self._cull_grid.query(*self._viewport)
+        visible_by_domain = {}
+        for vertex_list in visible:
+            try:
+                visible_by_domain[vertex_list.domain].append(vertex_list)
+            except KeyError:
+                visible_by_domain[vertex_list.domain] = [vertex_list]
+
+        regions = {}
+        for domain, lists in list(self._cull_domains.items()):
+            if not lists or domain.is_empty:
+                del self._cull_domains[domain]
+                self._cull_coverage.pop(domain, None)
+                continue
+            if isinstance(domain, vertexdomain.InstancedVertexDomain) or domain in self._sort_orders:
+                continue
+            if self._is_fully_bounded(domain, lists):
+                regions[domain] = get_visible_regions(domain, visible_by_domain.get(domain, ()))
+            else:
+                hidden = [vertex_list for vertex_list in lists if vertex_list not in visible]
+                regions[domain] = get_visible_regions(domain, (), hidden)
+        return regions
+
     def invalidate(self) -> None:
         """Force the batch to update the draw list.
 
@@ -357,16 +611,17 @@ class Batch:
             False if the domain's no longer match. The caller should handle this scenario.
         """
         # No new attributes.
-        attributes = program.attributes.copy()
+        layout = shader.VertexLayout(program.attributes)
 
         # Formats may differ (normalization) than what is declared in the shader.
         # Make those adjustments and attempt to get a domain.
-        for a_name in attributes:
+        for a_name in program.attributes:
             if (a_name in vertex_list.initial_attribs and
-                    vertex_list.initial_attribs[a_name]['format'] != attributes[a_name]['format']):
-                attributes[a_name]['format'] = vertex_list.initial_attribs[a_name]['format']
+                    vertex_list.initial_attribs[a_name]['format'] != layout[a_name]['format']):
+                layout = layout.replace(a_name, format=vertex_list.initial_attribs[a_name]['format'])
 
-        domain = self.get_domain(vertex_list.indexed, vertex_list.instanced, mode, group, attributes)
+        domain = self.get_domain(vertex_list.indexed, vertex_list.instanced, mode, group, layout,
+                                 vertex_list.domain.usage)
 
         # TODO: Allow migration if we can restore original vertices somehow. Much faster.
         # If the domain's don't match, we need to re-create the vertex list. Tell caller no match.
@@ -398,8 +653,16 @@ class Batch:
                 The batch to migrate to (or the current batch).
 
         """
+        if isinstance(vertex_list, vertexdomain.SharedVertexList):
+            vertex_list.detach()
+
+        if batch is not self:
+            self.remove_bounds(vertex_list)
+            self.remove_sort_key(vertex_list)
+
         attributes = vertex_list.domain.attribute_meta
-        domain = batch.get_domain(vertex_list.indexed, vertex_list.instanced, mode, group, attributes)
+        domain = batch.get_domain(vertex_list.indexed, vertex_list.instanced, mode, group, attributes,
+                                  vertex_list.domain.usage)
         vertex_list.migrate(domain)
 
     def _convert_to_instanced(self, domain: vertexdomain.VertexDomain | vertexdomain.IndexedVertexDomain,
@@ -412,50 +675,133 @@ class Batch:
             for key, mapped_domain in domain_map.items():
                 if domain == mapped_domain:
                     # Set instance attributes.
-                    new_attributes = mapped_domain.attribute_meta.copy()
-                    for name, attribute_dict in new_attributes.items():
+                    dindexed, dinstanced, dmode, dusage, layout = key
+                    for name in layout:
                         if name in instance_attributes:
-                            attribute_dict['instance'] = True
-                    dindexed, dinstanced, dmode, _ = key
+                            layout = layout.replace(name, instance=True)
 
                     assert dinstanced == 0, "Cannot convert an instanced domain."
-                    return self.get_domain(dindexed, True, dmode, group, new_attributes)
+                    return self.get_domain(dindexed, True, dmode, group, layout, dusage)
 
         msg = "Domain was not found and could not be converted."
         raise Exception(msg)
 
     def get_domain(self, indexed: bool, instanced: bool, mode: int, group: Group,
-                   attributes: dict[str, Any]) -> (
+                   attributes: shader.VertexLayout | dict[str, Any], usage: int = GL_DYNAMIC_DRAW) -> (
             vertexdomain.VertexDomain | vertexdomain.IndexedVertexDomain | vertexdomain.InstancedVertexDomain |
             vertexdomain.InstancedIndexedVertexDomain):
         """Get, or create, the vertex domain corresponding to the given arguments.
 
-        mode is the render mode such as GL_LINES or GL_TRIANGLES
+        mode is the render mode such as GL_LINES or GL_TRIANGLES. usage is a
+        hint of how often the data changes; ``GL_STREAM_DRAW`` selects
+        persistently mapped streaming buffers, where supported. attributes
+        is a :py:class:`~pyglet.graphics.shader.VertexLayout`, or the
+        attribute metadata to create one from.
         """
         # Batch group
-        if group not in self.group_map:
+        try:
+            domain_map = self.group_map[group]
+        except KeyError:
             self._add_group(group)
+            domain_map = self.group_map[group]
 
-        domain_map = self.group_map[group]
+        if attributes.__class__ is not shader.VertexLayout:
+            attributes = shader.VertexLayout(attributes)
 
         # If instanced, ensure a separate domain, as multiple instance sources can match the key.
         if instanced:
             self._instance_count += 1
-            key = (indexed, self._instance_count, mode, str(attributes))
+            key = (indexed, self._instance_count, mode, usage, attributes)
         else:
             # Find domain given formats, indices and mode
-            key = (indexed, 0, mode, str(attributes))
+            key = (indexed, 0, mode, usage, attributes)
 
         try:
             domain = domain_map[key]
         except KeyError:
             # Create domain
-            domain = _domain_class_map[(indexed, instanced)](attributes)
+            if self._compacting and not instanced:
+                domain = _domain_class_map[(indexed, instanced)](attributes, compacting=True,
+                                                                 growth_policy=self._growth_policy, usage=usage)
+            else:
+                domain = _domain_class_map[(indexed, instanced)](attributes, growth_policy=self._growth_policy,
+                                                                 usage=usage)
             domain_map[key] = domain
             self._draw_list_dirty = True
 
         return domain
 
+    def compact(self) -> None:
+        """Defragment all vertex domains in the batch.
+
+        Vertex lists are moved together within their domains, and the
+        buffers are shrunk to fit. This is useful after many drawables have
+        been created and deleted, which leaves gaps that increase the cost
+        of drawing.
+
+        Only has an effect if the batch was created with ``compacting`` enabled.
+        Instanced domains are never compacted.
+        """
+        for domain_map in self.group_map.values():
+            for domain in domain_map.values():
+                if domain.compacting:
+                    domain.compact()
+
+    def instance_identical(self, min_count: int = 2) -> None:
+        """Draw vertex lists with identical geometry as instances of one copy.
+
+        Vertex lists in the same group and domain, which differ only in the
+        batch's ``instance_attributes``, are moved into an instanced domain.
+        The instance attributes must have the same value for every vertex of
+        a vertex list, as is the case for the position, rotation, scale and
+        color of sprites and shapes. Each instance then stores one copy of
+        these, and the geometry is stored once for all instances.
+
+        The vertex lists are converted in place, and remain usable. See
+        :py:class:`~pyglet.graphics.vertexdomain.SharedVertexList` for the
+        differences. Vertex lists created later are not instanced until this
+        method is called again, at which point they join existing instances.
+
+        Only available if the batch was created with ``instance_attributes``.
+
+        Args:
+            min_count:
+                The minimum number of identical vertex lists required to
+                create a new instanced domain.
+        """
+        assert self._instance_attributes, "Batch was not created with instance_attributes."
+        self._shared_domains = {key: domain for key, domain in self._shared_domains.items() if not domain.is_empty}
+
+        for group, domain_map in list(self.group_map.items()):
+            for key, domain in list(domain_map.items()):
+                if key[1] or not domain.compacting:
+                    continue
+                names = [name for name in self._instance_attributes if name in domain.attribute_names]
+                if not names or len(names) == len(domain.attribute_names):
+                    continue
+
+                candidates = {}
+                for vertex_list in domain._vertex_lists:  # noqa: SLF001
+                    signature = _shared_signature(vertex_list, names)
+                    if signature is not None:
+                        candidates.setdefault(signature, []).append(vertex_list)
+
+                for signature, vertex_lists in candidates.items():
+                    shared_key = (group, key, signature)
+                    shared_domain = self._shared_domains.get(shared_key)
+                    if shared_domain is None:
+                        if len(vertex_lists) < min_count:
+                            continue
+                        attributes = shader.VertexLayout({name: {**meta, 'instance': name in names}
+                                                          for name, meta in domain.attribute_meta.items()})
+                        shared_domain = self.get_domain(key[0], True, key[2], group, attributes, domain.usage)
+                        origin = (self, group, key[2], domain.attribute_meta, domain.usage)
+                        shared_domain.set_shared_source(vertex_lists[0], origin)
+                        self._shared_domains[shared_key] = shared_domain
+
+                    for vertex_list in vertex_lists:
+                        shared_domain.share(vertex_list)
+
     def _add_group(self, group: Group) -> None:
         self.group_map[group] = {}
         if group.parent is None:
@@ -471,21 +817,21 @@ class Batch:
         self._draw_list_dirty = True
 
     def _update_draw_list(self) -> None:
-        """Visit group tree in preorder and create a list of bound methods to call."""
+        """Visit group tree in preorder and compile a flat list of draw commands."""
 
-        def visit(group: Group) -> list:
+        def visit(group: Group) -> list[DrawCommand]:
             draw_list = []
 
             # Draw domains using this group
             domain_map = self.group_map[group]
 
-            # indexed, instanced, mode, program, str(attributes))
-            for (indexed, instanced, mode, formats), domain in list(domain_map.items()):
+            # (indexed, instanced, mode, usage, layout)
+            for key, domain in list(domain_map.items()):
                 # Remove unused domains from batch
                 if domain.is_empty:
-                    del domain_map[(indexed, instanced, mode, formats)]
+                    del domain_map[key]
                     continue
-                draw_list.append((lambda d, m: lambda: d.draw(m))(domain, mode))  # noqa: PLC3002
+                draw_list.append((_CMD_DRAW, domain, key[2]))
 
             # Sort and visit child groups of this group
             children = self.group_children.get(group)
@@ -496,7 +842,7 @@ class Batch:
                         draw_list.extend(visit(child))
 
             if children or domain_map:
-                return [group.set_state, *draw_list, group.unset_state]
+                return [(_CMD_SET_STATE, group, 0), *draw_list, (_CMD_UNSET_STATE, group, 0)]
 
             # Remove unused group from batch
             del self.group_map[group]
@@ -514,18 +860,71 @@ class Batch:
 
             return []
 
-        self._draw_list = []
+        commands = []
 
         self.top_groups.sort()
         for top_group in list(self.top_groups):
             if top_group.visible:
-                self._draw_list.extend(visit(top_group))
-
+                for command in visit(top_group):
+                    # Elide redundant state changes, where a group is unset only for a
+                    # group setting the same state to follow. As groups are unset from
+                    # the innermost, this also reaches children of elided parents.
+                    if command[0] == _CMD_SET_STATE and commands:
+                        last_opcode, last_target, _ = commands[-1]
+                        if (last_opcode == _CMD_UNSET_STATE and last_target.__class__ is command[1].__class__
+                                and self._same_state(last_target, command[1])):
+                            commands.pop()
+                            continue
+                    commands.append(command)
+
+        # Pending buffer changes are uploaded for all domains before any drawing.
+        commits = [(_CMD_COMMIT, domain, 0) for opcode, domain, _ in commands if opcode == _CMD_DRAW]
+
+        self._draw_commands = commits + commands
+        self._draw_list = [self._compile_command(*command) for command in self._draw_commands]
+        if self._sort_by is not None:
+            self._compile_sorted_commands()
         self._draw_list_dirty = False
 
         if _debug_graphics_batch:
             self._dump_draw_list()
 
+    @staticmethod
+    def _same_state(first: Group, second: Group) -> bool:
+        """Check if two groups of the same class set the same state."""
+        key = state.get_state_key(first)
+        return key is not None and key == state.get_state_key(second)
+
+    @staticmethod
+    def _compile_command(opcode: int, target: Any, mode: int) -> tuple[Callable, tuple]:
+        """Resolve a draw command into a callable and its arguments."""
+        if opcode == _CMD_DRAW:
+            return target.draw_committed, (mode,)
+        if opcode == _CMD_COMMIT:
+            return target.commit, ()
+        func = target.set_state if opcode == _CMD_SET_STATE else target.unset_state
+        if state.is_tracked(target):
+            return func, ()
+        # Groups making their own GL calls invalidate the state cache:
+        return state.call_untracked, (func,)
+
+    def _compile_sorted_commands(self) -> None:
+        """Commit and draw each domain through its draw order, creating any that are missing.
+
+        Domains drawn in a mode that is not in :py:data:`~pyglet.graphics.sorting.SORTABLE_MODES`
+        keep their own commands.
+        """
+        sortable = {target for opcode, target, mode in self._draw_commands
+                    if opcode == _CMD_DRAW and mode in SORTABLE_MODES and target.compacting}
+        orders = {}
+        for i, (opcode, target, mode) in enumerate(self._draw_commands):
+            if opcode == _CMD_SET_STATE or opcode == _CMD_UNSET_STATE or target not in sortable:
+                continue
+            order = orders.get(target) or self._sort_orders.get(target) or DrawOrder(target, self._sort_keys)
+            orders[target] = order
+            self._draw_list[i] = (order.commit, ()) if opcode == _CMD_COMMIT else (order.draw, (mode,))
+        self._sort_orders = orders
+
     def _dump_draw_list(self) -> None:
         def dump(group: Group, indent: str = '') -> None:
             print(indent, 'Begin group', group)
@@ -550,12 +949,73 @@ class Batch:
             dump(group)
 
     def draw(self) -> None:
-        """Draw the batch."""
+        """Draw the batch.
+
+        If :py:attr:`stats` is set, the work done is added to it.
+        """
+        if self.stats is not None:
+            self._draw_with_stats(self.stats)
+            return
+
         if self._draw_list_dirty:
             self._update_draw_list()
+        self._run_draw_list()
 
-        for func in self._draw_list:
-            func()
+    def _run_draw_list(self) -> dict[vertexdomain.VertexDomain, tuple[list[int], list[int]]] | None:
+        """Run the compiled draw list.
+
+        Returns the regions drawn of each culled domain, or ``None`` if the
+        batch is not culled.
+        """
+        state_cache = state.get_state_cache()
+        state_cache.begin()
+        try:
+            if self._viewport is None or not self._cull_grid:
+                for func, args in self._draw_list:
+                    func(*args)
+                return None
+
+            regions = self._get_visible_regions()
+            for (opcode, target, mode), (func, args) in zip(self._draw_commands, self._draw_list):
+                if opcode == _CMD_DRAW and target in regions:
+                    target.draw_regions(mode, *regions[target])
+                else:
+                    func(*args)
+            return regions
+        finally:
+            state_cache.end()
+
+    def _draw_with_stats(self, stats: RenderStats) -> None:
+        start_time = time.perf_counter()
+        if self._draw_list_dirty:
+            self._update_draw_list()
+
+        domains = [target for opcode, target, _ in self._draw_commands if opcode == _CMD_COMMIT]
+        bytes_before, uploads_before = get_upload_totals(domains)
+        state_cache = state.get_state_cache()
+        state_calls, state_skipped = state_cache.calls, state_cache.skipped
+
+        regions = self._run_draw_list()
+
+        for opcode, target, _ in self._draw_commands:
+            if opcode == _CMD_DRAW:
+                if regions is not None and target in regions:
+                    stats.add_draw(len(regions[target][0]))
+                elif target in self._sort_orders:
+                    stats.add_draw(0 if target.is_empty else 1)
+                else:
+                    stats.add_draw(target.get_draw_primcount())
+            elif opcode != _CMD_COMMIT:
+                stats.group_state_changes += 1
+
+        bytes_after, uploads_after = get_upload_totals(domains)
+        stats.bytes_uploaded += bytes_after - bytes_before
+        stats.upload_calls += uploads_after - uploads_before
+        stats.gl_state_calls += state_cache.calls - state_calls
+        stats.gl_state_skipped += state_cache.skipped - state_skipped
+        stats.fragmentation = {domain: domain.allocator.get_fragmentation() for domain in domains}
+        stats.frames += 1
+        stats.draw_time += time.perf_counter() - start_time
 
     def draw_subset(self, vertex_lists: Sequence[VertexList | IndexedVertexList]) -> None:
         """Draw only some vertex lists in the batch.
@@ -600,6 +1060,7 @@ class Batch:
                 visit(top_group)
 
 
+@state.tracks_state
 class Group:
     """Group of common OpenGL state.
 
@@ -703,6 +1164,18 @@ class Group:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(order={self._order})"
 
+    def state_key(self) -> Hashable | None:
+        """Key of the OpenGL state set by this group, or ``None`` if it is unknown.
+
+        When a group is unset and followed by a group of the same class with
+        an equal key, the batch skips both calls. Unlike ``__eq__``, the key
+        must not include ``order`` or ``parent``.
+
+        The default implementation returns an empty key, as the group sets
+        no state.
+        """
+        return ()
+
     def set_state(self) -> None:
         """Apply the OpenGL state change.
 
@@ -738,6 +1211,7 @@ class Group:
 
 # Example Groups.
 
+@state.tracks_state
 class ShaderGroup(Group):
     """A group that enables and binds a ShaderProgram."""
 
@@ -746,10 +1220,13 @@ class ShaderGroup(Group):
         self.program = program
 
     def set_state(self) -> None:
-        self.program.use()
+        state.get_state_cache().use_program(self.program.id)
 
     def unset_state(self) -> None:
-        self.program.stop()
+        state.get_state_cache().stop_program()
+
+    def state_key(self) -> Hashable:
+        return self.program.id
 
     def __eq__(self, other: ShaderGroup) -> bool:
         return (self.__class__ is other.__class__ and
@@ -761,6 +1238,7 @@ class ShaderGroup(Group):
         return hash((self._order, self.parent, self.program))
 
 
+@state.tracks_state
 class TextureGroup(Group):
     """A group that enables and binds a texture.
 
@@ -782,8 +1260,10 @@ class TextureGroup(Group):
         self.texture = texture
 
     def set_state(self) -> None:
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(self.texture.target, self.texture.id)
+        state.get_state_cache().bind_texture(self.texture.target, self.texture.id)
+
+    def state_key(self) -> Hashable:
+        return self.texture.target, self.texture.id
 
     def __hash__(self) -> int:
         return hash((self.texture.target, self.texture.id, self.order, self.parent))
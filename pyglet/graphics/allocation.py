@@ -4,12 +4,19 @@ The region allocator is used to allocate vertex indices within a vertex
 domain's  multiple buffers.  ("Buffer" refers to any abstract buffer presented
 by :py:mod:`pyglet.graphics.vertexbuffer`.
 
-The allocator will at times request more space from the buffers. The current
-policy is to double the buffer size when there is not enough room to fulfil an
-allocation.  The buffer is never resized smaller.
+The allocator will at times request more space from the buffers. How much
+space is requested is decided by a :py:class:`GrowthPolicy`. The default policy
+is to double the buffer size when there is not enough room to fulfil an
+allocation, and to never resize the buffer smaller. A policy can optionally
+shrink the buffer again once its usage drops below a threshold.
 
 The allocator maintains references to free space only; it is the caller's
-responsibility to maintain the allocated regions.
+responsibility to maintain the allocated regions. Every change to the
+allocated regions increments the allocator's ``generation``, which lets
+callers cache data derived from the regions (such as draw arguments).
+
+The :py:class:`TrackingAllocator` additionally records each individual
+allocation, which allows it to be compacted (defragmented) on request.
 """
 
 # Common cases:
@@ -33,9 +40,12 @@ responsibility to maintain the allocated regions.
 #  to provide accurate (start, size) tuple, which completely describes
 #  a region from the allocator's point of view.
 # -this means that compacting is probably not feasible, or would be hideously
-#  expensive
+#  expensive. TrackingAllocator opts in to tracking individual regions to make
+#  compacting possible.
 from __future__ import annotations
 
+import math
+
 
 class AllocatorMemoryException(Exception):  # noqa: N818
     """The buffer is not large enough to fulfil an allocation.
@@ -51,12 +61,90 @@ class AllocatorMemoryException(Exception):  # noqa: N818
         self.requested_capacity = requested_capacity
 
 
+class GrowthPolicy:
+    """Policy deciding the capacity of a buffer as allocations grow and shrink.
+
+    Capacity grows geometrically by ``factor`` until a single step would
+    exceed ``max_step``, after which it grows linearly in steps of
+    ``max_step``. The default policy doubles the capacity, and never shrinks.
+    """
+    factor: float
+    max_step: int
+    min_capacity: int
+    shrink_threshold: float
+
+    __slots__ = 'factor', 'max_step', 'min_capacity', 'shrink_threshold'
+
+    def __init__(self, factor: float = 2.0, max_step: int = 0, min_capacity: int = 16,
+                 shrink_threshold: float = 0.0) -> None:
+        """Create a growth policy.
+
+        Args:
+            factor:
+                Multiplier applied to the capacity each time it grows.
+                Must be greater than 1.
+            max_step:
+                The largest amount the capacity can grow by in a single step,
+                or 0 for no limit.
+            min_capacity:
+                The capacity is never less than this size.
+            shrink_threshold:
+                When the used fraction of the capacity drops below this value,
+                the capacity is shrunk. The default of 0 never shrinks.
+        """
+        assert factor > 1, "Growth factor must be greater than 1."
+        assert 0 <= shrink_threshold < 1, "Shrink threshold must be in the range [0, 1)."
+        self.factor = factor
+        self.max_step = max_step
+        self.min_capacity = min_capacity
+        self.shrink_threshold = shrink_threshold
+
+    def grow(self, capacity: int, requested_capacity: int) -> int:
+        """Return the new capacity to fulfil a request for more space.
+
+        Args:
+            capacity:
+                The current capacity.
+            requested_capacity:
+                The minimum capacity required.
+        """
+        capacity = max(capacity, self.min_capacity, 1)
+        while capacity < requested_capacity:
+            step = max(1, int(capacity * (self.factor - 1)))
+            if self.max_step and step >= self.max_step:
+                # Growth is linear from here on.
+                steps = math.ceil((requested_capacity - capacity) / self.max_step)
+                return capacity + steps * self.max_step
+            capacity += step
+        return capacity
+
+    def shrink(self, capacity: int, used: int) -> int:
+        """Return the new capacity after space has been freed.
+
+        The current capacity is returned if the buffer should not shrink.
+        When shrinking, room to grow by one step is left, so that the
+        buffer is not repeatedly resized around the threshold.
+
+        Args:
+            capacity:
+                The current capacity.
+            used:
+                The end of the last allocated region. The capacity cannot be
+                reduced below it.
+        """
+        if capacity <= self.min_capacity or used >= capacity * self.shrink_threshold:
+            return capacity
+
+        return min(capacity, self.grow(self.min_capacity, math.ceil(used * self.factor)))
+
+
 class Allocator:
     """Buffer space allocation implementation."""
     sizes: list[int]
     starts: list[int]
+    generation: int
 
-    __slots__ = 'capacity', 'starts', 'sizes'
+    __slots__ = 'capacity', 'generation', 'sizes', 'starts'
 
     def __init__(self, capacity: int) -> None:
         """Create an allocator for a buffer of the specified maximum capacity size."""
@@ -81,12 +169,15 @@ class Allocator:
         self.starts = []
         self.sizes = []
 
+        # Incremented whenever the allocated regions change.
+        self.generation = 0
+
     def set_capacity(self, size: int) -> None:
         """Resize the maximum buffer size.
 
-        The capacity cannot be reduced.
+        The capacity cannot be reduced below the end of the last allocated region.
         """
-        assert size > self.capacity
+        assert size >= self.get_used_size(), "Capacity is too small for allocations."
         self.capacity = size
 
     def alloc(self, size: int) -> int:
@@ -107,6 +198,8 @@ class Allocator:
         if size == 0:
             return 0
 
+        self.generation += 1
+
         # Return start, or raise AllocatorMemoryException
         if not self.starts:
             if size <= self.capacity:
@@ -180,6 +273,8 @@ class Allocator:
         if size == 0:
             return self.alloc(new_size)
 
+        self.generation += 1
+
         # return start, or raise AllocatorMemoryException
 
         # Truncation is the same as deallocating the tail cruft
@@ -254,6 +349,8 @@ class Allocator:
 
         assert self.starts
 
+        self.generation += 1
+
         # Find which block needs to be split
         for i, (alloc_start, alloc_size) in enumerate(zip(*(self.starts, self.sizes))):
             p = start - alloc_start
@@ -296,6 +393,24 @@ class Allocator:
             self.starts.insert(i + 1, start + size)
             self.sizes.insert(i + 1, alloc_size - (p + size))
 
+    def split(self, start: int, size: int, count: int) -> None:
+        """Declare that an allocated region consists of ``count`` consecutive regions of ``size``.
+
+        This allows many regions to be allocated with a single call to
+        :py:meth:`alloc`, and later deallocated individually. The base
+        allocator does not track individual regions, so this does nothing.
+        """
+
+    def get_used_size(self) -> int:
+        """Return the end of the last allocated region.
+
+        This is the smallest capacity the buffer can be resized to without
+        moving any regions.
+        """
+        if not self.starts:
+            return 0
+        return self.starts[-1] + self.sizes[-1]
+
     def get_allocated_regions(self) -> tuple[list, list]:
         """Get a list of (aggregate) allocated regions.
 
@@ -343,3 +458,83 @@ class Allocator:
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} {self!s}>'
+
+
+class TrackingAllocator(Allocator):
+    """Buffer space allocation implementation that tracks every allocated region.
+
+    Tracking the individual regions allows the allocator to be compacted,
+    moving all regions together at the start of the buffer. Compacting
+    removes fragmentation, which reduces the number of entries needed for
+    ``glMultiDrawArrays`` and allows the buffer to shrink.
+    """
+    regions: dict[int, int]
+
+    __slots__ = ('regions',)
+
+    def __init__(self, capacity: int) -> None:
+        """Create a tracking allocator for a buffer of the specified maximum capacity size."""
+        super().__init__(capacity)
+
+        # Mapping of start: size for each individual allocated region.
+        self.regions = {}
+
+    def alloc(self, size: int) -> int:
+        start = super().alloc(size)
+        if size:
+            self.regions[start] = size
+        return start
+
+    def realloc(self, start: int, size: int, new_size: int) -> int:
+        # The base implementation calls `alloc` and `dealloc`, which may have
+        # already updated the tracked regions.
+        new_start = super().realloc(start, size, new_size)
+        if size:
+            self.regions.pop(start, None)
+        if new_size:
+            self.regions[new_start] = new_size
+        return new_start
+
+    def dealloc(self, start: int, size: int) -> None:
+        super().dealloc(start, size)
+        # Partial deallocations are only done by `realloc`, which updates the region itself.
+        if self.regions.get(start) == size:
+            del self.regions[start]
+
+    def split(self, start: int, size: int, count: int) -> None:
+        if not size or not count:
+            return
+        assert self.regions.get(start) == size * count, "Region was not allocated in one piece."
+        regions = self.regions
+        for i in range(count):
+            regions[start + i * size] = size
+
+    def compact(self) -> list[tuple[int, int, int]]:
+        """Move all allocated regions together at the start of the buffer.
+
+        The relative order of the regions is preserved. The caller is
+        responsible for moving the data of each region in the buffer, in
+        the order returned; as regions only move towards the start, this
+        can be done safely in place.
+
+        Returns:
+            A list of ``(old_start, new_start, size)`` tuples, for each
+            region that has moved.
+        """
+        moves = []
+        regions = {}
+        position = 0
+        for start in sorted(self.regions):
+            size = self.regions[start]
+            if start != position:
+                moves.append((start, position, size))
+            regions[position] = size
+            position += size
+
+        assert position == sum(self.sizes), "Allocated space is not fully tracked."
+
+        self.regions = regions
+        self.starts = [0] if position else []
+        self.sizes = [position] if position else []
+        self.generation += 1
+        return moves
@@ -0,0 +1,148 @@
+"""Spatial index used by a :py:class:`~pyglet.graphics.Batch` to skip drawing off-screen vertex lists.
+
+Drawables in a batch with culling enabled report an axis-aligned bounding box
+for each of their vertex lists. The boxes are stored in a uniform grid, so
+that the vertex lists intersecting the batch's viewport can be found without
+testing every one of them. See :py:attr:`pyglet.graphics.Batch.viewport`.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Hashable, List, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from pyglet.graphics.vertexdomain import IndexedVertexList, VertexDomain, VertexList
+
+Bounds = Tuple[float, float, float, float]
+
+
+class SpatialGrid:
+    """A uniform grid of axis-aligned bounding boxes.
+
+    Each item is stored in every cell that its bounding box overlaps. Items
+    which are much larger than the cell size are therefore expensive to move,
+    but remain correct.
+    """
+
+    def __init__(self, cell_size: float = 256.0) -> None:
+        """Create an empty grid.
+
+        Args:
+            cell_size:
+                Width and height of each grid cell.
+        """
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self.items: Dict[Hashable, Tuple[Bounds, Tuple[int, int, int, int]]] = {}
+
+    def _cell_range(self, x0: float, y0: float, x1: float, y1: float) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return int(x0 // size), int(y0 // size), int(x1 // size), int(y1 // size)
+
+    def update(self, item: Hashable, x: float, y: float, width: float, height: float) -> None:
+        """Insert an item, or move it to a new bounding box."""
+        bounds = (x, y, x + width, y + height)
+        cell_range = self._cell_range(*bounds)
+        old = self.items.get(item)
+        self.items[item] = bounds, cell_range
+        if old is not None:
+            if old[1] == cell_range:
+                return
+            self._remove_cells(item, old[1])
+
+        cells = self.cells
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                try:
+                    cells[cx, cy].add(item)
+                except KeyError:
+                    cells[cx, cy] = {item}
+
+    def remove(self, item: Hashable) -> None:
+        """Remove an item, if it is in the grid."""
+        old = self.items.pop(item, None)
+        if old is not None:
+            self._remove_cells(item, old[1])
+
+    def _remove_cells(self, item: Hashable, cell_range: Tuple[int, int, int, int]) -> None:
+        cells = self.cells
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells[cx, cy]
+                cell.discard(item)
+                if not cell:
+                    del cells[cx, cy]
+
+    def query(self, x: float, y: float, width: float, height: float) -> Set[Hashable]:
+        """Get all items whose bounding box intersects the given rectangle."""
+        x1 = x + width
+        y1 = y + height
+        cx0, cy0, cx1, cy1 = self._cell_range(x, y, x1, y1)
+        cells = self.cells
+        items = self.items
+        found = set()
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            # The rectangle covers more cells than are occupied:
+            candidates = [item for cell in cells.values() for item in cell]
+        else:
+            candidates = [item for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                          for item in cells.get((cx, cy), ())]
+        for item in candidates:
+            if item not in found:
+                bx0, by0, bx1, by1 = items[item][0]
+                if bx0 <= x1 and bx1 >= x and by0 <= y1 and by1 >= y:
+                    found.add(item)
+        return found
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def get_visible_regions(domain: VertexDomain, visible: Sequence[VertexList | IndexedVertexList],
+                        hidden: Sequence[VertexList | IndexedVertexList] | None = None) -> Tuple[List[int], List[int]]:
+    """Get the regions of a domain to draw, with the invisible vertex lists left out.
+
+    Regions are in the units the domain draws with: vertices, or indices for
+    indexed domains. Adjacent regions are merged.
+
+    Args:
+        domain:
+            The domain being drawn.
+        visible:
+            The vertex lists in the domain that intersect the viewport.
+        hidden:
+            The vertex lists in the domain that do not intersect the viewport.
+            If given, every allocated region of the domain is drawn except
+            for these, which keeps vertex lists without a bounding box. If
+            ``None``, only the ``visible`` vertex lists are drawn.
+    """
+    get_region = domain.get_draw_region
+    if hidden is None:
+        regions = sorted(get_region(vertex_list) for vertex_list in visible)
+    else:
+        holes = sorted(get_region(vertex_list) for vertex_list in hidden)
+        regions = []
+        hole = 0
+        for start, size in zip(*domain.get_draw_allocator().get_allocated_regions()):
+            end = start + size
+            while hole < len(holes) and holes[hole][0] < end:
+                hole_start, hole_size = holes[hole]
+                if hole_start > start:
+                    regions.append((start, hole_start - start))
+                start = max(start, hole_start + hole_size)
+                hole += 1
+            if start < end:
+                regions.append((start, end - start))
+
+    starts = []
+    sizes = []
+    for start, size in regions:
+        if size <= 0:
+            continue
+        if starts and starts[-1] + sizes[-1] == start:
+            sizes[-1] += size
+        else:
+            starts.append(start)
+            sizes.append(size)
+    return starts, sizes
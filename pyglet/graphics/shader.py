@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import re
 import warnings
 import weakref
 from _ctypes import _Pointer, _SimpleCData
 from collections import defaultdict
+from contextlib import contextmanager
 from ctypes import (
     POINTER,
     Array,
@@ -28,16 +32,21 @@ from ctypes import (
     sizeof,
     string_at,
 )
-from typing import TYPE_CHECKING, Any, Callable, Literal, Sequence, Type, Union
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Iterator, Literal, Mapping, Sequence, Type, Union
 
 import pyglet
 from pyglet.gl import Context, GLException, gl, gl_info
 from pyglet.gl.gl import (
     GL_ARRAY_BUFFER,
+    GL_DYNAMIC_DRAW,
     GL_FALSE,
     GL_INFO_LOG_LENGTH,
     GL_LINK_STATUS,
     GL_MAP_READ_BIT,
+    GL_NUM_PROGRAM_BINARY_FORMATS,
+    GL_PROGRAM_BINARY_LENGTH,
+    GL_PROGRAM_BINARY_RETRIEVABLE_HINT,
     GL_TRUE,
     GL_UNIFORM_BUFFER,
     glAttachShader,
@@ -50,11 +59,14 @@ from pyglet.gl.gl import (
     glDispatchCompute,
     glEnableVertexAttribArray,
     glGetActiveAttrib,
+    glGetProgramBinary,
     glGetProgramInfoLog,
     glGetProgramiv,
     glLinkProgram,
     glMapBufferRange,
     glMemoryBarrier,
+    glProgramBinary,
+    glProgramParameteri,
     glUnmapBuffer,
     glUseProgram,
     glVertexAttribDivisor,
@@ -347,6 +359,66 @@ class Attribute:
         return f"Attribute(name='{self.name}', location={self.location}, count={self.count})"
 
 
+class VertexLayout(Mapping):
+    """An immutable description of the vertex attributes stored in a domain.
+
+    This maps each attribute name to its metadata, in the same form as
+    :py:attr:`ShaderProgram.attributes`. Layouts are interned: creating a
+    layout equal to an existing one returns the existing instance, so they
+    can be compared by identity, and hashed cheaply, when looking up domains.
+
+    Vertex lists created by a :py:class:`ShaderProgram` share the layout for
+    each combination of attribute formats.
+    """
+    __slots__ = ('_attributes', '_key', '_hash', '__weakref__')
+
+    _attributes: dict[str, MappingProxyType]
+    _key: tuple
+    _hash: int
+
+    _interned: ClassVar[weakref.WeakValueDictionary[tuple, VertexLayout]] = weakref.WeakValueDictionary()
+
+    def __new__(cls, attributes: Mapping[str, Mapping[str, Any]]) -> VertexLayout:
+        """Get the layout for the given attribute metadata."""
+        if isinstance(attributes, VertexLayout):
+            return attributes
+
+        key = tuple((name, tuple(meta.items())) for name, meta in attributes.items())
+        layout = cls._interned.get(key)
+        if layout is None:
+            layout = super().__new__(cls)
+            layout._attributes = {name: MappingProxyType(dict(meta)) for name, meta in attributes.items()}
+            layout._key = key
+            layout._hash = hash(key)
+            cls._interned[key] = layout
+        return layout
+
+    def replace(self, name: str, **meta: Any) -> VertexLayout:
+        """Get a layout with some metadata of one attribute replaced."""
+        return VertexLayout({**self._attributes, name: {**self._attributes[name], **meta}})
+
+    def __getitem__(self, name: str) -> Mapping[str, Any]:
+        return self._attributes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._attributes)
+
+    def __len__(self) -> int:
+        return len(self._attributes)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, VertexLayout):
+            return self is other
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        formats = ', '.join(f"{name}={meta['format']!r}" for name, meta in self._attributes.items())
+        return f"VertexLayout({formats})"
+
+
 class _UniformArray:
     """Wrapper of the GLSL array data inside a Uniform.
 
@@ -363,6 +435,7 @@ class _UniformArray:
     _c_array: Array[GLDataType]
     _ptr: CTypesPointer[GLDataType]
     _idx_to_loc: dict[int, int]
+    _values: list[Any]
 
     __slots__ = (
         '_c_array',
@@ -374,6 +447,7 @@ class _UniformArray:
         '_is_matrix',
         '_ptr',
         '_uniform',
+        '_values',
     )
 
     def __init__(self, uniform: _Uniform, gl_getter: GLFunc, gl_setter: GLFunc, gl_type: GLDataType, is_matrix: bool,
@@ -392,6 +466,8 @@ class _UniformArray:
             self._c_array = (gl_type * self._uniform.size)()
 
         self._ptr = cast(self._c_array, POINTER(gl_type))
+        # Shadow copy of the last uploaded value of each element:
+        self._values = [None] * self._uniform.size
 
     def _get_location_for_index(self, index: int) -> int:
         """Get the location for the array name.
@@ -441,13 +517,22 @@ class _UniformArray:
             msg = f"{self._uniform.name}[{key}] not found. This may have been optimized out by the OpenGL driver if unused."
             raise ShaderException(msg)
 
+    def _normalize(self, value: Any) -> Any:
+        return tuple(value) if self._uniform.length > 1 else value
+
     def __setitem__(self, key: slice | int, value: Sequence) -> None:
         if isinstance(key, slice):
             self._c_array[key] = value
+            self._values[key] = [self._normalize(element) for element in value]
             self._update_uniform(self._ptr)
             return
 
+        value = self._normalize(value)
+        if self._values[key] == value:
+            return
+
         self._c_array[key] = value
+        self._values[key] = value
 
         if self._uniform.length > 1:
             assert len(
@@ -463,20 +548,32 @@ class _UniformArray:
         self._gl_getter(self._uniform.program, self._uniform.location, self._ptr)
         return self
 
-    def set(self, values: Sequence) -> None:
+    def set(self, values: Sequence, bind: bool = True) -> None:
         assert len(self._c_array) == len(
             values), f"Size of data ({len(values)}) does not match size of the uniform: {len(self._c_array)}."
 
+        values = [self._normalize(value) for value in values]
+        if values == self._values:
+            return
+
         self._c_array[:] = values
-        self._update_uniform(self._ptr)
+        self._values[:] = values
+        self._update_uniform(self._ptr, bind=bind)
+
+    def set_bound(self, values: Sequence) -> None:
+        """Set all values, assuming the program is already in use."""
+        self.set(values, bind=False)
 
-    def _update_uniform(self, data: Sequence, offset: int = 0) -> None:
+    def _update_uniform(self, data: Sequence, offset: int = 0, bind: bool = True) -> None:
         if offset != 0:
             size = 1
         else:
             size = self._uniform.size
 
-        location = self._get_location_for_index(offset)
+        try:
+            location = self._idx_to_loc[offset]
+        except KeyError:
+            location = self._idx_to_loc[offset] = self._get_location_for_index(offset)
 
         if self._dsa:
             if self._is_matrix:
@@ -484,7 +581,8 @@ class _UniformArray:
             else:
                 self._gl_setter(self._uniform.program, location, size, data)
         else:
-            glUseProgram(self._uniform.program)
+            if bind:
+                glUseProgram(self._uniform.program)
             if self._is_matrix:
                 self._gl_setter(location, size, GL_FALSE, data)
             else:
@@ -511,8 +609,9 @@ class _Uniform:
     length: int
     get: Callable[[], Array[GLDataType] | GLDataType]
     set: Callable[[float], None] | Callable[[Sequence], None]
+    set_bound: Callable[[float], None] | Callable[[Sequence], None]
 
-    __slots__ = 'count', 'get', 'length', 'location', 'name', 'program', 'set', 'size', 'type'
+    __slots__ = 'count', 'get', 'length', 'location', 'name', 'program', 'set', 'set_bound', 'size', 'type'
 
     def __init__(self, program: int, name: str, uniform_type: int, size: int, location: int, dsa: bool) -> None:
         self.name = name
@@ -535,12 +634,14 @@ class _Uniform:
             array = _UniformArray(self, gl_getter, gl_setter, gl_type, is_matrix, dsa)
             self.get = array.get
             self.set = array.set
+            self.set_bound = array.set_bound
         else:
             c_array: Array[GLDataType] = (gl_type * length)()
             ptr = cast(c_array, POINTER(gl_type))
 
             self.get = self._create_getter_func(program, location, gl_getter, c_array, length)
-            self.set = self._create_setter_func(program, location, gl_setter, c_array, length, ptr, is_matrix, dsa)
+            self.set, self.set_bound = self._create_setter_func(program, location, gl_setter, c_array, length, ptr,
+                                                                is_matrix, dsa)
 
     @staticmethod
     def _create_getter_func(program_id: int, location: int, gl_getter: GLFunc, c_array: Array[GLDataType],
@@ -559,49 +660,70 @@ class _Uniform:
 
     @staticmethod
     def _create_setter_func(program_id: int, location: int, gl_setter: GLFunc, c_array: Array[GLDataType], length: int,
-                            ptr: CTypesPointer[GLDataType], is_matrix: bool, dsa: bool) -> Callable[[float], None]:
-        """Factory function for creating simplified Uniform setters."""
-        if dsa:  # Bindless updates:
+                            ptr: CTypesPointer[GLDataType], is_matrix: bool,
+                            dsa: bool) -> tuple[Callable[[Any], None], Callable[[Any], None]]:
+        """Factory function for creating simplified Uniform setters.
+
+        The setters keep a shadow copy of the last value they uploaded, and
+        skip the upload if the value has not changed.
 
+        Returns:
+            A setter, and a setter that assumes the program is already in use.
+            These are the same function if Direct State Access is available.
+        """
+        if length < 1:
+            msg = "Uniform type not yet supported."
+            raise ShaderException(msg)
+
+        if dsa:  # Bindless updates:
             if is_matrix:
-                def setter_func(value: float) -> None:
-                    c_array[:] = value
+                def upload() -> None:
                     gl_setter(program_id, location, 1, GL_FALSE, ptr)
-            elif length == 1:
-                def setter_func(value: float) -> None:
-                    c_array[0] = value
-                    gl_setter(program_id, location, 1, ptr)
-            elif length > 1:
-                def setter_func(values: float) -> None:
-                    c_array[:] = values
-                    gl_setter(program_id, location, 1, ptr)
-
             else:
-                msg = "Uniform type not yet supported."
-                raise ShaderException(msg)
+                def upload() -> None:
+                    gl_setter(program_id, location, 1, ptr)
+        elif is_matrix:
+            def upload() -> None:
+                gl_setter(location, 1, GL_FALSE, ptr)
+        else:
+            def upload() -> None:
+                gl_setter(location, 1, ptr)
 
-            return setter_func
+        shadow = None
 
-        if is_matrix:
-            def setter_func(value: float) -> None:
-                glUseProgram(program_id)
-                c_array[:] = value
-                gl_setter(location, 1, GL_FALSE, ptr)
-        elif length == 1:
-            def setter_func(value: float) -> None:
-                glUseProgram(program_id)
+        if length == 1:
+            def setter_bound(value: float) -> None:
+                nonlocal shadow
+                if value == shadow:
+                    return
                 c_array[0] = value
-                gl_setter(location, 1, ptr)
-        elif length > 1:
-            def setter_func(values: float) -> None:
-                glUseProgram(program_id)
-                c_array[:] = values
-                gl_setter(location, 1, ptr)
+                shadow = value
+                upload()
+
+            def changed(value: float) -> bool:
+                return value != shadow
         else:
-            msg = "Uniform type not yet supported."
-            raise ShaderException(msg)
+            def setter_bound(values: Sequence) -> None:
+                nonlocal shadow
+                values = tuple(values)
+                if values == shadow:
+                    return
+                c_array[:] = values
+                shadow = values
+                upload()
+
+            def changed(values: Sequence) -> bool:
+                return tuple(values) != shadow
+
+        if dsa:
+            return setter_bound, setter_bound
+
+        def setter_func(value: Any) -> None:
+            if changed(value):
+                glUseProgram(program_id)
+                setter_bound(value)
 
-        return setter_func
+        return setter_func, setter_bound
 
     def __repr__(self) -> str:
         return f"Uniform(type={self.type}, size={self.size}, location={self.location})"
@@ -615,12 +737,18 @@ def get_maximum_binding_count() -> int:
 
 
 class _UBOBindingManager:
-    """Manages the global Uniform Block binding assignments in the OpenGL context."""
+    """Manages the global Uniform Block binding assignments in the OpenGL context.
+
+    It also owns the buffer of per-frame globals, which is bound to the
+    reserved ``WindowBlock`` binding and shared by every program in the
+    context.
+    """
     _in_use: set[int]
     _pool: list[int]
     _max_binding_count: int
     _ubo_names: dict[str, int]
     _ubo_programs: defaultdict[Any, weakref.WeakSet[ShaderProgram]]
+    _frame_ubo: UniformBufferObject | None
 
     def __init__(self) -> None:
         self._ubo_programs = defaultdict(weakref.WeakSet)
@@ -629,6 +757,25 @@ class _UBOBindingManager:
         self._max_binding_count = get_maximum_binding_count()
         self._pool = list(range(1, self._max_binding_count))
         self._in_use = {0}
+        self._frame_ubo = None
+
+    @property
+    def frame_ubo(self) -> UniformBufferObject | None:
+        """The buffer of per-frame globals, or ``None`` if it was not created yet."""
+        return self._frame_ubo
+
+    def get_frame_ubo(self, block: UniformBlock) -> UniformBufferObject:
+        """Get the buffer of per-frame globals, creating it if needed.
+
+        Args:
+            block:
+                A ``WindowBlock`` Uniform Block, which describes the layout of
+                the buffer if it has to be created.
+        """
+        if self._frame_ubo is None:
+            self._frame_ubo = block.create_ubo()
+            self._frame_ubo.bind()
+        return self._frame_ubo
 
     @property
     def max_value(self) -> int:
@@ -965,15 +1112,24 @@ def _introspect_attributes(program_id: int) -> dict[str, Any]:
     return attributes
 
 
-def _link_program(*shaders: Shader) -> int:
+def _link_program(*shaders: Shader, retrievable: bool = False) -> int:
     """Link one or more Shaders into a ShaderProgram.
 
+    Args:
+        shaders:
+            The Shaders to link.
+        retrievable:
+            Hint to the driver that the program binary will be retrieved
+            with ``glGetProgramBinary``.
+
     Returns:
         The ID assigned to the linked ShaderProgram.
     """
     program_id = glCreateProgram()
     for shader in shaders:
         glAttachShader(program_id, shader.id)
+    if retrievable:
+        glProgramParameteri(program_id, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
     glLinkProgram(program_id)
 
     # Check the link status of program
@@ -1021,9 +1177,12 @@ def _query_uniform(program_id: int, index: int) -> tuple[str, int, int]:
         raise ShaderException from exc
 
 
-def _introspect_uniforms(program_id: int, have_dsa: bool) -> dict[str, _Uniform]:
-    """Introspect a Program's uniforms, and return a dict of accessors."""
-    uniforms = {}
+def _query_uniforms(program_id: int) -> list[tuple[str, int, int, int]]:
+    """Query the name, type, size, and location of a Program's uniforms.
+
+    Uniforms inside of a Uniform Block are skipped.
+    """
+    uniform_info = []
 
     for index in range(_get_number(program_id, gl.GL_ACTIVE_UNIFORMS)):
         u_name, u_type, u_size = _query_uniform(program_id, index)
@@ -1042,6 +1201,24 @@ def _introspect_uniforms(program_id: int, have_dsa: bool) -> dict[str, _Uniform]
         if array_count != 0:
             u_name = u_name.strip('[0]')
 
+        uniform_info.append((u_name, u_type, u_size, loc))
+
+    return uniform_info
+
+
+def _introspect_uniforms(program_id: int, have_dsa: bool,
+                         uniform_info: list[tuple[str, int, int, int]] | None = None) -> dict[str, _Uniform]:
+    """Introspect a Program's uniforms, and return a dict of accessors.
+
+    If ``uniform_info`` is given, as returned by ``_query_uniforms``, the
+    Program is not queried.
+    """
+    uniforms = {}
+
+    if uniform_info is None:
+        uniform_info = _query_uniforms(program_id)
+
+    for u_name, u_type, u_size, loc in uniform_info:
         assert u_name not in uniforms, f"{u_name} exists twice in the shader. Possible name clash with an array."
         uniforms[u_name] = _Uniform(program_id, u_name, u_type, u_size, loc, have_dsa)
 
@@ -1133,6 +1310,121 @@ def _introspect_uniform_blocks(program: ShaderProgram | ComputeShaderProgram) ->
     return uniform_blocks
 
 
+# Program binary cache:
+
+_PROGRAM_CACHE_VERSION = 1
+
+
+def _get_program_cache_file(shaders: Sequence[Shader]) -> str | None:
+    """Get the cache file for a program linked from these Shaders.
+
+    Returns:
+        The path of the cache file, or ``None`` if the cache is disabled
+        or the context cannot retrieve program binaries.
+    """
+    cache_path = pyglet.options.shader_cache_path
+    if not cache_path:
+        return None
+
+    if not (gl_info.have_version(4, 1) or gl_info.have_extension("GL_ARB_get_program_binary")):
+        return None
+
+    num_formats = gl.GLint(0)
+    gl.glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS, byref(num_formats))
+    if num_formats.value == 0:
+        return None
+
+    key = hashlib.sha256()
+    for part in (str(_PROGRAM_CACHE_VERSION), gl_info.get_vendor(), gl_info.get_renderer(),
+                 gl_info.get_version_string()):
+        key.update(part.encode('utf8'))
+        key.update(b'\0')
+    for shader in shaders:
+        key.update(shader.type.encode('utf8'))
+        key.update(b'\0')
+        key.update(shader.source.encode('utf8'))
+        key.update(b'\0')
+
+    return os.path.join(cache_path, f"{key.hexdigest()}.bin")
+
+
+def _load_program_binary(filename: str) -> tuple[int, dict[str, Any], list[tuple[str, int, int, int]]] | None:
+    """Create a Program from a cached binary.
+
+    The cache file holds a single line of JSON with the binary format and
+    the introspected attributes and uniforms, followed by the binary itself.
+
+    Returns:
+        The Program ID, attributes and uniform info, or ``None`` if the file
+        does not exist or the driver rejects the binary.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            header = json.loads(f.readline())
+            binary = f.read()
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(header, dict) or header.get('version') != _PROGRAM_CACHE_VERSION:
+        return None
+
+    program_id = glCreateProgram()
+    status = c_int(0)
+    try:
+        glProgramBinary(program_id, header['format'], create_string_buffer(binary, len(binary)), len(binary))
+        glGetProgramiv(program_id, GL_LINK_STATUS, byref(status))
+    except GLException:
+        pass
+
+    if not status.value:
+        # The driver was updated without changing its version string, or the file is corrupt.
+        glDeleteProgram(program_id)
+        return None
+
+    if _debug_gl_shaders:
+        print(f"Loaded program '{program_id}' from the shader cache: {filename}")
+
+    uniform_info = [(name, u_type, size, loc) for name, u_type, size, loc in header['uniforms']]
+    return program_id, header['attributes'], uniform_info
+
+
+def _save_program_binary(filename: str, program_id: int, attributes: dict[str, Any],
+                         uniform_info: list[tuple[str, int, int, int]]) -> None:
+    """Save a linked Program's binary and introspection results to the cache.
+
+    Errors writing the file are ignored, since the cache is only an optimization.
+    """
+    length = gl.GLint(0)
+    glGetProgramiv(program_id, GL_PROGRAM_BINARY_LENGTH, byref(length))
+    if length.value == 0:
+        return
+
+    binary = create_string_buffer(length.value)
+    written = gl.GLsizei(0)
+    binary_format = gl.GLenum(0)
+    glGetProgramBinary(program_id, length.value, byref(written), byref(binary_format), binary)
+
+    header = {
+        'version': _PROGRAM_CACHE_VERSION,
+        'format': binary_format.value,
+        'attributes': attributes,
+        'uniforms': uniform_info,
+    }
+
+    # Write to a temporary file first, so that other processes never read a partial binary.
+    temp_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(temp_filename, 'wb') as f:
+            f.write(json.dumps(header).encode('utf8'))
+            f.write(b'\n')
+            f.write(binary.raw[:written.value])
+        os.replace(temp_filename, filename)
+    except OSError as exc:
+        if _debug_gl_shaders:
+            print(f"Unable to write to the shader cache: {exc}")
+
+
 # Shader & program classes:
 
 class ShaderSource:
@@ -1194,11 +1486,17 @@ class ShaderSource:
 class Shader:
     """OpenGL shader.
 
-    Shader objects are compiled on instantiation.
+    Shader objects are compiled on instantiation, unless
+    ``pyglet.options['shader_cache_path']`` is set. In that case they are
+    compiled the first time they are needed, so that a ShaderProgram loaded
+    from the cache never compiles them at all.
     You can reuse a Shader object in multiple ShaderPrograms.
     """
     _context: Context | None
     _id: int | None
+    _compiled: bool
+    _gl_type: int
+    source: str
     type: ShaderType
 
     def __init__(self, source_string: str, shader_type: ShaderType) -> None:
@@ -1220,10 +1518,11 @@ class Shader:
         """
         self._context = pyglet.gl.current_context
         self._id = None
+        self._compiled = False
         self.type = shader_type
 
         try:
-            shader_type = _shader_types[shader_type]
+            self._gl_type = _shader_types[shader_type]
         except KeyError as err:
             msg = (
                 f"shader_type '{shader_type}' is invalid."
@@ -1231,12 +1530,18 @@ class Shader:
             )
             raise ShaderException(msg) from err
 
-        source_string = ShaderSource(source_string, shader_type).validate()
-        shader_source_utf8 = source_string.encode("utf8")
+        self.source = ShaderSource(source_string, self._gl_type).validate()
+
+        if not pyglet.options.shader_cache_path:
+            self._compile()
+
+    def _compile(self) -> None:
+        self._compiled = True
+        shader_source_utf8 = self.source.encode("utf8")
         source_buffer_pointer = cast(c_char_p(shader_source_utf8), POINTER(c_char))
         source_length = c_int(len(shader_source_utf8))
 
-        shader_id = gl.glCreateShader(shader_type)
+        shader_id = gl.glCreateShader(self._gl_type)
         self._id = shader_id
         gl.glShaderSource(shader_id, 1, byref(source_buffer_pointer), source_length)
         gl.glCompileShader(shader_id)
@@ -1262,6 +1567,8 @@ class Shader:
 
     @property
     def id(self) -> int:
+        if not self._compiled:
+            self._compile()
         return self._id
 
     def _get_shader_log(self, shader_id: int) -> str:
@@ -1311,26 +1618,38 @@ class ShaderProgram:
     _id: int | None
     _context: Context | None
     _attributes: dict[str, Any]
+    _dsa: bool
     _uniforms: dict[str, _Uniform]
     _uniform_blocks: dict[str, UniformBlock]
 
-    __slots__ = '__weakref__', '_attributes', '_context', '_id', '_uniform_blocks', '_uniforms'
+    __slots__ = '__weakref__', '_attributes', '_context', '_dsa', '_id', '_layouts', '_uniform_blocks', '_uniforms'
 
     def __init__(self, *shaders: Shader) -> None:
         """Initialize the ShaderProgram using at least two Shader instances."""
         self._id = None
 
         assert shaders, "At least one Shader object is required."
-        self._id = _link_program(*shaders)
         self._context = pyglet.gl.current_context
 
+        cache_file = _get_program_cache_file(shaders)
+        cached = cache_file and _load_program_binary(cache_file)
+        if cached:
+            self._id, self._attributes, uniform_info = cached
+        else:
+            self._id = _link_program(*shaders, retrievable=cache_file is not None)
+            self._attributes = _introspect_attributes(self._id)
+            uniform_info = None
+            if cache_file:
+                uniform_info = _query_uniforms(self._id)
+                _save_program_binary(cache_file, self._id, self._attributes, uniform_info)
+
         if _debug_gl_shaders:
             print(_get_program_log(self._id))
 
         # Query if Direct State Access is available:
-        have_dsa = gl_info.have_version(4, 1) or gl_info.have_extension("GL_ARB_separate_shader_objects")
-        self._attributes = _introspect_attributes(self._id)
-        self._uniforms = _introspect_uniforms(self._id, have_dsa)
+        self._dsa = gl_info.have_version(4, 1) or gl_info.have_extension("GL_ARB_separate_shader_objects")
+        self._layouts = {}
+        self._uniforms = _introspect_uniforms(self._id, self._dsa, uniform_info)
         self._uniform_blocks = _introspect_uniform_blocks(self)
 
     @property
@@ -1402,22 +1721,64 @@ class ShaderProgram:
             except (AttributeError, ImportError):
                 pass  # Interpreter is shutting down
 
-    def __setitem__(self, key: str, value: Any) -> None:
+    def _get_uniform(self, key: str) -> _Uniform | None:
         try:
-            uniform = self._uniforms[key]
+            return self._uniforms[key]
         except KeyError as err:
             msg = (f"A Uniform with the name `{key}` was not found.\n"
                    f"The spelling may be incorrect or, if not in use, it "
                    f"may have been optimized out by the OpenGL driver.")
             if _debug_gl_shaders:
                 warnings.warn(msg)
-                return
+                return None
             raise ShaderException(msg) from err
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        uniform = self._get_uniform(key)
+        if uniform is None:
+            return
         try:
             uniform.set(value)
         except GLException as err:
             raise ShaderException from err
 
+    def set_uniforms(self, uniforms: Mapping[str, Any]) -> None:
+        """Set several uniforms at once.
+
+        Without Direct State Access, setting a uniform makes the program
+        current. This makes it current only once for all the uniforms.
+        As with single uniforms, values that are unchanged since they were
+        last set are not uploaded again.
+
+        Args:
+            uniforms:
+                A mapping of uniform names to their new values.
+        """
+        if not self._dsa:
+            glUseProgram(self._id)
+        for key, value in uniforms.items():
+            uniform = self._get_uniform(key)
+            if uniform is None:
+                continue
+            try:
+                uniform.set_bound(value)
+            except GLException as err:
+                raise ShaderException from err
+
+    @contextmanager
+    def uniform_updates(self) -> Iterator[dict[str, Any]]:
+        """Collect uniform values, and set them together on exit.
+
+        The values are applied with :py:meth:`set_uniforms`::
+
+            with program.uniform_updates() as uniforms:
+                uniforms['projection'] = projection
+                uniforms['time'] = time
+        """
+        uniforms = {}
+        yield uniforms
+        self.set_uniforms(uniforms)
+
     def __getitem__(self, item: str) -> Any:
         try:
             uniform = self._uniforms[item]
@@ -1437,37 +1798,28 @@ class ShaderProgram:
 
     def _vertex_list_create(self, count: int, mode: int, indices: Sequence[int] | None = None,
                             instances: Sequence[str] | None = None, batch: Batch = None, group: Group = None,
-                            **data: Any) -> VertexList | IndexedVertexList:
-        attributes = self._attributes.copy()
+                            usage: int = GL_DYNAMIC_DRAW, **data: Any) -> VertexList | IndexedVertexList:
         initial_arrays = []
+        formats = []
 
         instanced = instances is not None
         indexed = indices is not None
 
         for name, fmt in data.items():
-            try:
-                if isinstance(fmt, tuple):
-                    fmt, array = fmt  # noqa: PLW2901
-                    initial_arrays.append((name, array))
-                attributes[name] = {**attributes[name], 'format': fmt, 'instance': name in instances if instances else False}
-            except KeyError:  # noqa: PERF203
-                if _debug_gl_shaders:
-                    msg = (f"The attribute `{name}` was not found in the Shader Program.\n"
-                           f"Please check the spelling, or it may have been optimized out by the OpenGL driver.\n"
-                           f"Valid names: {list(attributes)}")
-                    warnings.warn(msg)
-                continue
+            if isinstance(fmt, tuple):
+                fmt, array = fmt  # noqa: PLW2901
+                initial_arrays.append((name, array))
+            formats.append((name, fmt))
 
-        if _debug_gl_shaders:
-            if missing_data := [key for key in attributes if key not in data]:
-                msg = (
-                    f"No data was supplied for the following found attributes: `{missing_data}`.\n"
-                )
-                warnings.warn(msg)
+        key = tuple(formats), tuple(instances) if instanced else None
+        try:
+            layout = self._layouts[key]
+        except KeyError:
+            layout = self._layouts[key] = self._create_layout(formats, instances)
 
         batch = batch or pyglet.graphics.get_default_batch()
         group = group or pyglet.graphics.ShaderGroup(program=self)
-        domain = batch.get_domain(indexed, instanced, mode, group, attributes)
+        domain = batch.get_domain(indexed, instanced, mode, group, layout, usage)
 
         # Create vertex list and initialize
         if indexed:
@@ -1487,8 +1839,32 @@ class ShaderProgram:
 
         return vlist
 
+    def _create_layout(self, formats: Sequence[tuple[str, str]], instances: Sequence[str] | None) -> VertexLayout:
+        """Create the vertex layout for the given attribute formats and instanced attributes."""
+        attributes = self._attributes.copy()
+        for name, fmt in formats:
+            try:
+                attributes[name] = {**attributes[name], 'format': fmt, 'instance': name in instances if instances else False}
+            except KeyError:  # noqa: PERF203
+                if _debug_gl_shaders:
+                    msg = (f"The attribute `{name}` was not found in the Shader Program.\n"
+                           f"Please check the spelling, or it may have been optimized out by the OpenGL driver.\n"
+                           f"Valid names: {list(attributes)}")
+                    warnings.warn(msg)
+                continue
+
+        if _debug_gl_shaders:
+            names = [name for name, _ in formats]
+            if missing_data := [key for key in attributes if key not in names]:
+                msg = (
+                    f"No data was supplied for the following found attributes: `{missing_data}`.\n"
+                )
+                warnings.warn(msg)
+
+        return VertexLayout(attributes)
+
     def vertex_list(self, count: int, mode: int, batch: Batch = None, group: Group = None,
-                    **data: Any) -> VertexList:
+                    usage: int = GL_DYNAMIC_DRAW, **data: Any) -> VertexList:
         """Create a VertexList.
 
         Args:
@@ -1503,19 +1879,24 @@ class ShaderProgram:
                 Using a Batch is strongly recommended.
             group:
                 Group to add the VertexList to, or ``None`` if no group is required.
+            usage:
+                A hint of how often the vertex data will change. Use ``GL_STREAM_DRAW``
+                for data that changes every frame, to write it through persistently
+                mapped buffers where supported.
             data:
                 Attribute formats and initial data for the vertex list.
 
         """
-        return self._vertex_list_create(count, mode, None, None, batch=batch, group=group, **data)
+        return self._vertex_list_create(count, mode, None, None, batch=batch, group=group, usage=usage, **data)
 
     def vertex_list_instanced(self, count: int, mode: int, instance_attributes: Sequence[str], batch: Batch = None,
-                              group: Group = None, **data: Any) -> VertexList:
+                              group: Group = None, usage: int = GL_DYNAMIC_DRAW, **data: Any) -> VertexList:
         assert len(instance_attributes) > 0, "You must provide at least one attribute name to be instanced."
-        return self._vertex_list_create(count, mode, None, instance_attributes, batch=batch, group=group, **data)
+        return self._vertex_list_create(count, mode, None, instance_attributes, batch=batch, group=group,
+                                        usage=usage, **data)
 
     def vertex_list_indexed(self, count: int, mode: int, indices: Sequence[int], batch: Batch = None,
-                            group: Group = None, **data: Any) -> IndexedVertexList:
+                            group: Group = None, usage: int = GL_DYNAMIC_DRAW, **data: Any) -> IndexedVertexList:
         """Create a IndexedVertexList.
 
         Args:
@@ -1532,16 +1913,136 @@ class ShaderProgram:
                 Using a Batch is strongly recommended.
             group:
                 Group to add the VertexList to, or ``None`` if no group is required.
+            usage:
+                A hint of how often the vertex data will change. Use ``GL_STREAM_DRAW``
+                for data that changes every frame, to write it through persistently
+                mapped buffers where supported.
             data:
                 Attribute formats and initial data for the vertex list.
         """
-        return self._vertex_list_create(count, mode, indices, None, batch=batch, group=group, **data)
+        return self._vertex_list_create(count, mode, indices, None, batch=batch, group=group, usage=usage, **data)
 
     def vertex_list_instanced_indexed(self, count: int, mode: int, indices: Sequence[int],
                                       instance_attributes: Sequence[str], batch: Batch = None, group: Group = None,
-                                      **data: Any) -> IndexedVertexList:
+                                      usage: int = GL_DYNAMIC_DRAW, **data: Any) -> IndexedVertexList:
         assert len(instance_attributes) > 0, "You must provide at least one attribute name to be instanced."
-        return self._vertex_list_create(count, mode, indices, instance_attributes, batch=batch, group=group, **data)
+        return self._vertex_list_create(count, mode, indices, instance_attributes, batch=batch, group=group,
+                                        usage=usage, **data)
+
+    def _vertex_lists_create(self, n: int, count: int, mode: int, indices: Sequence[int] | None = None,
+                             batch: Batch = None, group: Group = None, usage: int = GL_DYNAMIC_DRAW,
+                             **data: Any) -> list[VertexList] | list[IndexedVertexList]:
+        initial_arrays = []
+        formats = []
+
+        for name, fmt in data.items():
+            if isinstance(fmt, tuple):
+                fmt, array = fmt  # noqa: PLW2901
+                initial_arrays.append((name, array))
+            formats.append((name, fmt))
+
+        key = tuple(formats), None
+        try:
+            layout = self._layouts[key]
+        except KeyError:
+            layout = self._layouts[key] = self._create_layout(formats, None)
+
+        batch = batch or pyglet.graphics.get_default_batch()
+        group = group or pyglet.graphics.ShaderGroup(program=self)
+        domain = batch.get_domain(indices is not None, False, mode, group, layout, usage)
+
+        if indices is not None:
+            vertex_lists = domain.create_many(n, count, len(indices))
+        else:
+            vertex_lists = domain.create_many(n, count)
+        if not vertex_lists:
+            return vertex_lists
+
+        start = vertex_lists[0].start
+        total = n * count
+        if indices is not None:
+            # Offset the indices of each vertex list by its start, as in `IndexedVertexList.indices`:
+            data = [i + start + offset for offset in range(0, total, count) for i in indices]
+            domain.index_buffer.set_region(vertex_lists[0].index_start, n * len(indices), data)
+
+        for name, array in initial_arrays:
+            try:
+                buffer = domain.attrib_name_buffers[name]
+            except KeyError:  # noqa: PERF203
+                continue
+
+            if isinstance(array, (list, tuple)):
+                if len(array) == count * buffer.count:
+                    array = array * n  # noqa: PLW2901
+                buffer.set_region(start, total, array)
+            else:
+                view = memoryview(array)
+                if view.nbytes == count * buffer.stride:
+                    # ctypes arrays report a byte order prefix, such as '<f', which `cast` rejects:
+                    view = memoryview(bytes(view.cast('B')) * n).cast(view.format.lstrip('@=<>!'))
+                buffer.set_region_buffer(start, total, view)
+
+        return vertex_lists
+
+    def vertex_lists(self, n: int, count: int, mode: int, batch: Batch = None, group: Group = None,
+                     usage: int = GL_DYNAMIC_DRAW, **data: Any) -> list[VertexList]:
+        """Create many VertexLists of the same size at once.
+
+        This is much faster than calling :py:meth:`vertex_list` ``n`` times.
+        The vertex lists are allocated together, with a single resize of
+        the domain's buffers if needed, and their initial data is copied in
+        one operation per attribute.
+
+        Args:
+            n:
+                The number of vertex lists to create.
+            count:
+                The number of vertices in each list.
+            mode:
+                OpenGL drawing mode enumeration; for example, one of
+                ``GL_POINTS``, ``GL_LINES``, ``GL_TRIANGLES``, etc.
+            batch:
+                Batch to add the VertexLists to, or ``None`` if a Batch will not be used.
+            group:
+                Group to add the VertexLists to, or ``None`` if no group is required.
+            usage:
+                A hint of how often the vertex data will change.
+            data:
+                Attribute formats and initial data. The data is either for a
+                single vertex list, and repeated for each of them, or for all
+                of the vertex lists in order. It can be a sequence, or an
+                object supporting the buffer protocol of the attribute's type.
+        """
+        return self._vertex_lists_create(n, count, mode, None, batch=batch, group=group, usage=usage, **data)
+
+    def vertex_lists_indexed(self, n: int, count: int, mode: int, indices: Sequence[int], batch: Batch = None,
+                             group: Group = None, usage: int = GL_DYNAMIC_DRAW,
+                             **data: Any) -> list[IndexedVertexList]:
+        """Create many IndexedVertexLists of the same size at once.
+
+        See :py:meth:`vertex_lists`.
+
+        Args:
+            n:
+                The number of vertex lists to create.
+            count:
+                The number of vertices in each list.
+            mode:
+                OpenGL drawing mode enumeration; for example, one of
+                ``GL_POINTS``, ``GL_LINES``, ``GL_TRIANGLES``, etc.
+            indices:
+                Sequence of integers giving indices into each vertex list.
+                The same indices are used for all of them.
+            batch:
+                Batch to add the VertexLists to, or ``None`` if a Batch will not be used.
+            group:
+                Group to add the VertexLists to, or ``None`` if no group is required.
+            usage:
+                A hint of how often the vertex data will change.
+            data:
+                Attribute formats and initial data, as for :py:meth:`vertex_lists`.
+        """
+        return self._vertex_lists_create(n, count, mode, indices, batch=batch, group=group, usage=usage, **data)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(id={self.id})"
@@ -1572,12 +2073,22 @@ class ComputeShaderProgram:
 
         self._shader = Shader(source, 'compute')
         self._context = pyglet.gl.current_context
-        self._id = _link_program(self._shader)
+
+        cache_file = _get_program_cache_file((self._shader,))
+        cached = cache_file and _load_program_binary(cache_file)
+        if cached:
+            self._id, _, uniform_info = cached
+        else:
+            self._id = _link_program(self._shader, retrievable=cache_file is not None)
+            uniform_info = None
+            if cache_file:
+                uniform_info = _query_uniforms(self._id)
+                _save_program_binary(cache_file, self._id, {}, uniform_info)
 
         if _debug_gl_shaders:
             print(_get_program_log(self._id))
 
-        self._uniforms = _introspect_uniforms(self._id, True)
+        self._uniforms = _introspect_uniforms(self._id, True, uniform_info)
         self._uniform_blocks = _introspect_uniform_blocks(self)
 
         self.max_work_group_size = self._get_tuple(gl.GL_MAX_COMPUTE_WORK_GROUP_SIZE)  # x, y, z
@@ -0,0 +1,178 @@
+"""Draw order used by a :py:class:`~pyglet.graphics.Batch` to draw transparent content back to front.
+
+Groups only order the state changes of a batch. Within a domain, vertex lists
+are drawn in the order they are allocated, so overlapping transparent
+drawables may blend in the wrong order. Separating them with one group per
+depth level works, but costs a draw call per level.
+
+A batch created with ``sort_by`` instead keeps a :py:class:`DrawOrder` for
+each of its domains. This is a second index buffer, holding the vertex lists
+of the domain in order of their sort key, so the domain is still drawn in a
+single call. See :py:attr:`pyglet.graphics.Batch.sort_by`.
+"""
+from __future__ import annotations
+
+import ctypes
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from pyglet.gl.gl import (
+    GL_LINES,
+    GL_LINES_ADJACENCY,
+    GL_POINTS,
+    GL_TRIANGLES,
+    GL_TRIANGLES_ADJACENCY,
+    GL_UNSIGNED_INT,
+    glDrawElements,
+)
+from pyglet.graphics.vertexbuffer import IndexedBufferObject
+
+if TYPE_CHECKING:
+    from pyglet.graphics.vertexdomain import IndexedVertexList, VertexDomain, VertexList
+
+#: Modes of independent primitives, which can be drawn from the joined indices of many vertex lists.
+#: Strips, loops and fans would be connected across vertex lists, so their domains are not sorted.
+SORTABLE_MODES = frozenset((GL_POINTS, GL_LINES, GL_TRIANGLES, GL_LINES_ADJACENCY, GL_TRIANGLES_ADJACENCY))
+
+
+class DrawOrder:
+    """The vertex lists of one domain, in order of their sort key.
+
+    The indices of the domain's vertex lists are copied into a separate index
+    buffer in sorted order. For domains that are not indexed, the indices of
+    each vertex are generated. Lists without a key sort as ``0.0``, and equal
+    keys keep their previous order.
+
+    Sorting only happens when a key or an allocation has changed. The order
+    of the last draw is kept, so nearly sorted data, such as a few sprites
+    moving between layers, is re-sorted in close to linear time. Only
+    the indices of vertex lists whose place has changed are uploaded.
+
+    The domain must track its vertex lists, as with ``compacting``.
+    """
+    dirty: bool
+
+    def __init__(self, domain: VertexDomain, keys: Dict[VertexList, float]) -> None:
+        """Create the draw order of a domain.
+
+        Args:
+            domain:
+                The domain to draw.
+            keys:
+                The sort key of each vertex list. This mapping is shared, and
+                may contain vertex lists of other domains.
+        """
+        assert domain.compacting, "Domain does not track its vertex lists."
+        self.domain = domain
+        self.keys = keys
+        self.dirty = True
+
+        self._indexed = hasattr(domain, 'index_allocator')
+        if self._indexed:
+            self._gl_type = domain.index_gl_type
+            self._c_type = domain.index_c_type
+        else:
+            self._gl_type = GL_UNSIGNED_INT
+            self._c_type = ctypes.c_uint
+        self._element_size = ctypes.sizeof(self._c_type)
+        self.buffer = IndexedBufferObject(16 * self._element_size, self._c_type, self._element_size, 1)
+
+        self._generation = None
+        self._rewrite = False
+        self._order: List[VertexList | IndexedVertexList] = []
+        # (vertex list, draw region, offset) written at each position of `_order`:
+        self._written: List[Tuple[VertexList | IndexedVertexList, Tuple[int, int], int]] = []
+        self._count = 0
+
+    def _get_generation(self) -> Tuple[int, int]:
+        domain = self.domain
+        if self._indexed:
+            return domain.allocator.generation, domain.index_allocator.generation
+        return domain.allocator.generation, 0
+
+    def commit(self) -> None:
+        """Commit the domain, and bring the sorted indices up to date."""
+        domain = self.domain
+        # Changed indices are not visible from the allocator, only from the pending upload:
+        if self._indexed and domain.index_buffer._dirty:  # noqa: SLF001
+            self._rewrite = True
+        domain.commit()
+
+        generation = self._get_generation()
+        if generation != self._generation:
+            self._generation = generation
+            lists = domain._vertex_lists  # noqa: SLF001
+            order = [vertex_list for vertex_list in self._order if vertex_list in lists]
+            if len(order) != len(lists):
+                known = set(order)
+                order.extend(vertex_list for vertex_list in lists if vertex_list not in known)
+            self._order = order
+            self.dirty = True
+
+        if self.dirty or self._rewrite:
+            if self.dirty:
+                keys = self.keys
+                self._order.sort(key=lambda vertex_list: keys.get(vertex_list, 0.0))
+            self._write_indices()
+            self.dirty = False
+            self._rewrite = False
+
+        self.buffer.commit()
+
+    def _write_indices(self) -> None:
+        domain = self.domain
+        get_region = domain.get_draw_region
+        order = self._order
+        written = self._written
+        rewrite = self._rewrite
+
+        total = sum(get_region(vertex_list)[1] for vertex_list in order)
+        buffer = self.buffer
+        if total * self._element_size > buffer.size:
+            size = buffer.size
+            while size < total * self._element_size:
+                size *= 2
+            buffer.resize(size)
+
+        element_size = self._element_size
+        data = buffer.data
+        data_ptr = buffer.data_ptr
+        if self._indexed:
+            source_ptr = domain.index_buffer.data_ptr
+
+        offset = 0
+        for i, vertex_list in enumerate(order):
+            region = get_region(vertex_list)
+            start, count = region
+            # Unchanged vertex lists at unchanged offsets are already in place:
+            if rewrite or i >= len(written) or written[i] != (vertex_list, region, offset):
+                if self._indexed:
+                    ctypes.memmove(data_ptr + offset * element_size, source_ptr + start * element_size,
+                                   count * element_size)
+                else:
+                    data[offset:offset + count] = range(start, start + count)
+                buffer.invalidate_region(offset, count)
+                if i < len(written):
+                    written[i] = (vertex_list, region, offset)
+                else:
+                    written.append((vertex_list, region, offset))
+            offset += count
+
+        del written[len(order):]
+        self._count = total
+
+    def draw(self, mode: int) -> None:
+        """Draw the domain in sorted order, without committing pending changes.
+
+        Args:
+            mode:
+                OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
+        """
+        if not self._count:
+            return
+
+        domain = self.domain
+        domain.vao.bind()
+        self.buffer.bind_to_index_buffer()
+        glDrawElements(mode, self._count, self._gl_type, 0)
+        if self._indexed:
+            domain.index_buffer.bind_to_index_buffer()
@@ -0,0 +1,265 @@
+"""Cache of the OpenGL state set by the built-in groups.
+
+Adjacent groups in a :py:class:`~pyglet.graphics.Batch` often set the same
+state: sprites with different textures still share a program and blend mode.
+Built-in groups set their state through the :py:class:`StateCache` of the
+current context, which skips calls that would not change anything.
+
+The cache is only trusted while a batch is drawing. Outside of
+:py:meth:`StateCache.begin` and :py:meth:`StateCache.end`, every call is
+passed through to OpenGL. While drawing, state released in ``unset_state``
+is only reset when the next group needs it reset, or when the batch ends.
+
+Custom groups do not need to know about the cache. The batch flushes and
+forgets the cached state around every group that is not tracked, so raw
+OpenGL calls in their ``set_state`` and ``unset_state`` are safe.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import pyglet
+from pyglet.gl.gl import (
+    GL_BLEND,
+    GL_SCISSOR_TEST,
+    GL_TEXTURE0,
+    glActiveTexture,
+    glBindTexture,
+    glBlendFunc,
+    glDisable,
+    glEnable,
+    glScissor,
+    glUseProgram,
+)
+
+if TYPE_CHECKING:
+    from pyglet.graphics import Group
+
+GroupT = TypeVar('GroupT', bound='Group')
+
+
+def tracks_state(cls: type[GroupT]) -> type[GroupT]:
+    """Class decorator marking a Group that sets all of its state through the cache.
+
+    Subclasses which override ``set_state`` or ``unset_state`` are not
+    tracked, unless they are decorated as well.
+    """
+    cls._state_cache_methods = (cls.set_state, cls.unset_state)  # noqa: SLF001
+    return cls
+
+
+def is_tracked(group: Group) -> bool:
+    """Check if a group sets all of its state through the cache."""
+    cls = group.__class__
+    return getattr(cls, '_state_cache_methods', None) == (cls.set_state, cls.unset_state)
+
+
+def get_state_key(group: Group) -> Hashable | None:
+    """Get the key of the state set by a group, or ``None`` if it is unknown.
+
+    The key of :py:meth:`~pyglet.graphics.Group.state_key` is only used if
+    the class defining it also defines the ``set_state`` and ``unset_state``
+    in use. Subclasses which override either one have no key, unless they
+    override ``state_key`` as well.
+    """
+    cls = group.__class__
+    owner = next(base for base in cls.__mro__ if 'state_key' in vars(base))
+    if cls.set_state is not owner.set_state or cls.unset_state is not owner.unset_state:
+        return None
+    return group.state_key()
+
+
+def call_untracked(func: Callable[[], None]) -> None:
+    """Call a method of a group that is not tracked, while a batch is drawing.
+
+    Released state is reset first, as the group may rely on it. The cached
+    state is forgotten before and after, as the group may change it.
+    """
+    state = get_state_cache()
+    state.flush()
+    state.invalidate()
+    func()
+    state.flush()
+    state.invalidate()
+
+
+def get_state_cache() -> StateCache:
+    """Get the state cache of the current context."""
+    context = pyglet.gl.current_context
+    try:
+        return context.state_cache
+    except AttributeError:
+        context.state_cache = StateCache()
+        return context.state_cache
+
+
+class StateCache:
+    """OpenGL state set by the built-in groups in one context.
+
+    ``calls`` counts the OpenGL calls made through the cache, and ``skipped``
+    the calls that were not needed because the state was already set.
+    """
+    calls: int
+    skipped: int
+
+    def __init__(self) -> None:  # noqa: D107
+        self.calls = 0
+        self.skipped = 0
+        self._depth = 0
+
+        # `None` is unknown state:
+        self._program: Optional[int] = None
+        self._active_texture: Optional[int] = None
+        self._textures: Dict[Tuple[int, int], int] = {}
+        self._blend: Optional[bool] = None
+        self._blend_func: Optional[Tuple[int, int]] = None
+        self._scissor: Optional[bool] = None
+        self._scissor_box: Optional[Tuple[int, int, int, int]] = None
+
+        # State released by a group, and not yet reset:
+        self._release_program = False
+        self._release_blend = False
+        self._release_scissor = False
+
+    @property
+    def active(self) -> bool:
+        """``True`` while a batch is drawing, and the cached state is trusted."""
+        return self._depth > 0
+
+    def reset_stats(self) -> None:
+        """Reset the ``calls`` and ``skipped`` counters."""
+        self.calls = 0
+        self.skipped = 0
+
+    def begin(self) -> None:
+        """Start trusting the cached state. Calls may be nested."""
+        if self._depth == 0:
+            self.invalidate()
+        self._depth += 1
+
+    def end(self) -> None:
+        """Reset all released state, and stop trusting the cached state."""
+        self._depth -= 1
+        if self._depth == 0:
+            self.flush()
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the cached state, after OpenGL calls made outside of the cache."""
+        self._program = None
+        self._active_texture = None
+        self._textures.clear()
+        self._blend = None
+        self._blend_func = None
+        self._scissor = None
+        self._scissor_box = None
+
+    def flush(self) -> None:
+        """Reset any state that was released, but is still set."""
+        if self._release_blend:
+            self._release_blend = False
+            if self._blend is not False:
+                glDisable(GL_BLEND)
+                self._blend = False
+                self.calls += 1
+        if self._release_scissor:
+            self._release_scissor = False
+            if self._scissor is not False:
+                glDisable(GL_SCISSOR_TEST)
+                self._scissor = False
+                self.calls += 1
+        if self._release_program:
+            self._release_program = False
+            if self._program != 0:
+                glUseProgram(0)
+                self._program = 0
+                self.calls += 1
+
+    def use_program(self, program_id: int) -> None:
+        """Make a program current."""
+        self._release_program = False
+        if self._depth and self._program == program_id:
+            self.skipped += 1
+            return
+        glUseProgram(program_id)
+        self._program = program_id
+        self.calls += 1
+
+    def stop_program(self) -> None:
+        """Release the current program."""
+        self._release_program = True
+        if not self._depth:
+            self.flush()
+
+    def bind_texture(self, target: int, texture_id: int, unit: int = GL_TEXTURE0) -> None:
+        """Bind a texture to a texture unit.
+
+        Args:
+            target:
+                The texture target, such as ``GL_TEXTURE_2D``.
+            texture_id:
+                The OpenGL name of the texture.
+            unit:
+                The texture unit, such as ``GL_TEXTURE0``.
+        """
+        key = unit, target
+        if self._depth and self._textures.get(key) == texture_id:
+            self.skipped += 1
+            return
+        if not (self._depth and self._active_texture == unit):
+            glActiveTexture(unit)
+            self._active_texture = unit
+            self.calls += 1
+        glBindTexture(target, texture_id)
+        self._textures[key] = texture_id
+        self.calls += 1
+
+    def enable_blend(self, src: int, dest: int) -> None:
+        """Enable blending with the given blend function."""
+        self._release_blend = False
+        if self._depth and self._blend:
+            self.skipped += 1
+        else:
+            glEnable(GL_BLEND)
+            self._blend = True
+            self.calls += 1
+
+        if self._depth and self._blend_func == (src, dest):
+            self.skipped += 1
+        else:
+            glBlendFunc(src, dest)
+            self._blend_func = src, dest
+            self.calls += 1
+
+    def disable_blend(self) -> None:
+        """Release blending."""
+        self._release_blend = True
+        if not self._depth:
+            self.flush()
+
+    def enable_scissor(self, x: int, y: int, width: int, height: int) -> None:
+        """Enable the scissor test with the given box, in framebuffer pixels."""
+        self._release_scissor = False
+        if self._depth and self._scissor:
+            self.skipped += 1
+        else:
+            glEnable(GL_SCISSOR_TEST)
+            self._scissor = True
+            self.calls += 1
+
+        box = x, y, width, height
+        if self._depth and self._scissor_box == box:
+            self.skipped += 1
+        else:
+            glScissor(x, y, width, height)
+            self._scissor_box = box
+            self.calls += 1
+
+    def disable_scissor(self) -> None:
+        """Release the scissor test."""
+        self._release_scissor = True
+        if not self._depth:
+            self.flush()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(calls={self.calls}, skipped={self.skipped})"
@@ -0,0 +1,155 @@
+"""Counters for the work done when drawing a :py:class:`~pyglet.graphics.Batch`.
+
+Assign a :py:class:`RenderStats` to :py:attr:`pyglet.graphics.Batch.stats`
+to start collecting. The counters are cheap to update, and can be left enabled
+in a shipped application::
+
+    batch.stats = RenderStats()
+
+    @window.event
+    def on_draw():
+        window.clear()
+        batch.draw()
+
+    def log_stats(dt):
+        print(batch.stats.as_dict())
+        batch.stats.reset()
+
+    pyglet.clock.schedule_interval(log_stats, 1.0)
+
+Counters accumulate over every :py:meth:`~pyglet.graphics.Batch.draw` until
+:py:meth:`RenderStats.reset` is called. Divide by :py:attr:`RenderStats.frames`
+for per-frame averages. No OpenGL queries are made: draw calls and state
+changes are counted as they are issued, and ``draw_time`` is CPU time.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, Tuple
+
+if TYPE_CHECKING:
+    from pyglet.graphics.vertexdomain import VertexDomain
+
+
+def get_upload_totals(domains: Iterable[VertexDomain]) -> Tuple[int, int]:
+    """Get the total ``(bytes_uploaded, upload_calls)`` of the buffers of some domains.
+
+    Buffers without upload counters, such as persistently mapped buffers, are
+    not counted.
+    """
+    total_bytes = 0
+    total_calls = 0
+    for domain in domains:
+        buffers = [buffer for buffer, _ in domain.buffer_attributes]
+        index_buffer = getattr(domain, 'index_buffer', None)
+        if index_buffer is not None:
+            buffers.append(index_buffer)
+        for buffer in buffers:
+            total_bytes += getattr(buffer, 'bytes_uploaded', 0)
+            total_calls += getattr(buffer, 'upload_calls', 0)
+    return total_bytes, total_calls
+
+
+class RenderStats:
+    """Counters for the work done by :py:meth:`pyglet.graphics.Batch.draw`.
+
+    Attributes:
+        frames:
+            The number of times the batch was drawn.
+        draw_calls:
+            The number of OpenGL draw calls issued.
+        multi_draw_calls:
+            The number of those draw calls that drew more than one region,
+            such as ``glMultiDrawArrays``.
+        primcount:
+            The number of separate regions drawn, summed over all draw calls.
+            An instanced draw call counts as one region.
+        group_state_changes:
+            The number of ``set_state`` and ``unset_state`` calls on groups.
+        gl_state_calls:
+            The number of OpenGL state calls made through the
+            :py:class:`~pyglet.graphics.state.StateCache`.
+        gl_state_skipped:
+            The number of OpenGL state calls skipped by the state cache, as
+            the state was already set.
+        bytes_uploaded:
+            The number of bytes of vertex and index data uploaded when
+            committing the batch's buffers.
+        upload_calls:
+            The number of buffer upload calls made when committing.
+        draw_time:
+            Seconds spent in ``Batch.draw``, measured on the CPU. Drawing
+            is asynchronous, so this does not include time spent by the GPU.
+        fragmentation:
+            The fraction of free space in each domain's vertex allocator that
+            is not at the end of the buffer, as returned by
+            :py:meth:`~pyglet.graphics.allocation.Allocator.get_fragmentation`.
+            This is updated on every draw, and is not reset.
+    """
+    frames: int
+    draw_calls: int
+    multi_draw_calls: int
+    primcount: int
+    group_state_changes: int
+    gl_state_calls: int
+    gl_state_skipped: int
+    bytes_uploaded: int
+    upload_calls: int
+    draw_time: float
+    fragmentation: Dict[VertexDomain, float]
+
+    def __init__(self) -> None:  # noqa: D107
+        self.fragmentation = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters to zero."""
+        self.frames = 0
+        self.draw_calls = 0
+        self.multi_draw_calls = 0
+        self.primcount = 0
+        self.group_state_changes = 0
+        self.gl_state_calls = 0
+        self.gl_state_skipped = 0
+        self.bytes_uploaded = 0
+        self.upload_calls = 0
+        self.draw_time = 0.0
+
+    @property
+    def max_fragmentation(self) -> float:
+        """The highest fragmentation of any domain, or ``0.0`` if there are none."""
+        return max(self.fragmentation.values(), default=0.0)
+
+    def add_draw(self, primcount: int) -> None:
+        """Count a draw call that drew ``primcount`` regions.
+
+        A ``primcount`` of zero is not a draw call, as nothing is submitted.
+        """
+        if primcount:
+            self.draw_calls += 1
+            self.primcount += primcount
+            if primcount > 1:
+                self.multi_draw_calls += 1
+
+    def as_dict(self) -> Dict[str, float]:
+        """Get the counters as a dictionary, for logging.
+
+        Fragmentation is summarized by :py:attr:`max_fragmentation`.
+        """
+        return {
+            'frames': self.frames,
+            'draw_calls': self.draw_calls,
+            'multi_draw_calls': self.multi_draw_calls,
+            'primcount': self.primcount,
+            'group_state_changes': self.group_state_changes,
+            'gl_state_calls': self.gl_state_calls,
+            'gl_state_skipped': self.gl_state_skipped,
+            'bytes_uploaded': self.bytes_uploaded,
+            'upload_calls': self.upload_calls,
+            'draw_time': self.draw_time,
+            'max_fragmentation': self.max_fragmentation,
+        }
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(frames={self.frames}, draw_calls={self.draw_calls}, "
+                f"primcount={self.primcount}, bytes_uploaded={self.bytes_uploaded}, "
+                f"draw_time={self.draw_time:.6f})")
@@ -5,26 +5,36 @@ The first is a lightweight abstraction over an OpenGL buffer, as created
 with ``glGenBuffers``. The backed buffer object is similar, but provides a
 full mirror of the data in CPU memory. This allows for delayed uploading of
 changes to GPU memory, which can improve performance is some cases.
+
+For data that changes every frame, :py:class:`~StreamingBufferObject` keeps
+the same CPU mirror, but copies changes into a persistently mapped ring of
+buffer sections instead of calling into the driver.
 """
 from __future__ import annotations
 
 import abc
 import ctypes
-import sys
 from functools import lru_cache
-from typing import TYPE_CHECKING, Sequence, Type
+from typing import TYPE_CHECKING, Any, Sequence, Type
 
 from _ctypes import Array, _Pointer, _SimpleCData
 
 import pyglet
+from pyglet.gl import gl_info
 from pyglet.gl.gl import (
     GL_ARRAY_BUFFER,
+    GL_COPY_READ_BUFFER,
+    GL_COPY_WRITE_BUFFER,
     GL_DYNAMIC_DRAW,
     GL_ELEMENT_ARRAY_BUFFER,
-    GL_MAP_READ_BIT,
     GL_MAP_WRITE_BIT,
     GL_MAP_COHERENT_BIT,
     GL_MAP_PERSISTENT_BIT,
+    GL_STREAM_COPY,
+    GL_STREAM_DRAW,
+    GL_SYNC_FLUSH_COMMANDS_BIT,
+    GL_SYNC_GPU_COMMANDS_COMPLETE,
+    GL_TIMEOUT_EXPIRED,
     GL_WRITE_ONLY,
     GLubyte,
     GLuint,
@@ -32,7 +42,11 @@ from pyglet.gl.gl import (
     glBufferData,
     glBufferStorage,
     glBufferSubData,
+    glClientWaitSync,
+    glCopyBufferSubData,
     glDeleteBuffers,
+    glDeleteSync,
+    glFenceSync,
     glGenBuffers,
     glMapBuffer,
     glMapBufferRange,
@@ -200,16 +214,27 @@ class BufferObject(AbstractBuffer):
                 pass  # Interpreter is shutting down
 
     def resize(self, size: int) -> None:
-        # Map, create a copy, then reinitialize.
-        temp = (ctypes.c_byte * size)()
+        # Copy the contents to a temporary buffer on the GPU, reinitialize, then copy
+        # them back. This avoids reading the data back into system memory, and keeps
+        # the buffer ID (and any vertex array bindings to it) intact.
+        copy_size = min(size, self.size)
+
+        if copy_size:
+            temp_id = GLuint()
+            glGenBuffers(1, temp_id)
+            glBindBuffer(GL_COPY_WRITE_BUFFER, temp_id)
+            glBufferData(GL_COPY_WRITE_BUFFER, copy_size, None, GL_STREAM_COPY)
+            glBindBuffer(GL_COPY_READ_BUFFER, self.id)
+            glCopyBufferSubData(GL_COPY_READ_BUFFER, GL_COPY_WRITE_BUFFER, 0, 0, copy_size)
 
         glBindBuffer(GL_ARRAY_BUFFER, self.id)
-        data = glMapBufferRange(GL_ARRAY_BUFFER, 0, self.size, GL_MAP_READ_BIT)
-        ctypes.memmove(temp, data, min(size, self.size))
-        glUnmapBuffer(GL_ARRAY_BUFFER)
-
+        glBufferData(GL_ARRAY_BUFFER, size, None, self.usage)
         self.size = size
-        glBufferData(GL_ARRAY_BUFFER, self.size, temp, self.usage)
+
+        if copy_size:
+            glBindBuffer(GL_COPY_READ_BUFFER, temp_id)
+            glCopyBufferSubData(GL_COPY_READ_BUFFER, GL_ARRAY_BUFFER, 0, 0, copy_size)
+            glDeleteBuffers(1, temp_id)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(id={self.id}, size={self.size})"
@@ -222,16 +247,45 @@ class BackedBufferObject(BufferObject):
     in system memory until ``commit`` is called.  The advantage is that fewer
     OpenGL calls are needed, which can increase performance at the expense of
     system memory.
+
+    Changed regions are tracked individually. On commit, nearby regions are
+    coalesced and uploaded separately, so that scattered changes do not
+    require uploading everything in between. If too many regions remain, or
+    most of the buffer has changed, the buffer is uploaded in one call.
+
+    Attributes:
+        coalesce_gap:
+            Dirty regions separated by fewer than this many bytes are
+            uploaded together.
+        max_dirty_ranges:
+            The maximum number of separate uploads per commit. Past this,
+            a single upload spanning all changes is made. Changes are also
+            merged as they are made, once they add four times as many ranges.
+        full_upload_threshold:
+            The fraction of the buffer which, once dirty, causes the entire
+            buffer to be re-specified with ``glBufferData``.
+        bytes_uploaded:
+            The number of bytes uploaded by ``commit`` since the last call
+            to :py:meth:`reset_stats`.
+        upload_calls:
+            The number of upload calls made by ``commit`` since the last
+            call to :py:meth:`reset_stats`.
     """
     data: CTypesDataType
     data_ptr: int
-    _dirty_min: int
-    _dirty_max: int
+    _dirty_ranges: list[list[int]]
     _dirty: bool
     stride: int
     count: int
     ctype: CTypesDataType
 
+    coalesce_gap: int = 1024
+    max_dirty_ranges: int = 16
+    full_upload_threshold: float = 0.75
+
+    bytes_uploaded: int
+    upload_calls: int
+
     def __init__(self, size: int, c_type: CTypesDataType, stride: int, count: int,  # noqa: D107
                  usage: int = GL_DYNAMIC_DRAW) -> None:
         super().__init__(size, usage)
@@ -242,13 +296,15 @@ class BackedBufferObject(BufferObject):
         self.data = (c_type * number)()
         self.data_ptr = ctypes.addressof(self.data)
 
-        self._dirty_min = sys.maxsize
-        self._dirty_max = 0
+        self._dirty_ranges = []
         self._dirty = False
 
         self.stride = stride
         self.count = count
 
+        self.bytes_uploaded = 0
+        self.upload_calls = 0
+
     def commit(self) -> None:
         """Commits all saved changes to the underlying buffer before drawing.
 
@@ -257,17 +313,46 @@ class BackedBufferObject(BufferObject):
         if not self._dirty:
             return
 
+        ranges = _coalesce_ranges(self._dirty_ranges, self.coalesce_gap)
+        self._dirty_ranges = []
+        self._dirty = False
+        if not ranges:
+            return
+
+        if len(ranges) > self.max_dirty_ranges:
+            ranges = [(ranges[0][0], ranges[-1][1])]
+
         glBindBuffer(GL_ARRAY_BUFFER, self.id)
-        size = self._dirty_max - self._dirty_min
-        if size > 0:
-            if size == self.size:
-                glBufferData(GL_ARRAY_BUFFER, self.size, self.data, self.usage)
-            else:
-                glBufferSubData(GL_ARRAY_BUFFER, self._dirty_min, size, self.data_ptr + self._dirty_min)
+        dirty_size = sum(end - start for start, end in ranges)
+        if dirty_size >= self.size * self.full_upload_threshold:
+            glBufferData(GL_ARRAY_BUFFER, self.size, self.data, self.usage)
+            self.bytes_uploaded += self.size
+            self.upload_calls += 1
+        else:
+            data_ptr = self.data_ptr
+            for start, end in ranges:
+                glBufferSubData(GL_ARRAY_BUFFER, start, end - start, data_ptr + start)
+            self.bytes_uploaded += dirty_size
+            self.upload_calls += len(ranges)
+
+    def _merge_dirty_ranges(self) -> None:
+        """Merge the dirty ranges in place, as ``commit`` would.
+
+        Called as changes out of order add ranges, so that their number, and
+        the work left for ``commit``, stays bounded.
+        """
+        ranges = _coalesce_ranges(self._dirty_ranges, self.coalesce_gap)
+        if len(ranges) > self.max_dirty_ranges:
+            ranges = [(ranges[0][0], ranges[-1][1])]
+        self._dirty_ranges = [[start, end] for start, end in ranges]
 
-            self._dirty_min = sys.maxsize
-            self._dirty_max = 0
-            self._dirty = False
+    def reset_stats(self) -> None:
+        """Reset the ``bytes_uploaded`` and ``upload_calls`` counters.
+
+        Call this once per frame to measure the upload cost of each frame.
+        """
+        self.bytes_uploaded = 0
+        self.upload_calls = 0
 
     @lru_cache(maxsize=None)  # noqa: B019
     def get_region(self, start: int, count: int) -> Array[CTypesDataType]:
@@ -285,13 +370,67 @@ class BackedBufferObject(BufferObject):
         # replicated from self.invalidate_region
         byte_start = self.stride * start
         byte_end = byte_start + self.stride * count
-        # As of Python 3.11, this is faster than min/max:
-        if byte_start < self._dirty_min:
-            self._dirty_min = byte_start
-        if byte_end > self._dirty_max:
-            self._dirty_max = byte_end
+        ranges = self._dirty_ranges
+        if ranges:
+            # Sequential and repeated changes extend the previous range in place:
+            last = ranges[-1]
+            if byte_start <= last[1] and byte_end >= last[0]:
+                # As of Python 3.11, this is faster than min/max:
+                if byte_start < last[0]:
+                    last[0] = byte_start
+                if byte_end > last[1]:
+                    last[1] = byte_end
+            else:
+                ranges.append([byte_start, byte_end])
+                if len(ranges) > self.max_dirty_ranges * 4:
+                    self._merge_dirty_ranges()
+        else:
+            ranges.append([byte_start, byte_end])
         self._dirty = True
 
+    def get_region_view(self, start: int, count: int) -> memoryview:
+        """Get a writable view of a region of the backing store, without copying.
+
+        The view can be wrapped by NumPy (or anything else supporting the
+        buffer protocol) for vectorized updates. The region is marked as
+        dirty. The view is no longer valid once the buffer is resized.
+        """
+        byte_start = self.stride * start
+        view = memoryview(self.data).cast('B')[byte_start:byte_start + self.stride * count]
+        self.invalidate_region(start, count)
+        return view.cast(self.c_type._type_)
+
+    def set_region_buffer(self, start: int, count: int, data: Any) -> None:
+        """Set a region from any C-contiguous object supporting the buffer protocol.
+
+        The data is copied as raw bytes, so it must already be of the
+        buffer's element type, such as a NumPy ``float32`` array for a
+        float attribute.
+        """
+        source = memoryview(data)
+        if source.itemsize != self._ctypes_size:
+            msg = f"Expected elements of {self._ctypes_size} bytes, got {source.itemsize}."
+            raise ValueError(msg)
+
+        byte_start = self.stride * start
+        byte_end = byte_start + self.stride * count
+        source = source.cast('B')
+        if source.nbytes != byte_end - byte_start:
+            msg = f"Invalid data size. Expected {byte_end - byte_start} bytes, got {source.nbytes}."
+            raise ValueError(msg)
+
+        memoryview(self.data).cast('B')[byte_start:byte_end] = source
+        self.invalidate_region(start, count)
+
+    def move_region(self, start: int, new_start: int, count: int) -> None:
+        """Move a region of elements to a new position in the buffer.
+
+        The regions may overlap. The destination is marked as dirty.
+        """
+        ctypes.memmove(self.data_ptr + self.stride * new_start, self.data_ptr + self.stride * start,
+                       self.stride * count)
+        self.invalidate_region(new_start, count)
+
     def resize(self, size: int) -> None:
         # size is the allocator size * attribute.stride
         number = size // ctypes.sizeof(self.c_type)
@@ -299,36 +438,67 @@ class BackedBufferObject(BufferObject):
         ctypes.memmove(data, self.data, min(size, self.size))
         self.data = data
         self.data_ptr = ctypes.addressof(data)
-        self.size = size
 
-        # Set the dirty range to be the entire buffer.
-        self._dirty_min = 0
-        self._dirty_max = self.size
-        self._dirty = True
+        # The GPU side contents are copied over directly, so only pending changes
+        # and newly added space need to be uploaded.
+        old_size = self.size
+        super().resize(size)
+
+        ranges = [[start, min(end, size)] for start, end in self._dirty_ranges if start < size]
+        if size > old_size:
+            ranges.append([old_size, size])
+        self._dirty_ranges = ranges
+        self._dirty = bool(ranges)
 
         self.get_region.cache_clear()
 
     def invalidate(self) -> None:
         super().invalidate()
+        self._dirty_ranges = [[0, self.size]]
         self._dirty = True
 
     def invalidate_region(self, start: int, count: int) -> None:
         byte_start = self.stride * start
         byte_end = byte_start + self.stride * count
-        # As of Python 3.11, this is faster than min/max:
-        if byte_start < self._dirty_min:
-            self._dirty_min = byte_start
-        if byte_end > self._dirty_max:
-            self._dirty_max = byte_end
+        ranges = self._dirty_ranges
+        if ranges:
+            # Sequential and repeated changes extend the previous range in place:
+            last = ranges[-1]
+            if byte_start <= last[1] and byte_end >= last[0]:
+                # As of Python 3.11, this is faster than min/max:
+                if byte_start < last[0]:
+                    last[0] = byte_start
+                if byte_end > last[1]:
+                    last[1] = byte_end
+            else:
+                ranges.append([byte_start, byte_end])
+                if len(ranges) > self.max_dirty_ranges * 4:
+                    self._merge_dirty_ranges()
+        else:
+            ranges.append([byte_start, byte_end])
         self._dirty = True
 
 
+def _coalesce_ranges(ranges: list[list[int]], gap: int) -> list[tuple[int, int]]:
+    """Sort byte ranges, and merge those that are closer than ``gap`` bytes."""
+    merged = []
+    for start, end in sorted(ranges):
+        if end <= start:
+            continue
+        if merged and start - merged[-1][1] < gap:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
 class AttributeBufferObject(BackedBufferObject):
     """A backed buffer used for Shader Program attributes."""
 
-    def __init__(self, size: int, attribute: Attribute) -> None:  # noqa: D107
+    def __init__(self, size: int, attribute: Attribute, usage: int = GL_DYNAMIC_DRAW) -> None:  # noqa: D107
         # size is the allocator size * attribute.stride (buffer size)
-        super().__init__(size, attribute.c_type, attribute.stride, attribute.count)
+        super().__init__(size, attribute.c_type, attribute.stride, attribute.count, usage)
 
 
 class IndexedBufferObject(BackedBufferObject):
@@ -339,6 +509,207 @@ class IndexedBufferObject(BackedBufferObject):
         super().__init__(size, c_type, stride, count, usage)
 
 
+class IndirectBufferObject(BackedBufferObject):
+    """A backed buffer of indexed draw commands, for ``glMultiDrawElementsIndirect``.
+
+    Each command is five unsigned integers: the index count, the instance
+    count, the first index, the base vertex and the base instance. Only
+    commands that differ from the previous ones are uploaded on commit.
+    """
+    command_count: int
+
+    _command_size = 5
+
+    def __init__(self, capacity: int = 16, usage: int = GL_DYNAMIC_DRAW) -> None:  # noqa: D107
+        stride = self._command_size * ctypes.sizeof(GLuint)
+        super().__init__(capacity * stride, GLuint, stride, self._command_size, usage)
+        self.command_count = 0
+
+    @property
+    def capacity(self) -> int:
+        """The number of commands that fit in the buffer."""
+        return self.size // self.stride
+
+    def set_commands(self, firsts: Sequence[int], counts: Sequence[int]) -> None:
+        """Replace the commands with one non-instanced draw per index region.
+
+        The buffer grows as needed. Call ``commit`` before drawing.
+
+        Args:
+            firsts:
+                The first index of each region.
+            counts:
+                The number of indices in each region.
+        """
+        command_count = len(firsts)
+        if command_count > self.capacity:
+            capacity = self.capacity
+            while capacity < command_count:
+                capacity *= 2
+            self.resize(capacity * self.stride)
+
+        data = self.data
+        size = self._command_size
+        for i, (first, count) in enumerate(zip(firsts, counts)):
+            offset = i * size
+            if i >= self.command_count or data[offset] != count or data[offset + 2] != first:
+                data[offset:offset + size] = (count, 1, first, 0, 0)
+                self.invalidate_region(i, 1)
+        self.command_count = command_count
+
+
+def have_buffer_storage() -> bool:
+    """Whether the current context supports persistently mapped buffers."""
+    return gl_info.have_version(4, 4) or gl_info.have_extension('GL_ARB_buffer_storage')
+
+
+def have_multi_draw_indirect() -> bool:
+    """Whether the current context supports ``glMultiDrawElementsIndirect``."""
+    return gl_info.have_version(4, 3) or gl_info.have_extension('GL_ARB_multi_draw_indirect')
+
+
+class StreamingBufferObject(BackedBufferObject):
+    """A backed buffer that streams changes through a persistently mapped ring.
+
+    The GPU buffer holds ``sections`` copies of the data, and is mapped once
+    for its lifetime. Changes are made to the CPU mirror as usual. On commit,
+    the next section is selected, and the changes it has missed since it was
+    last used are copied straight into mapped memory. Each section is fenced
+    when it is retired, and only waited on when it comes around again, so
+    the CPU does not stall on draws still in flight.
+
+    Because the active section moves, ``ptr`` changes on commit. The owner
+    must re-point its vertex attributes whenever ``rebind`` is set, and then
+    clear it.
+
+    Requires OpenGL 4.4, or the ``GL_ARB_buffer_storage`` extension.
+    """
+    sections: int
+    rebind: bool
+
+    _flags: int = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT
+
+    def __init__(self, size: int, c_type: CTypesDataType, stride: int, count: int,  # noqa: D107
+                 sections: int = 3) -> None:
+        assert sections > 0, "At least one section is required."
+        self.sections = sections
+        self._fences = [None] * sections
+        self._section = 0
+        self._mapped_ptr = 0
+        super().__init__(size, c_type, stride, count, GL_STREAM_DRAW)
+        self._create_storage()
+
+    def _create_storage(self) -> None:
+        # Storage is immutable, so a new buffer object is required each time.
+        if self.id is not None:
+            glDeleteBuffers(1, GLuint(self.id))
+        buffer_id = GLuint()
+        glGenBuffers(1, buffer_id)
+        self.id = buffer_id.value
+
+        total_size = self.size * self.sections
+        glBindBuffer(GL_ARRAY_BUFFER, self.id)
+        glBufferStorage(GL_ARRAY_BUFFER, total_size, None, self._flags)
+        self._mapped_ptr = ctypes.cast(glMapBufferRange(GL_ARRAY_BUFFER, 0, total_size, self._flags),
+                                       ctypes.c_void_p).value
+
+        # The current section is filled immediately, the others as they are used.
+        ctypes.memmove(self._mapped_ptr, self.data_ptr, self.size)
+        self._pending = [(0, self.size)] * self.sections
+        self._pending[0] = (0, 0)
+        self._section = 0
+        self.ptr = 0
+        self.rebind = True
+
+        self._dirty_ranges = []
+        self._dirty = False
+
+    def _wait(self, section: int) -> None:
+        fence = self._fences[section]
+        if fence is None:
+            return
+        while glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1000000) == GL_TIMEOUT_EXPIRED:
+            pass
+        glDeleteSync(fence)
+        self._fences[section] = None
+
+    def _delete_fences(self) -> None:
+        for fence in self._fences:
+            if fence is not None:
+                glDeleteSync(fence)
+        self._fences = [None] * self.sections
+
+    def commit(self) -> None:
+        """Copy all saved changes into the next section of the ring.
+
+        The section that was in use is fenced, so it is not written to again
+        until the GPU has finished drawing from it.
+        """
+        if not self._dirty:
+            return
+
+        ranges = self._dirty_ranges
+        self._dirty_ranges = []
+        self._dirty = False
+
+        dirty_start = min(start for start, _ in ranges)
+        dirty_end = max(end for _, end in ranges)
+        if dirty_end <= dirty_start:
+            return
+
+        # Every section now lags behind the mirror by at least this span:
+        pending = self._pending
+        for i, (start, end) in enumerate(pending):
+            if end <= start:
+                pending[i] = (dirty_start, dirty_end)
+            else:
+                pending[i] = (min(start, dirty_start), max(end, dirty_end))
+
+        if self._fences[self._section] is not None:
+            glDeleteSync(self._fences[self._section])
+        self._fences[self._section] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+        section = self._section = (self._section + 1) % self.sections
+        self._wait(section)
+
+        start, end = pending[section]
+        pending[section] = (0, 0)
+        ctypes.memmove(self._mapped_ptr + section * self.size + start, self.data_ptr + start, end - start)
+
+        self.ptr = section * self.size
+        self.rebind = True
+        self.bytes_uploaded += end - start
+        self.upload_calls += 1
+
+    def resize(self, size: int) -> None:
+        number = size // ctypes.sizeof(self.c_type)
+        data = (self.c_type * number)()
+        ctypes.memmove(data, self.data, min(size, self.size))
+        self.data = data
+        self.data_ptr = ctypes.addressof(data)
+        self.size = size
+
+        # The old buffer is released once the GPU has finished with it.
+        self._delete_fences()
+        self._create_storage()
+        self.get_region.cache_clear()
+
+    def invalidate(self) -> None:
+        self._dirty_ranges = [[0, self.size]]
+        self._dirty = True
+
+    def delete(self) -> None:
+        self._delete_fences()
+        super().delete()
+
+
+class StreamingAttributeBufferObject(StreamingBufferObject):
+    """A streaming buffer used for Shader Program attributes."""
+
+    def __init__(self, size: int, attribute: Attribute, sections: int = 3) -> None:  # noqa: D107
+        super().__init__(size, attribute.c_type, attribute.stride, attribute.count, sections)
+
+
 class PersistentBufferObject(AbstractBuffer):
     """A persistently mapped buffer.
 
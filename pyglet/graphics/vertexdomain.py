@@ -23,16 +23,19 @@ primitives of the same OpenGL primitive mode.
 from __future__ import annotations
 
 import ctypes
-from typing import TYPE_CHECKING, Any, NoReturn, Sequence, Type
+from typing import TYPE_CHECKING, Any, Iterator, NoReturn, Sequence, Type
 
 from _ctypes import Array, _Pointer, _SimpleCData
 
 from pyglet.gl.gl import (
     GL_BYTE,
     GL_DOUBLE,
+    GL_DRAW_INDIRECT_BUFFER,
+    GL_DYNAMIC_DRAW,
     GL_FLOAT,
     GL_INT,
     GL_SHORT,
+    GL_STREAM_DRAW,
     GL_UNSIGNED_BYTE,
     GL_UNSIGNED_INT,
     GL_UNSIGNED_SHORT,
@@ -40,15 +43,24 @@ from pyglet.gl.gl import (
     GLintptr,
     GLsizei,
     GLvoid,
+    glBindBuffer,
     glDrawArrays,
     glDrawArraysInstanced,
     glDrawElements,
     glDrawElementsInstanced,
     glMultiDrawArrays,
     glMultiDrawElements,
+    glMultiDrawElementsIndirect,
 )
 from pyglet.graphics import allocation, shader, vertexarray
-from pyglet.graphics.vertexbuffer import AttributeBufferObject, IndexedBufferObject
+from pyglet.graphics.vertexbuffer import (
+    AttributeBufferObject,
+    IndexedBufferObject,
+    IndirectBufferObject,
+    StreamingAttributeBufferObject,
+    have_buffer_storage,
+    have_multi_draw_indirect,
+)
 
 CTypesDataType = Type[_SimpleCData]
 CTypesPointer = _Pointer
@@ -59,16 +71,7 @@ if TYPE_CHECKING:
     from pyglet.graphics.vertexarray import VertexArray
 
 
-def _nearest_pow2(v: int) -> int:
-    # From http://graphics.stanford.edu/~seander/bithacks.html#RoundUpPowerOf2
-    # Credit: Sean Anderson
-    v -= 1
-    v |= v >> 1
-    v |= v >> 2
-    v |= v >> 4
-    v |= v >> 8
-    v |= v >> 16
-    return v + 1
+_default_growth_policy = allocation.GrowthPolicy()
 
 
 _c_types = {
@@ -157,6 +160,10 @@ class VertexList:
     def delete(self) -> None:
         """Delete this group."""
         self.domain.allocator.dealloc(self.start, self.count)
+        if self.domain.compacting:
+            self.domain._vertex_lists.discard(self)  # noqa: SLF001
+        if self.domain.growth_policy.shrink_threshold:
+            self.domain.shrink()
 
     def set_instance_source(self, domain: InstancedVertexDomain, instance_attributes: Sequence[str]) -> None:
         assert self.instanced is False, "Vertex list is already an instance."
@@ -176,6 +183,8 @@ class VertexList:
             new_buffer.set_region(new_start, count, old_data)
 
         self.domain.allocator.dealloc(self.start, self.count)
+        if self.domain.compacting:
+            self.domain._vertex_lists.discard(self)  # noqa: SLF001
         self.domain = domain
         self.start = new_start
         self.instanced = True
@@ -201,6 +210,10 @@ class VertexList:
             new_buffer.set_region(new_start, self.count, old_data)
 
         self.domain.allocator.dealloc(self.start, self.count)
+        if self.domain.compacting:
+            self.domain._vertex_lists.discard(self)  # noqa: SLF001
+        if domain.compacting:
+            domain._vertex_lists.add(self)  # noqa: SLF001
         self.domain = domain
         self.start = new_start
 
@@ -263,8 +276,9 @@ class IndexedVertexList(VertexList):
 
     def delete(self) -> None:
         """Delete this group."""
-        super().delete()
+        # Indices are freed first, so both buffers can shrink together.
         self.domain.index_allocator.dealloc(self.index_start, self.index_count)
+        super().delete()
 
     def migrate(self, domain: IndexedVertexDomain | InstancedIndexedVertexDomain) -> None:
         """Move this group from its current indexed domain and add to the specified one.
@@ -359,6 +373,100 @@ class VertexInstance:
         self._vertex_list = None
 
 
+class SharedVertexList(VertexList):
+    """A vertex list drawn as one instance of geometry shared with identical vertex lists.
+
+    Vertex lists are converted to this class in place by
+    :py:meth:`~pyglet.graphics.Batch.instance_identical`, so existing
+    references to them remain valid.
+
+    Instance attributes are stored once per vertex list. They can be set with
+    either a single value, or with the same value repeated for each vertex.
+    When read, the value is repeated for each vertex, as before.
+    Writing different data to a shared attribute, or resizing the vertex
+    list, first detaches it back into a regular vertex domain.
+    """
+    domain: InstancedVertexDomain | InstancedIndexedVertexDomain
+    instance_index: int
+
+    def delete(self) -> None:
+        """Delete this group."""
+        self.domain.remove_shared(self)
+
+    def resize(self, count: int, index_count: int | None = None) -> None:
+        """Detach from the shared geometry, and resize this group.
+
+        Args:
+            count:
+                New number of vertices in the list.
+            index_count:
+                New number of indices in the list, if indexed.
+        """
+        self.detach()
+        self.resize(count, index_count)
+
+    def migrate(self, domain: VertexDomain | IndexedVertexDomain) -> None:
+        """Detach from the shared geometry, and move this group to the specified domain."""
+        self.detach()
+        self.migrate(domain)
+
+    def set_attribute_data(self, name: str, data: Any) -> None:
+        setattr(self, name, data)
+
+    def detach(self) -> None:
+        """Move this vertex list back into a regular vertex domain of its batch.
+
+        The vertex list is converted back to its original class in place.
+        """
+        domain = self.domain
+        batch, group, mode, attributes, usage = domain._shared_origin  # noqa: SLF001
+        target = batch.get_domain(self.indexed, False, mode, group, attributes, usage)
+
+        start = target.safe_alloc(self.count)
+        for name, buffer in target.attrib_name_buffers.items():
+            shared_buffer = domain.attrib_name_buffers[name]
+            if domain.attribute_names[name].instance:
+                data = shared_buffer.get_region(self.instance_index, 1)[:] * self.count
+            else:
+                data = shared_buffer.get_region(self.start, self.count)
+            buffer.set_region(start, self.count, data)
+
+        if self.indexed:
+            index_start = target.safe_index_alloc(self.index_count)
+            indices = domain.index_buffer.get_region(self.index_start, self.index_count)
+            diff = start - self.start
+            target.index_buffer.set_region(index_start, self.index_count, [i + diff for i in indices])
+            self.index_start = index_start
+
+        domain.remove_shared(self)
+        del self.instance_index
+        self.__class__ = target._vertexlist_class  # noqa: SLF001
+        self.domain = target
+        self.start = start
+        if target.compacting:
+            target._vertex_lists.add(self)  # noqa: SLF001
+
+
+class SharedIndexedVertexList(SharedVertexList, IndexedVertexList):
+    """An indexed vertex list drawn as an instance of shared geometry.
+
+    See :py:class:`SharedVertexList`.
+    """
+    domain: InstancedIndexedVertexDomain
+
+    @property
+    def indices(self) -> list[int]:
+        """Array of index data."""
+        start = self.start
+        return [i - start for i in self.domain.index_buffer.get_region(self.index_start, self.index_count)]
+
+    @indices.setter
+    def indices(self, data: Sequence[int]) -> None:
+        if list(data) != self.indices:
+            self.detach()
+            self.indices = data
+
+
 class VertexDomain:
     """Management of a set of vertex lists.
 
@@ -366,7 +474,7 @@ class VertexDomain:
     :py:func:`create_domain` function.
     """
 
-    attribute_meta: dict[str, dict[str, Any]]
+    attribute_meta: shader.VertexLayout
     allocator: Allocator
     buffer_attributes: list[tuple[AttributeBufferObject, Attribute]]
     vao: VertexArray
@@ -375,13 +483,52 @@ class VertexDomain:
 
     _property_dict: dict[str, property]
     _vertexlist_class: type
+    _vertex_lists: set[VertexList] | None
+
+    _draw_generation: int
+    _draw_primcount: int
+    _draw_starts: Array[GLint] | Array[CTypesPointer[GLvoid]]
+    _draw_sizes: Array[GLsizei]
+
+    growth_policy: allocation.GrowthPolicy
+    usage: int
 
     _initial_count: int = 16
     _vertex_class: type[VertexList] = VertexList
 
-    def __init__(self, attribute_meta: dict[str, dict[str, Any]]) -> None:  # noqa: D107
-        self.attribute_meta = attribute_meta
-        self.allocator = allocation.Allocator(self._initial_count)
+    def __init__(self, attribute_meta: shader.VertexLayout | dict[str, dict[str, Any]], compacting: bool = False,
+                 growth_policy: allocation.GrowthPolicy | None = None, usage: int = GL_DYNAMIC_DRAW) -> None:
+        """Create a vertex domain.
+
+        Args:
+            attribute_meta:
+                The :py:class:`~pyglet.graphics.shader.VertexLayout` of the domain,
+                or attribute metadata as introspected from a ShaderProgram.
+            compacting:
+                Track every vertex list in the domain, so that :py:meth:`compact`
+                can be used to defragment the buffers.
+            growth_policy:
+                Policy used to grow (and optionally shrink) the buffers.
+                By default, buffers double in size when full and never shrink.
+            usage:
+                A hint of how often the vertex data changes. ``GL_STREAM_DRAW``
+                stores attributes in persistently mapped, triple-buffered
+                streaming buffers where supported. This suits data that
+                changes every frame.
+        """
+        self.attribute_meta = attribute_meta = shader.VertexLayout(attribute_meta)
+        self.compacting = compacting
+        self.growth_policy = growth_policy or _default_growth_policy
+        self.usage = usage
+        streaming = usage == GL_STREAM_DRAW and have_buffer_storage()
+
+        capacity = max(self._initial_count, self.growth_policy.min_capacity)
+        if compacting:
+            self.allocator = allocation.TrackingAllocator(capacity)
+            self._vertex_lists = set()
+        else:
+            self.allocator = allocation.Allocator(capacity)
+            self._vertex_lists = None
         self.vao = vertexarray.VertexArray()
 
         self.attribute_names = {}  # name: attribute
@@ -390,6 +537,12 @@ class VertexDomain:
 
         self._property_dict = {}  # name: property(_getter, _setter)
 
+        # Cached multi-draw arguments, rebuilt when the allocator generation changes.
+        self._draw_generation = -1
+        self._draw_primcount = 0
+        self._draw_starts = (GLint * 0)()
+        self._draw_sizes = (GLsizei * 0)()
+
         for name, meta in attribute_meta.items():
             assert meta['format'][0] in _gl_types, f"'{meta['format']}' is not a valid attribute format for '{name}'."
             location = meta['location']
@@ -402,10 +555,12 @@ class VertexDomain:
                                                                       instanced)
 
             # Create buffer:
-            self.attrib_name_buffers[name] = buffer = AttributeBufferObject(attribute.stride * self.allocator.capacity,
-                                                                            attribute)
-            # TODO: use persistent buffer if we have GL support for it:
-            # attribute.buffer = PersistentBufferObject(attribute.stride * self.allocator.capacity, attribute, self.vao)
+            size = attribute.stride * self.allocator.capacity
+            if streaming:
+                buffer = StreamingAttributeBufferObject(size, attribute)
+            else:
+                buffer = AttributeBufferObject(size, attribute, usage)
+            self.attrib_name_buffers[name] = buffer
 
             self.buffer_attributes.append((buffer, attribute))
 
@@ -424,15 +579,17 @@ class VertexDomain:
                 attribute.set_divisor()
         self.vao.unbind()
 
+        self._streaming_attributes = [(buffer, attribute) for buffer, attribute in self.buffer_attributes
+                                      if isinstance(buffer, StreamingAttributeBufferObject)]
+        for buffer, _ in self._streaming_attributes:
+            buffer.rebind = False
+
     def safe_alloc(self, count: int) -> int:
         """Allocate vertices, resizing the buffers if necessary."""
         try:
             return self.allocator.alloc(count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            for buffer, _ in self.buffer_attributes:
-                buffer.resize(capacity * buffer.stride)
-            self.allocator.set_capacity(capacity)
+            self.resize(self.growth_policy.grow(self.allocator.capacity, e.requested_capacity))
             return self.allocator.alloc(count)
 
     def safe_realloc(self, start: int, count: int, new_count: int) -> int:
@@ -440,12 +597,29 @@ class VertexDomain:
         try:
             return self.allocator.realloc(start, count, new_count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            for buffer, _ in self.buffer_attributes:
-                buffer.resize(capacity * buffer.stride)
-            self.allocator.set_capacity(capacity)
+            self.resize(self.growth_policy.grow(self.allocator.capacity, e.requested_capacity))
             return self.allocator.realloc(start, count, new_count)
 
+    def resize(self, capacity: int) -> None:
+        """Resize the vertex buffers to hold the given number of vertices.
+
+        The capacity cannot be reduced below the end of the last allocated region.
+        """
+        for buffer, _ in self.buffer_attributes:
+            buffer.resize(capacity * buffer.stride)
+        self.allocator.set_capacity(capacity)
+
+    def shrink(self) -> None:
+        """Shrink the buffers, if allowed by the growth policy.
+
+        This is called automatically when vertex lists are deleted, if the
+        growth policy has a ``shrink_threshold``. Only free space after the
+        last allocated region can be released; see :py:meth:`compact`.
+        """
+        capacity = self.growth_policy.shrink(self.allocator.capacity, self.allocator.get_used_size())
+        if capacity < self.allocator.capacity:
+            self.resize(capacity)
+
     def create(self, count: int, index_count: int | None = None) -> VertexList:  # noqa: ARG002
         """Create a :py:class:`VertexList` in this domain.
 
@@ -456,7 +630,139 @@ class VertexDomain:
                 Ignored for non indexed VertexDomains
         """
         start = self.safe_alloc(count)
-        return self._vertexlist_class(self, start, count)
+        vertex_list = self._vertexlist_class(self, start, count)
+        if self.compacting:
+            self._vertex_lists.add(vertex_list)
+        return vertex_list
+
+    def create_many(self, n: int, count: int, index_count: int | None = None) -> list[VertexList]:  # noqa: ARG002
+        """Create many equally sized :py:class:`VertexList` in this domain.
+
+        The vertex lists are allocated as one contiguous region, in order,
+        so the buffers are resized at most once. Each vertex list can still
+        be resized or deleted individually.
+
+        Args:
+            n:
+                Number of vertex lists to create.
+            count:
+                Number of vertices in each vertex list.
+            index_count:
+                Ignored for non indexed VertexDomains
+        """
+        start = self.safe_alloc(n * count)
+        self.allocator.split(start, count, n)
+        cls = self._vertexlist_class
+        vertex_lists = [cls(self, start + i * count, count) for i in range(n)]
+        if self.compacting:
+            self._vertex_lists.update(vertex_lists)
+        return vertex_lists
+
+    def get_attribute_view(self, name: str, start: int = 0, count: int | None = None) -> memoryview:
+        """Get a writable view of an attribute's data, without copying.
+
+        The view is flat, with one element per attribute component, and
+        supports the buffer protocol. For example, ``numpy.asarray(view)``
+        allows updating every vertex in the domain with one vectorized
+        operation. As with vertex list attributes, the region is marked as
+        changed whenever it is fetched.
+
+        The view is invalidated when the domain is resized, so it should be
+        fetched again each frame rather than stored.
+
+        Args:
+            name:
+                The name of the attribute.
+            start:
+                The first vertex of the region.
+            count:
+                The number of vertices in the region. Defaults to all
+                vertices up to the end of the last allocated region.
+        """
+        if count is None:
+            count = max(0, self.allocator.get_used_size() - start)
+        return self.attrib_name_buffers[name].get_region_view(start, count)
+
+    def set_attribute_region(self, name: str, start: int, count: int, data: Any) -> None:
+        """Set an attribute for a contiguous range of vertices in one call.
+
+        Args:
+            name:
+                The name of the attribute.
+            start:
+                The first vertex of the region.
+            count:
+                The number of vertices in the region.
+            data:
+                A C-contiguous object supporting the buffer protocol, such as
+                a NumPy array or ``array.array``, of the attribute's type.
+        """
+        self.attrib_name_buffers[name].set_region_buffer(start, count, data)
+
+    def set_attribute_bulk(self, name: str, starts: Sequence[int], data: Any) -> None:
+        """Set an attribute for many equally sized vertex lists in one call.
+
+        A single range covering all the vertex lists is marked as changed.
+
+        Args:
+            name:
+                The name of the attribute.
+            starts:
+                The ``start`` of each vertex list to update.
+            data:
+                A C-contiguous object supporting the buffer protocol, of the
+                attribute's type, holding the data for each vertex list in
+                the same order as ``starts``.
+        """
+        if not starts:
+            return
+
+        buffer = self.attrib_name_buffers[name]
+        source = memoryview(data)
+        if source.itemsize != ctypes.sizeof(buffer.c_type):
+            msg = f"Expected elements of {ctypes.sizeof(buffer.c_type)} bytes, got {source.itemsize}."
+            raise ValueError(msg)
+
+        source = source.cast('B')
+        size, remainder = divmod(source.nbytes, len(starts))
+        if remainder or size % buffer.stride:
+            msg = f"Invalid data size for '{name}'. Cannot split {source.nbytes} bytes between {len(starts)} lists."
+            raise ValueError(msg)
+
+        stride = buffer.stride
+        target = memoryview(buffer.data).cast('B')
+        offset = 0
+        for start in starts:
+            byte_start = start * stride
+            target[byte_start:byte_start + size] = source[offset:offset + size]
+            offset += size
+
+        first = min(starts)
+        buffer.invalidate_region(first, max(starts) - first + size // stride)
+
+    def compact(self) -> None:
+        """Move all vertex lists together, and shrink the buffers to fit.
+
+        This removes the gaps left behind by deleted vertex lists, so that
+        the domain can be drawn with as few draw arguments as possible.
+        The ``start`` of each vertex list is updated to its new position.
+
+        Only available if the domain was created with ``compacting`` enabled.
+        """
+        assert self.compacting, "Domain was not created with compacting enabled."
+        moves = self.allocator.compact()
+        if moves:
+            for buffer, _ in self.buffer_attributes:
+                for start, new_start, count in moves:
+                    buffer.move_region(start, new_start, count)
+
+            new_starts = {start: new_start for start, new_start, _ in moves}
+            for vertex_list in self._vertex_lists:
+                vertex_list.start = new_starts.get(vertex_list.start, vertex_list.start)
+
+        capacity = self.growth_policy.grow(self._initial_count, self.allocator.get_used_size())
+        if capacity < self.allocator.capacity:
+            self.resize(capacity)
 
     def draw(self, mode: int) -> None:
         """Draw all vertices in the domain.
@@ -469,21 +775,100 @@ class VertexDomain:
                 OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
 
         """
-        self.vao.bind()
+        self.commit()
+        self.draw_committed(mode)
+
+    def commit(self) -> None:
+        """Upload any pending changes in the domain's buffers to the GPU."""
         for buffer, _ in self.buffer_attributes:
             buffer.commit()
 
-        starts, sizes = self.allocator.get_allocated_regions()
-        primcount = len(starts)
+        if self._streaming_attributes:
+            self._rebind_streaming_attributes()
+
+    def _rebind_streaming_attributes(self) -> None:
+        # Streaming buffers move to a new section (or buffer object) as they are committed.
+        bound = False
+        for buffer, attribute in self._streaming_attributes:
+            if buffer.rebind:
+                if not bound:
+                    self.vao.bind()
+                    bound = True
+                buffer.bind()
+                attribute.set_pointer(buffer.ptr)
+                buffer.rebind = False
+        if bound:
+            self.vao.unbind()
+
+    def draw_committed(self, mode: int) -> None:
+        """Draw all vertices in the domain, without committing pending changes.
+
+        This is used by :py:class:`~pyglet.graphics.Batch`, which commits the
+        buffers of all of its domains separately before drawing them.
+
+        Args:
+            mode:
+                OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
+
+        """
+        self.vao.bind()
+        if self._draw_generation != self.allocator.generation:
+            self._update_draw_arguments()
+
+        primcount = self._draw_primcount
         if primcount == 0:
             pass
         elif primcount == 1:
             # Common case
+            glDrawArrays(mode, self._draw_starts[0], self._draw_sizes[0])
+        else:
+            glMultiDrawArrays(mode, self._draw_starts, self._draw_sizes, primcount)
+
+    def _update_draw_arguments(self) -> None:
+        """Rebuild the cached draw arguments from the allocated regions."""
+        starts, sizes = self.allocator.get_allocated_regions()
+        primcount = len(starts)
+        self._draw_starts = (GLint * primcount)(*starts)
+        self._draw_sizes = (GLsizei * primcount)(*sizes)
+        self._draw_primcount = primcount
+        self._draw_generation = self.allocator.generation
+
+    def get_draw_allocator(self) -> Allocator:
+        """Get the allocator whose regions are drawn: the vertex allocator."""
+        return self.allocator
+
+    def get_draw_primcount(self) -> int:
+        """Get the number of separate regions drawn by :py:meth:`draw_committed`."""
+        return len(self.get_draw_allocator().starts)
+
+    def get_draw_region(self, vertex_list: VertexList) -> tuple[int, int]:
+        """Get the ``(start, size)`` of a vertex list, in the units drawn by this domain."""
+        return vertex_list.start, vertex_list.count
+
+    def draw_regions(self, mode: int, starts: Sequence[int], sizes: Sequence[int]) -> None:
+        """Draw only the given regions of the domain, without committing pending changes.
+
+        This is used by :py:class:`~pyglet.graphics.Batch` to skip vertex
+        lists that are outside its viewport.
+
+        Args:
+            mode:
+                OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
+            starts:
+                The first vertex of each region.
+            sizes:
+                The number of vertices in each region.
+
+        """
+        primcount = len(starts)
+        if primcount == 0:
+            return
+
+        self.vao.bind()
+        if primcount == 1:
             glDrawArrays(mode, starts[0], sizes[0])
         else:
-            starts = (GLint * primcount)(*starts)
-            sizes = (GLsizei * primcount)(*sizes)
-            glMultiDrawArrays(mode, starts, sizes, primcount)
+            glMultiDrawArrays(mode, (GLint * primcount)(*starts), (GLsizei * primcount)(*sizes), primcount)
 
     def draw_subset(self, mode: int, vertex_list: VertexList) -> None:
         """Draw a specific VertexList in the domain.
@@ -498,9 +883,8 @@ class VertexDomain:
                 Vertex list to draw.
 
         """
+        self.commit()
         self.vao.bind()
-        for buffer, _ in self.buffer_attributes:
-            buffer.commit()
 
         glDrawArrays(mode, vertex_list.start, vertex_list.count)
 
@@ -538,16 +922,106 @@ def _make_restricted_instance_attribute_property(name: str) -> property:
     return property(_attribute_getter, _attribute_setter)
 
 
+class _SharedAttributeRegion:
+    """View of attribute data shared between instances.
+
+    Writing different data detaches the vertex list from the shared geometry
+    first, so that other instances are not affected.
+    """
+    __slots__ = 'name', 'region', 'vertex_list'
+
+    def __init__(self, vertex_list: SharedVertexList, name: str, region: Array[CTypesDataType]) -> None:
+        self.vertex_list = vertex_list
+        self.name = name
+        self.region = region
+
+    def __len__(self) -> int:
+        return len(self.region)
+
+    def __getitem__(self, item: int | slice) -> Any:
+        return self.region[item]
+
+    def __setitem__(self, item: int | slice, data: Any) -> None:
+        values = self.region[:]
+        values[item] = data
+        setattr(self.vertex_list, self.name, values)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.region)
+
+
+def _make_shared_attribute_property(name: str) -> property:
+    def _attribute_getter(self: SharedVertexList) -> _SharedAttributeRegion:
+        buffer = self.domain.attrib_name_buffers[name]
+        return _SharedAttributeRegion(self, name, buffer.get_region(self.start, self.count))
+
+    def _attribute_setter(self: SharedVertexList, data: Any) -> None:
+        buffer = self.domain.attrib_name_buffers[name]
+        region = buffer.get_region(self.start, self.count)
+        if len(data) != len(region) or bytes(region) != bytes((buffer.c_type * len(data))(*data)):
+            self.detach()
+            setattr(self, name, data)
+
+    return property(_attribute_getter, _attribute_setter)
+
+
+class _InstanceAttributeRegion:
+    """Per-vertex view of the single value an instance stores for an attribute.
+
+    Reading repeats the value for every vertex. When written, the value of
+    the first vertex is stored, as it must be the same for every vertex.
+    """
+    __slots__ = 'buffer', 'index', 'vertex_count'
+
+    def __init__(self, buffer: AttributeBufferObject, index: int, vertex_count: int) -> None:
+        self.buffer = buffer
+        self.index = index
+        self.vertex_count = vertex_count
+
+    def __len__(self) -> int:
+        return self.buffer.count * self.vertex_count
+
+    def __getitem__(self, item: int | slice) -> Any:
+        return (self.buffer.get_region(self.index, 1)[:] * self.vertex_count)[item]
+
+    def __setitem__(self, item: int | slice, data: Any) -> None:
+        values = self.buffer.get_region(self.index, 1)[:] * self.vertex_count
+        values[item] = data
+        self.buffer.set_region(self.index, 1, values[:self.buffer.count])
+
+    def __iter__(self) -> Iterator:
+        return iter(self[:])
+
+
+def _make_shared_instance_attribute_property(name: str) -> property:
+    def _attribute_getter(self: SharedVertexList) -> _InstanceAttributeRegion:
+        return _InstanceAttributeRegion(self.domain.attrib_name_buffers[name], self.instance_index, self.count)
+
+    def _attribute_setter(self: SharedVertexList, data: Any) -> None:
+        buffer = self.domain.attrib_name_buffers[name]
+        # Per-vertex data is accepted, as long as the value is the same for every vertex.
+        buffer.set_region(self.instance_index, 1, data[:buffer.count])
+
+    return property(_attribute_getter, _attribute_setter)
+
+
 class InstancedVertexDomain(VertexDomain):  # noqa: D101
     instance_allocator: Allocator
     _instances: int
     _instance_properties: dict[str, property]
     _vertexinstance_class: type
 
-    def __init__(self, attribute_meta: dict[str, dict[str, Any]]) -> None:
-        super().__init__(attribute_meta)
+    _shared_source: VertexList | IndexedVertexList | None = None
+    _shared_lists: list[SharedVertexList]
+    _shared_list_class: type
+    _shared_origin: tuple
+
+    def __init__(self, attribute_meta: shader.VertexLayout | dict[str, dict[str, Any]], compacting: bool = False,
+                 growth_policy: allocation.GrowthPolicy | None = None, usage: int = GL_DYNAMIC_DRAW) -> None:
+        assert not compacting, "Instanced domains cannot be compacted."
+        super().__init__(attribute_meta, growth_policy=growth_policy, usage=usage)
         self._instances = 1
-        self.instance_allocator = allocation.Allocator(self._initial_count)
+        self.instance_allocator = allocation.Allocator(self.allocator.capacity)
 
         self._instance_properties = {}
         for name, attribute in self.attribute_names.items():
@@ -562,7 +1036,7 @@ class InstancedVertexDomain(VertexDomain):  # noqa: D101
         try:
             return self.instance_allocator.alloc(count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
+            capacity = self.growth_policy.grow(self.instance_allocator.capacity, e.requested_capacity)
             for buffer, attribute in self.buffer_attributes:
                 if attribute.instance:
                     buffer.resize(capacity * buffer.stride)
@@ -574,9 +1048,11 @@ class InstancedVertexDomain(VertexDomain):  # noqa: D101
         try:
             return self.allocator.alloc(count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            for buffer, _ in self.buffer_attributes:
-                buffer.resize(capacity * buffer.stride)
+            capacity = self.growth_policy.grow(self.allocator.capacity, e.requested_capacity)
+            # Instance attributes are sized by the instance allocator.
+            for buffer, attribute in self.buffer_attributes:
+                if not attribute.instance:
+                    buffer.resize(capacity * buffer.stride)
             self.allocator.set_capacity(capacity)
             return self.allocator.alloc(count)
 
@@ -585,12 +1061,135 @@ class InstancedVertexDomain(VertexDomain):  # noqa: D101
         try:
             return self.allocator.realloc(start, count, new_count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            for buffer, _ in self.buffer_attributes:
-                buffer.resize(capacity * buffer.stride)
+            capacity = self.growth_policy.grow(self.allocator.capacity, e.requested_capacity)
+            for buffer, attribute in self.buffer_attributes:
+                if not attribute.instance:
+                    buffer.resize(capacity * buffer.stride)
             self.allocator.set_capacity(capacity)
             return self.allocator.realloc(start, count, new_count)
 
+    def shrink(self) -> None:
+        """Instanced domains are not shrunk, as instance data shares the vertex buffers."""
+
+    def set_shared_source(self, vertex_list: VertexList | IndexedVertexList, origin: tuple) -> None:
+        """Copy the geometry of a vertex list, to be shared by identical vertex lists.
+
+        The domain initially has no instances. Vertex lists with the same
+        shared data are added with :py:meth:`share`.
+
+        Args:
+            vertex_list:
+                The vertex list to copy the shared attributes (and indices) from.
+            origin:
+                The ``(batch, group, mode, attributes, usage)`` that vertex lists
+                are returned to when they are detached.
+        """
+        assert self._shared_source is None, "Domain already has a shared source."
+        source = self.create(vertex_list.count, vertex_list.index_count if vertex_list.indexed else None)
+        for name, buffer in self.attrib_name_buffers.items():
+            if not self.attribute_names[name].instance:
+                data = vertex_list.domain.attrib_name_buffers[name].get_region(vertex_list.start, vertex_list.count)
+                buffer.set_region(source.start, source.count, data)
+        if vertex_list.indexed:
+            source.indices = vertex_list.indices
+
+        self._instances = 0
+        self._shared_source = source
+        self._shared_lists = []
+        self._shared_origin = origin
+
+        properties = {}
+        for name, attribute in self.attribute_names.items():
+            if attribute.instance:
+                properties[name] = _make_shared_instance_attribute_property(name)
+            else:
+                properties[name] = _make_shared_attribute_property(name)
+        base = SharedIndexedVertexList if vertex_list.indexed else SharedVertexList
+        self._shared_list_class = type(base.__name__, (base,), properties)
+
+    def share(self, vertex_list: VertexList | IndexedVertexList) -> None:
+        """Convert a vertex list into an instance of the shared geometry, in place.
+
+        The vertex list must have the same shared data as the source, and a
+        constant value for each instance attribute. It is removed from its
+        current domain.
+        """
+        slot = self.safe_alloc_instance(1)
+        old_domain = vertex_list.domain
+        for buffer, attribute in self.buffer_attributes:
+            if attribute.instance:
+                old_buffer = old_domain.attrib_name_buffers[attribute.name]
+                buffer.set_region(slot, 1, old_buffer.get_region(vertex_list.start, 1))
+
+        vertex_list.delete()
+
+        source = self._shared_source
+        vertex_list.__class__ = self._shared_list_class
+        vertex_list.domain = self
+        vertex_list.start = source.start
+        if vertex_list.indexed:
+            vertex_list.index_start = source.index_start
+        vertex_list.instance_index = slot
+
+        self._shared_lists.append(vertex_list)
+        self._instances = len(self._shared_lists)
+
+    def add_shared(self, **data: Sequence) -> SharedVertexList | SharedIndexedVertexList:
+        """Add a new instance of the shared geometry.
+
+        Unlike :py:meth:`share`, no vertex list has to exist first. Only the
+        instance attributes are written, so creating an instance costs one
+        value per attribute, however large the shared geometry is.
+
+        Args:
+            data:
+                The value of each instance attribute, for example
+                ``colors=(255, 0, 0, 255)``.
+        """
+        slot = self.safe_alloc_instance(1)
+        for buffer, attribute in self.buffer_attributes:
+            if attribute.instance:
+                buffer.set_region(slot, 1, data[attribute.name])
+
+        source = self._shared_source
+        if source.indexed:
+            vertex_list = self._shared_list_class(self, source.start, source.count,
+                                                  source.index_start, source.index_count)
+        else:
+            vertex_list = self._shared_list_class(self, source.start, source.count)
+        vertex_list.instance_index = slot
+
+        self._shared_lists.append(vertex_list)
+        self._instances = len(self._shared_lists)
+        return vertex_list
+
+    def remove_shared(self, vertex_list: SharedVertexList) -> None:
+        """Remove an instance of the shared geometry.
+
+        The last instance is moved into the freed slot, so the instances
+        stay contiguous. Once no instances remain, the shared source is
+        deleted, leaving the domain empty.
+        """
+        index = vertex_list.instance_index
+        last = len(self._shared_lists) - 1
+        if index != last:
+            moved = self._shared_lists[last]
+            for buffer, attribute in self.buffer_attributes:
+                if attribute.instance:
+                    buffer.move_region(last, index, 1)
+            moved.instance_index = index
+            self._shared_lists[index] = moved
+
+        self._shared_lists.pop()
+        self.instance_allocator.dealloc(last, 1)
+        self._instances = len(self._shared_lists)
+
+        if not self._shared_lists:
+            self._shared_source.delete()
+            self._shared_source = None
+            # Let the batch drop the now empty domain before it is drawn again.
+            self._shared_origin[0].invalidate()
+
     def draw(self, mode: int) -> None:
         """Draw all vertices in the domain.
 
@@ -602,10 +1201,18 @@ class InstancedVertexDomain(VertexDomain):  # noqa: D101
                 OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
 
         """
-        self.vao.bind()
-        for buffer, _ in self.buffer_attributes:
-            buffer.commit()
+        self.commit()
+        self.draw_committed(mode)
+
+    def draw_committed(self, mode: int) -> None:
+        """Draw all vertices in the domain, without committing pending changes.
+
+        Args:
+            mode:
+                OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
 
+        """
+        self.vao.bind()
         starts, sizes = self.allocator.get_allocated_regions()
         glDrawArraysInstanced(mode, starts[0], sizes[0], self._instances)
 
@@ -621,12 +1228,15 @@ class InstancedVertexDomain(VertexDomain):  # noqa: D101
             vertex_list:
                 Vertex list to draw.
         """
+        self.commit()
         self.vao.bind()
-        for buffer, _ in self.buffer_attributes:
-            buffer.commit()
 
         glDrawArraysInstanced(mode, vertex_list.start, vertex_list.count, self._instances)
 
+    def get_draw_primcount(self) -> int:
+        """Get the number of regions drawn by :py:meth:`draw_committed`: one, for all instances."""
+        return 0 if self.is_empty else 1
+
     @property
     def is_empty(self) -> bool:
         return not self.allocator.starts
@@ -643,14 +1253,22 @@ class IndexedVertexDomain(VertexDomain):
     index_c_type: CTypesDataType
     index_element_size: int
     index_buffer: IndexedBufferObject
+    _draw_offset: int
+    _use_indirect: bool
+    _indirect_buffer: IndirectBufferObject | None
     _initial_index_count = 16
     _vertex_class = IndexedVertexList
 
-    def __init__(self, attribute_meta: dict[str, dict[str, Any]],  # noqa: D107
-                 index_gl_type: int = GL_UNSIGNED_INT) -> None:
-        super().__init__(attribute_meta)
+    def __init__(self, attribute_meta: shader.VertexLayout | dict[str, dict[str, Any]],  # noqa: D107
+                 index_gl_type: int = GL_UNSIGNED_INT, compacting: bool = False,
+                 growth_policy: allocation.GrowthPolicy | None = None, usage: int = GL_DYNAMIC_DRAW) -> None:
+        super().__init__(attribute_meta, compacting, growth_policy, usage)
 
-        self.index_allocator = allocation.Allocator(self._initial_index_count)
+        capacity = max(self._initial_index_count, self.growth_policy.min_capacity)
+        if compacting:
+            self.index_allocator = allocation.TrackingAllocator(capacity)
+        else:
+            self.index_allocator = allocation.Allocator(capacity)
 
         self.index_gl_type = index_gl_type
         self.index_c_type = shader._c_types[index_gl_type]  # noqa: SLF001
@@ -664,6 +1282,10 @@ class IndexedVertexDomain(VertexDomain):
         self.index_buffer.bind_to_index_buffer()
         self.vao.unbind()
 
+        # Draw commands for more than one region are kept on the GPU, if possible:
+        self._use_indirect = have_multi_draw_indirect()
+        self._indirect_buffer = None
+
         # Make a custom VertexList class w/ properties for each attribute in the ShaderProgram:
         self._vertexlist_class = type(self._vertex_class.__name__, (self._vertex_class,),
                                       self._property_dict)
@@ -673,9 +1295,7 @@ class IndexedVertexDomain(VertexDomain):
         try:
             return self.index_allocator.alloc(count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            self.index_buffer.resize(capacity * self.index_element_size)
-            self.index_allocator.set_capacity(capacity)
+            self.resize_indices(self.growth_policy.grow(self.index_allocator.capacity, e.requested_capacity))
             return self.index_allocator.alloc(count)
 
     def safe_index_realloc(self, start: int, count: int, new_count: int) -> int:
@@ -683,11 +1303,29 @@ class IndexedVertexDomain(VertexDomain):
         try:
             return self.index_allocator.realloc(start, count, new_count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            self.index_buffer.resize(capacity * self.index_element_size)
-            self.index_allocator.set_capacity(capacity)
+            self.resize_indices(self.growth_policy.grow(self.index_allocator.capacity, e.requested_capacity))
             return self.index_allocator.realloc(start, count, new_count)
 
+    def resize_indices(self, capacity: int) -> None:
+        """Resize the index buffer to hold the given number of indices.
+
+        The capacity cannot be reduced below the end of the last allocated region.
+        """
+        self.index_buffer.resize(capacity * self.index_element_size)
+        self.index_allocator.set_capacity(capacity)
+
+    def shrink(self) -> None:
+        """Shrink the vertex and index buffers, if allowed by the growth policy.
+
+        This is called automatically when vertex lists are deleted, if the
+        growth policy has a ``shrink_threshold``. Only free space after the
+        last allocated region can be released; see :py:meth:`compact`.
+        """
+        super().shrink()
+        capacity = self.growth_policy.shrink(self.index_allocator.capacity, self.index_allocator.get_used_size())
+        if capacity < self.index_allocator.capacity:
+            self.resize_indices(capacity)
+
     def create(self, count: int, index_count: int) -> IndexedVertexList:
         """Create an :py:class:`IndexedVertexList` in this domain.
 
@@ -700,7 +1338,68 @@ class IndexedVertexDomain(VertexDomain):
         """
         start = self.safe_alloc(count)
         index_start = self.safe_index_alloc(index_count)
-        return self._vertexlist_class(self, start, count, index_start, index_count)
+        vertex_list = self._vertexlist_class(self, start, count, index_start, index_count)
+        if self.compacting:
+            self._vertex_lists.add(vertex_list)
+        return vertex_list
+
+    def create_many(self, n: int, count: int, index_count: int) -> list[IndexedVertexList]:
+        """Create many equally sized :py:class:`IndexedVertexList` in this domain.
+
+        The vertices, and the indices, of the vertex lists are each allocated
+        as one contiguous region, in order.
+
+        Args:
+            n:
+                Number of vertex lists to create.
+            count:
+                Number of vertices in each vertex list.
+            index_count:
+                Number of indices in each vertex list.
+        """
+        start = self.safe_alloc(n * count)
+        index_start = self.safe_index_alloc(n * index_count)
+        self.allocator.split(start, count, n)
+        self.index_allocator.split(index_start, index_count, n)
+        cls = self._vertexlist_class
+        vertex_lists = [cls(self, start + i * count, count, index_start + i * index_count, index_count)
+                        for i in range(n)]
+        if self.compacting:
+            self._vertex_lists.update(vertex_lists)
+        return vertex_lists
+
+    def compact(self) -> None:
+        """Move all vertex lists and their indices together, and shrink the buffers to fit.
+
+        The ``start`` and ``index_start`` of each vertex list are updated to
+        their new positions, and the index values are renumbered to match.
+
+        Only available if the domain was created with ``compacting`` enabled.
+        """
+        assert self.compacting, "Domain was not created with compacting enabled."
+        old_starts = {vertex_list: vertex_list.start for vertex_list in self._vertex_lists}
+        super().compact()
+
+        moves = self.index_allocator.compact()
+        if moves:
+            for start, new_start, count in moves:
+                self.index_buffer.move_region(start, new_start, count)
+
+            new_starts = {start: new_start for start, new_start, _ in moves}
+            for vertex_list in self._vertex_lists:
+                vertex_list.index_start = new_starts.get(vertex_list.index_start, vertex_list.index_start)
+
+        # Indices refer to absolute vertex positions, so renumber them for the moved vertices.
+        for vertex_list, old_start in old_starts.items():
+            diff = vertex_list.start - old_start
+            if diff:
+                indices = self.index_buffer.get_region(vertex_list.index_start, vertex_list.index_count)
+                self.index_buffer.set_region(vertex_list.index_start, vertex_list.index_count,
+                                             [i + diff for i in indices])
+
+        capacity = self.growth_policy.grow(self._initial_index_count, self.index_allocator.get_used_size())
+        if capacity < self.index_allocator.capacity:
+            self.resize_indices(capacity)
 
     def draw(self, mode: int) -> None:
         """Draw all vertices in the domain.
@@ -713,25 +1412,102 @@ class IndexedVertexDomain(VertexDomain):
                 OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
 
         """
-        self.vao.bind()
+        self.commit()
+        self.draw_committed(mode)
+
+    def commit(self) -> None:
+        """Upload any pending changes in the domain's buffers to the GPU."""
         for buffer, _ in self.buffer_attributes:
             buffer.commit()
 
+        if self._streaming_attributes:
+            self._rebind_streaming_attributes()
+
         self.index_buffer.commit()
 
-        starts, sizes = self.index_allocator.get_allocated_regions()
-        primcount = len(starts)
+    def draw_committed(self, mode: int) -> None:
+        """Draw all vertices in the domain, without committing pending changes.
+
+        Args:
+            mode:
+                OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
+
+        """
+        self.vao.bind()
+        if self._draw_generation != self.index_allocator.generation:
+            self._update_draw_arguments()
+
+        primcount = self._draw_primcount
         if primcount == 0:
             pass
         elif primcount == 1:
             # Common case
-            glDrawElements(mode, sizes[0], self.index_gl_type,
-                           self.index_buffer.ptr + starts[0] * self.index_element_size)
+            glDrawElements(mode, self._draw_sizes[0], self.index_gl_type, self._draw_offset)
+        elif self._use_indirect:
+            self._indirect_buffer.bind(GL_DRAW_INDIRECT_BUFFER)
+            glMultiDrawElementsIndirect(mode, self.index_gl_type, None, primcount, 0)
+            glBindBuffer(GL_DRAW_INDIRECT_BUFFER, 0)
+        else:
+            glMultiDrawElements(mode, self._draw_sizes, self.index_gl_type, self._draw_starts, primcount)
+
+    def _update_draw_arguments(self) -> None:
+        """Rebuild the cached draw arguments from the allocated index regions.
+
+        The index starts are stored as byte offsets into the index buffer. If
+        indirect drawing is supported, several regions are instead written to
+        the indirect buffer, where only the changed commands are uploaded.
+        """
+        starts, sizes = self.index_allocator.get_allocated_regions()
+        primcount = len(starts)
+        if primcount > 1 and self._use_indirect:
+            if self._indirect_buffer is None:
+                self._indirect_buffer = IndirectBufferObject()
+            self._indirect_buffer.set_commands(starts, sizes)
+            self._indirect_buffer.commit()
+            self._draw_primcount = primcount
+            self._draw_generation = self.index_allocator.generation
+            return
+
+        offsets = [s * self.index_element_size + self.index_buffer.ptr for s in starts]
+        self._draw_starts = (ctypes.POINTER(GLvoid) * primcount)(*(GLintptr * primcount)(*offsets))
+        self._draw_sizes = (GLsizei * primcount)(*sizes)
+        self._draw_offset = offsets[0] if offsets else 0
+        self._draw_primcount = primcount
+        self._draw_generation = self.index_allocator.generation
+
+    def get_draw_allocator(self) -> Allocator:
+        """Get the allocator whose regions are drawn: the index allocator."""
+        return self.index_allocator
+
+    def get_draw_region(self, vertex_list: IndexedVertexList) -> tuple[int, int]:
+        """Get the ``(start, size)`` of a vertex list's indices."""
+        return vertex_list.index_start, vertex_list.index_count
+
+    def draw_regions(self, mode: int, starts: Sequence[int], sizes: Sequence[int]) -> None:
+        """Draw only the given index regions of the domain, without committing pending changes.
+
+        Args:
+            mode:
+                OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
+            starts:
+                The first index of each region.
+            sizes:
+                The number of indices in each region.
+
+        """
+        primcount = len(starts)
+        if primcount == 0:
+            return
+
+        self.vao.bind()
+        element_size = self.index_element_size
+        ptr = self.index_buffer.ptr
+        if primcount == 1:
+            glDrawElements(mode, sizes[0], self.index_gl_type, ptr + starts[0] * element_size)
         else:
-            starts = [s * self.index_element_size + self.index_buffer.ptr for s in starts]
-            starts = (ctypes.POINTER(GLvoid) * primcount)(*(GLintptr * primcount)(*starts))
-            sizes = (GLsizei * primcount)(*sizes)
-            glMultiDrawElements(mode, sizes, self.index_gl_type, starts, primcount)
+            offsets = (GLintptr * primcount)(*[ptr + start * element_size for start in starts])
+            glMultiDrawElements(mode, (GLsizei * primcount)(*sizes), self.index_gl_type,
+                                (ctypes.POINTER(GLvoid) * primcount)(*offsets), primcount)
 
     def draw_subset(self, mode: int, vertex_list: IndexedVertexList) -> None:
         """Draw a specific IndexedVertexList in the domain.
@@ -745,11 +1521,8 @@ class IndexedVertexDomain(VertexDomain):
             vertex_list:
                 Vertex list to draw.
         """
+        self.commit()
         self.vao.bind()
-        for buffer, _ in self.buffer_attributes:
-            buffer.commit()
-
-        self.index_buffer.commit()
 
         glDrawElements(mode, vertex_list.index_count, self.index_gl_type,
                        self.index_buffer.ptr +
@@ -764,9 +1537,10 @@ class InstancedIndexedVertexDomain(IndexedVertexDomain, InstancedVertexDomain):
     """
     _initial_index_count: int = 16
 
-    def __init__(self, attribute_meta: dict[str, dict[str, Any]],  # noqa: D107
-                 index_gl_type: int = GL_UNSIGNED_INT) -> None:
-        super().__init__(attribute_meta, index_gl_type)
+    def __init__(self, attribute_meta: shader.VertexLayout | dict[str, dict[str, Any]],  # noqa: D107
+                 index_gl_type: int = GL_UNSIGNED_INT,
+                 growth_policy: allocation.GrowthPolicy | None = None, usage: int = GL_DYNAMIC_DRAW) -> None:
+        super().__init__(attribute_meta, index_gl_type, growth_policy=growth_policy, usage=usage)
 
     def safe_index_alloc(self, count: int) -> int:
         """Allocate indices, resizing the buffers if necessary.
@@ -777,9 +1551,7 @@ class InstancedIndexedVertexDomain(IndexedVertexDomain, InstancedVertexDomain):
         try:
             return self.index_allocator.alloc(count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            self.index_buffer.resize(capacity * self.index_element_size)
-            self.index_allocator.set_capacity(capacity)
+            self.resize_indices(self.growth_policy.grow(self.index_allocator.capacity, e.requested_capacity))
             return self.index_allocator.alloc(count)
 
     def safe_index_realloc(self, start: int, count: int, new_count: int) -> int:
@@ -787,9 +1559,7 @@ class InstancedIndexedVertexDomain(IndexedVertexDomain, InstancedVertexDomain):
         try:
             return self.index_allocator.realloc(start, count, new_count)
         except allocation.AllocatorMemoryException as e:
-            capacity = _nearest_pow2(e.requested_capacity)
-            self.index_buffer.resize(capacity * self.index_element_size)
-            self.index_allocator.set_capacity(capacity)
+            self.resize_indices(self.growth_policy.grow(self.index_allocator.capacity, e.requested_capacity))
             return self.index_allocator.realloc(start, count, new_count)
 
     def create(self, count: int, index_count: int) -> IndexedVertexList:
@@ -817,10 +1587,18 @@ class InstancedIndexedVertexDomain(IndexedVertexDomain, InstancedVertexDomain):
                 OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
 
         """
-        self.vao.bind()
-        for buffer, _ in self.buffer_attributes:
-            buffer.commit()
+        self.commit()
+        self.draw_committed(mode)
+
+    def draw_committed(self, mode: int) -> None:
+        """Draw all vertices in the domain, without committing pending changes.
 
+        Args:
+            mode:
+                OpenGL drawing mode, e.g. ``GL_POINTS``, ``GL_LINES``, etc.
+
+        """
+        self.vao.bind()
         starts, sizes = self.index_allocator.get_allocated_regions()
         glDrawElementsInstanced(mode, sizes[0], self.index_gl_type,
                                 self.index_buffer.ptr + starts[0] * self.index_element_size, self._instances)
@@ -838,9 +1616,8 @@ class InstancedIndexedVertexDomain(IndexedVertexDomain, InstancedVertexDomain):
                 Vertex list to draw.
 
         """
+        self.commit()
         self.vao.bind()
-        for buffer, _ in self.buffer_attributes:
-            buffer.commit()
 
         glDrawElementsInstanced(mode, vertex_list.index_count, self.index_gl_type,
                                 self.index_buffer.ptr +
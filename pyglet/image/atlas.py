@@ -6,6 +6,8 @@ This can have major performance benefits when dealiing with a large number of im
 :py:class:`~pyglet.image.atlas.TextureAtlas` maintains one texture; :py:class:`TextureBin`
 manages a collection of atlases of a given size. :py:class:`TextureArrayBin` works similarly
 except for :py:class:`~pyglet.image.TextureArray`s instead of altases.
+:py:class:`TextureArrayAtlas` packs images into every layer of a single texture array,
+so that images which would otherwise need several atlases share one texture.
 
 This module is used internally by the :py:mod:`pyglet.resource` module.
 
@@ -35,7 +37,7 @@ import pyglet
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from pyglet.image import AbstractImage, ImageData, TextureRegion, TextureArrayRegion
+    from pyglet.image import AbstractImage, ImageData, TextureArray, TextureRegion, TextureArrayRegion
 
 
 class AllocatorException(Exception):
@@ -214,6 +216,70 @@ class TextureBin:
         return atlas.add(img, border)
 
 
+class TextureArrayAtlas:
+    """A TextureArray made up of multiple smaller images, packed into each layer.
+
+    This works like a :py:class:`TextureAtlas`, except that when a layer is
+    full, the next layer of the same texture array is used rather than a new
+    texture. Images that would otherwise be spread across several atlases
+    can then be drawn with a single texture binding. Each region carries its
+    layer in the third texture coordinate.
+
+    Storage for every layer is allocated up front, so ``max_depth`` should
+    be kept modest for large layer sizes.
+    """
+    texture: TextureArray
+    allocators: list[Allocator]
+
+    def __init__(self, width: int = 2048, height: int = 2048, max_depth: int = 8) -> None:
+        """Create a Texture Array Atlas of the given layer size and depth."""
+        max_texture_size = pyglet.image.get_max_texture_size()
+        width = min(width, max_texture_size)
+        height = min(height, max_texture_size)
+        max_depth = min(max_depth, pyglet.image.get_max_array_texture_layers())
+
+        self.texture = pyglet.image.TextureArray.create(width, height, max_depth=max_depth)
+        self.allocators = []
+
+    def add(self, img: AbstractImage, border: int = 0) -> TextureArrayRegion:
+        """Add an image to the atlas.
+
+        Images that are already textures, such as regions of another atlas,
+        are read back and copied. The anchor of the image is kept. See
+        :py:meth:`TextureAtlas.add` for ``border``.
+
+        ``AllocatorException`` is raised if there is no room left in any layer.
+        """
+        if isinstance(img, pyglet.image.Texture):
+            image_data = img.get_image_data()
+        else:
+            image_data = img
+        width = img.width + border * 2
+        height = img.height + border * 2
+
+        for layer, allocator in enumerate(self.allocators):
+            try:
+                x, y = allocator.alloc(width, height)
+                break
+            except AllocatorException:
+                continue
+        else:
+            if len(self.allocators) >= self.texture.max_depth:
+                raise AllocatorException(f"No more layers in {self} for box {width}x{height}")
+            allocator = Allocator(self.texture.width, self.texture.height)
+            x, y = allocator.alloc(width, height)
+            layer = len(self.allocators)
+            self.allocators.append(allocator)
+
+        x += border
+        y += border
+        self.texture.blit_into(image_data, x + image_data.anchor_x, y + image_data.anchor_y, layer)
+        region = self.texture.region_class(x, y, layer, img.width, img.height, self.texture)
+        region.anchor_x = img.anchor_x
+        region.anchor_y = img.anchor_y
+        return region
+
+
 class TextureArrayBin:
     """Collection of texture arrays.
 
@@ -221,24 +287,50 @@ class TextureArrayBin:
     texture arrays, and creates new ones as necessary as the depth is exceeded.
     This works similarly to TextureBin, but it manages TextureArrays instead of
     TextureAtlases.
+
+    By default, each image is given its own layer. If ``packed`` is set, images
+    are packed together into the layers of a :py:class:`TextureArrayAtlas`
+    instead. Sprites of images from one array share a single group, so
+    this draws images from many atlases with one draw call.
     """
 
-    def __init__(self, texture_width: int = 2048, texture_height: int = 2048, max_depth: int | None = None) -> None:
+    def __init__(self, texture_width: int = 2048, texture_height: int = 2048, max_depth: int | None = None,
+                 packed: bool = False) -> None:
         max_texture_size = pyglet.image.get_max_texture_size()
-        self.max_depth = max_depth or pyglet.image.get_max_array_texture_layers()
+        if packed:
+            self.max_depth = max_depth or 8
+        else:
+            self.max_depth = max_depth or pyglet.image.get_max_array_texture_layers()
         self.texture_width = min(texture_width, max_texture_size)
         self.texture_height = min(texture_height, max_texture_size)
+        self.packed = packed
         self.arrays = []
+        self.atlases = []
 
-    def add(self, img: ImageData) -> TextureArrayRegion:
+    def add(self, img: ImageData | AbstractImage, border: int = 0) -> TextureArrayRegion:
         """Add an image into this texture array bin.
 
         This method calls :py:meth:`~pyglet.image.TextureArray.add` for the first
-        array that has room for the image.
+        array that has room for the image. If the bin is ``packed``,
+        :py:meth:`TextureArrayAtlas.add` is used instead, and ``border`` is
+        applied.
 
         ``TextureArraySizeExceeded`` is raised if the image exceeds the dimensions of
-        ``texture_width`` and ``texture_height``.
+        ``texture_width`` and ``texture_height``. For packed bins,
+        ``AllocatorException`` is raised instead.
         """
+        if self.packed:
+            for atlas in self.atlases:
+                try:
+                    return atlas.add(img, border)
+                except AllocatorException:
+                    continue
+
+            atlas = TextureArrayAtlas(self.texture_width, self.texture_height, self.max_depth)
+            self.atlases.append(atlas)
+            self.arrays.append(atlas.texture)
+            return atlas.add(img, border)
+
         try:
             array = self.arrays[-1]
             return array.add(img)
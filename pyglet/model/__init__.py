@@ -33,6 +33,7 @@ from typing import TYPE_CHECKING
 
 import pyglet
 from pyglet import gl, graphics
+from pyglet.graphics.state import get_state_cache, tracks_state
 from pyglet.math import Mat4
 
 from .codecs import add_default_codecs as _add_default_codecs
@@ -149,6 +150,7 @@ class BaseMaterialGroup(graphics.Group):
         self.program = program
 
 
+@tracks_state
 class TexturedMaterialGroup(BaseMaterialGroup):
     default_vert_src = """#version 330 core
     in vec3 POSITION;
@@ -165,6 +167,7 @@ class TexturedMaterialGroup(BaseMaterialGroup):
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     uniform mat4 model;
@@ -206,9 +209,9 @@ class TexturedMaterialGroup(BaseMaterialGroup):
         self.texture = texture
 
     def set_state(self) -> None:
-        gl.glActiveTexture(gl.GL_TEXTURE0)
-        gl.glBindTexture(self.texture.target, self.texture.id)
-        self.program.use()
+        state_cache = get_state_cache()
+        state_cache.bind_texture(self.texture.target, self.texture.id)
+        state_cache.use_program(self.program.id)
         self.program['model'] = self.matrix
 
     def __hash__(self) -> int:
@@ -224,6 +227,7 @@ class TexturedMaterialGroup(BaseMaterialGroup):
                 self.parent == other.parent)
 
 
+@tracks_state
 class MaterialGroup(BaseMaterialGroup):
     default_vert_src = """#version 330 core
     in vec3 POSITION;
@@ -238,6 +242,7 @@ class MaterialGroup(BaseMaterialGroup):
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     uniform mat4 model;
@@ -269,7 +274,7 @@ class MaterialGroup(BaseMaterialGroup):
     """
 
     def set_state(self) -> None:
-        self.program.use()
+        get_state_cache().use_program(self.program.id)
         self.program['model'] = self.matrix
 
     def __hash__(self):
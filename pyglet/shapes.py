@@ -68,16 +68,20 @@ from __future__ import annotations
 
 import math
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Sequence, Tuple, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, ClassVar, Hashable, Sequence, Tuple, Union
 
 import pyglet
 from pyglet.extlibs import earcut
-from pyglet.gl import GL_BLEND, GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA, GL_TRIANGLES, glBlendFunc, glDisable, glEnable
+from pyglet.gl import GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA, GL_TRIANGLES
 from pyglet.graphics import Batch, Group
+from pyglet.graphics.shader import VertexLayout
+from pyglet.graphics.state import get_state_cache, tracks_state
 from pyglet.math import Vec2
 
 if TYPE_CHECKING:
     from pyglet.graphics.shader import ShaderProgram
+    from pyglet.graphics.vertexdomain import InstancedVertexDomain
 
 vertex_source = """#version 150 core
     in vec2 position;
@@ -94,6 +98,7 @@ vertex_source = """#version 150 core
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     mat4 m_rotation = mat4(1.0);
@@ -128,11 +133,203 @@ fragment_source = """#version 150 core
 """
 
 
+instanced_vertex_source = """#version 150 core
+    in vec2 position;
+    in vec2 translation;
+    in vec4 colors;
+    in float zposition;
+    in float rotation;
+    in vec2 scale;
+    in vec2 anchor;
+
+    out vec4 vertex_colors;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+        float time;
+    } window;
+
+    mat4 m_rotation = mat4(1.0);
+    mat4 m_translate = mat4(1.0);
+
+    void main()
+    {
+        m_translate[3][0] = translation.x;
+        m_translate[3][1] = translation.y;
+        m_rotation[0][0] =  cos(-radians(rotation));
+        m_rotation[0][1] =  sin(-radians(rotation));
+        m_rotation[1][0] = -sin(-radians(rotation));
+        m_rotation[1][1] =  cos(-radians(rotation));
+
+        vec2 local_position = position * scale - anchor;
+        gl_Position = window.projection * window.view * m_translate * m_rotation * vec4(local_position, zposition, 1.0);
+        vertex_colors = colors;
+    }
+"""
+
+
+sdf_vertex_source = """#version 150 core
+    in vec2 position;
+    in vec2 translation;
+    in vec4 colors;
+    in vec4 border_colors;
+    in float zposition;
+    in float rotation;
+    in vec2 scale;
+    in vec2 anchor;
+    in vec4 sdf_params;
+    in float sdf_shape;
+    in float border;
+
+    out vec4 vertex_colors;
+    out vec2 sdf_point;
+    flat out vec4 vertex_border_colors;
+    flat out vec4 vertex_sdf_params;
+    flat out vec2 sdf_half_size;
+    flat out float vertex_sdf_shape;
+    flat out float vertex_border;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+        float time;
+    } window;
+
+    // The margin in pixels around each shape, left for its anti-aliased edge:
+    const float padding = 2.0;
+
+    mat4 m_rotation = mat4(1.0);
+    mat4 m_translate = mat4(1.0);
+
+    void main()
+    {
+        m_translate[3][0] = translation.x;
+        m_translate[3][1] = translation.y;
+        m_rotation[0][0] =  cos(-radians(rotation));
+        m_rotation[0][1] =  sin(-radians(rotation));
+        m_rotation[1][0] = -sin(-radians(rotation));
+        m_rotation[1][1] =  cos(-radians(rotation));
+
+        // The quad is grown outward by the margin. This is converted from pixels with the
+        // scale of the view, which assumes a projection mapping one unit to one pixel, as
+        // the default projection of a window does:
+        float view_scale = min(length(window.view[0].xy), length(window.view[1].xy));
+        vec2 margin = (position * 2.0 - 1.0) * padding / view_scale;
+        // Hidden shapes have no size, and are not grown:
+        if (scale == vec2(0.0)) {
+            margin = vec2(0.0);
+        }
+
+        vec2 local_position = position * scale - anchor + margin;
+        gl_Position = window.projection * window.view * m_translate * m_rotation * vec4(local_position, zposition, 1.0);
+
+        // The quad is centered on the shape, so distances are computed from its center:
+        sdf_point = (position - 0.5) * scale + margin;
+        sdf_half_size = scale * 0.5;
+        vertex_colors = colors;
+        vertex_border_colors = border_colors;
+        vertex_sdf_params = sdf_params;
+        vertex_sdf_shape = sdf_shape;
+        vertex_border = border;
+    }
+"""
+
+sdf_fragment_source = """#version 150 core
+    in vec4 vertex_colors;
+    in vec2 sdf_point;
+    flat in vec4 vertex_border_colors;
+    flat in vec4 vertex_sdf_params;
+    flat in vec2 sdf_half_size;
+    flat in float vertex_sdf_shape;
+    flat in float vertex_border;
+
+    out vec4 final_color;
+
+    // Approximate distance to an ellipse, which is exact for circles.
+    float sd_ellipse(vec2 p, vec2 radii)
+    {
+        float k1 = length(p / (radii * radii));
+        if (k1 < 1e-6) {
+            return -min(radii.x, radii.y);
+        }
+        float k0 = length(p / radii);
+        return k0 * (k0 - 1.0) / k1;
+    }
+
+    // Distance to a box, with corner radii ordered bottom-left, top-left, top-right, bottom-right.
+    float sd_rounded_box(vec2 p, vec2 half_size, vec4 radii)
+    {
+        float radius = p.x > 0.0 ? (p.y > 0.0 ? radii.z : radii.w) : (p.y > 0.0 ? radii.y : radii.x);
+        radius = min(radius, min(half_size.x, half_size.y));
+        vec2 q = abs(p) - half_size + radius;
+        return min(max(q.x, q.y), 0.0) + length(max(q, 0.0)) - radius;
+    }
+
+    // Distance to an arc with round caps. Angles are in degrees.
+    float sd_arc(vec2 p, float radius, float thickness, float start_angle, float angle)
+    {
+        float half_thickness = thickness * 0.5;
+        if (abs(angle) >= 360.0) {
+            return abs(length(p) - radius) - half_thickness;
+        }
+        // Turn the middle of the arc to face up, so it is symmetric around the y axis:
+        float turn = radians(90.0 - start_angle - angle * 0.5);
+        p = mat2(cos(turn), sin(turn), -sin(turn), cos(turn)) * p;
+        p.x = abs(p.x);
+        float aperture = radians(abs(angle)) * 0.5;
+        vec2 sc = vec2(sin(aperture), cos(aperture));
+        float d = (sc.y * p.x > sc.x * p.y) ? length(p - sc * radius) : abs(length(p) - radius);
+        return d - half_thickness;
+    }
+
+    void main()
+    {
+        float d;
+        if (vertex_sdf_shape < 0.5) {
+            d = sd_ellipse(sdf_point, sdf_half_size);
+        } else if (vertex_sdf_shape < 1.5) {
+            d = sd_rounded_box(sdf_point, sdf_half_size, vertex_sdf_params);
+        } else {
+            d = sd_arc(sdf_point, vertex_sdf_params.x, vertex_sdf_params.y, vertex_sdf_params.z,
+                       vertex_sdf_params.w);
+        }
+
+        // Coverage of the pixel, from the change in distance across it:
+        float aa = max(fwidth(d), 1e-4);
+        float coverage = clamp(0.5 - d / aa, 0.0, 1.0);
+        vec4 color = vertex_colors;
+        if (vertex_border > 0.0) {
+            color = mix(vertex_border_colors, vertex_colors, clamp(0.5 - (d + vertex_border) / aa, 0.0, 1.0));
+        }
+
+        final_color = vec4(color.rgb, color.a * coverage);
+        if(final_color.a < 0.01){
+            discard;
+        }
+    }
+"""
+
+
 def get_default_shader() -> ShaderProgram:
     return pyglet.gl.current_context.create_program((vertex_source, 'vertex'),
                                                     (fragment_source, 'fragment'))
 
 
+def get_default_instanced_shader() -> ShaderProgram:
+    """Create and return the default shader of the instanced shapes, such as :py:class:`InstancedCircle`."""
+    return pyglet.gl.current_context.create_program((instanced_vertex_source, 'vertex'),
+                                                    (fragment_source, 'fragment'))
+
+
+def get_default_sdf_shader() -> ShaderProgram:
+    """Create and return the default shader of the SDF shapes, such as :py:class:`SDFCircle`."""
+    return pyglet.gl.current_context.create_program((sdf_vertex_source, 'vertex'),
+                                                    (sdf_fragment_source, 'fragment'))
+
+
 def _rotate_point(center: tuple[float, float], point: tuple[float, float], angle: float) -> tuple[float, float]:
     prev_angle = math.atan2(point[1] - center[1], point[0] - center[0])
     now_angle = prev_angle + angle
@@ -251,6 +448,162 @@ def _get_segment(p0: tuple[float, float] | list[float], p1: tuple[float, float]
     return v_miter2, scale2, v1[0], v1[1], v2[0], v2[1], v3[0], v3[1], v4[0], v4[1], v5[0], v5[1], v6[0], v6[1]
 
 
+# Tessellations are cached by their geometry, so that identical shapes only compute them once.
+# Each cached function returns flat vertices around the origin, as an immutable tuple:
+_TESSELLATION_CACHE_SIZE = 256
+
+
+def _transform_vertices(vertices: Sequence[float], x: float, y: float,
+                        scale_x: float = 1.0, scale_y: float = 1.0) -> list[float]:
+    """Scale flat vertices around the origin, then translate them by ``(x, y)``."""
+    result = list(vertices)
+    result[0::2] = [x + scale_x * vx for vx in vertices[0::2]]
+    result[1::2] = [y + scale_y * vy for vy in vertices[1::2]]
+    return result
+
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _get_unit_circle(segments: int) -> tuple[float, ...]:
+    """Get the triangles of a circle with a radius of 1."""
+    tau_segs = math.pi * 2 / segments
+    points = [(math.cos(i * tau_segs), math.sin(i * tau_segs)) for i in range(segments)]
+
+    vertices = []
+    for i, point in enumerate(points):
+        vertices.extend((0.0, 0.0, *points[i - 1], *point))
+    return tuple(vertices)
+
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _get_unit_sector(segments: int, angle: float, start_angle: float) -> tuple[float, ...]:
+    """Get the triangles of a sector of a circle with a radius of 1. Angles are in degrees."""
+    segment_radians = math.radians(angle) / segments
+    start_radians = math.radians(start_angle)
+    points = [(math.cos((i * segment_radians) + start_radians),
+               math.sin((i * segment_radians) + start_radians)) for i in range(segments + 1)]
+
+    vertices = []
+    for i, point in enumerate(points[1:], start=1):
+        vertices.extend((0.0, 0.0, *points[i - 1], *point))
+    return tuple(vertices)
+
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _get_arc(radius: float, segments: int, angle: float, start_angle: float, closed: bool,
+             thickness: float) -> tuple[float, ...]:
+    """Get the triangles of the outline of an arc. Angles are in degrees.
+
+    The miters depend on the thickness, which is not scaled with the radius,
+    so the radius is part of the key.
+    """
+    segment_radians = math.radians(angle) / segments
+    start_radians = math.radians(start_angle)
+
+    # Calculate the outer points of the arc:
+    points = [(radius * math.cos((i * segment_radians) + start_radians),
+               radius * math.sin((i * segment_radians) + start_radians)) for i in range(segments + 1)]
+
+    # Create a list of quads from the points
+    vertices = []
+    prev_miter = None
+    prev_scale = None
+    for i in range(len(points) - 1):
+        prev_point = None
+        next_point = None
+        if i > 0:
+            prev_point = points[i - 1]
+        elif closed:
+            prev_point = points[-1]
+        elif abs(angle - math.tau) <= 1e-9:
+            prev_point = points[-2]
+
+        if i + 2 < len(points):
+            next_point = points[i + 2]
+        elif closed:
+            next_point = points[0]
+        elif abs(angle - math.tau) <= 1e-9:
+            next_point = points[1]
+
+        prev_miter, prev_scale, *segment = _get_segment(prev_point, points[i], points[i + 1], next_point,
+                                                        thickness, prev_miter, prev_scale)
+        vertices.extend(segment)
+
+    if closed:
+        prev_point = None
+        next_point = None
+        if len(points) > 2:
+            prev_point = points[-2]
+            next_point = points[1]
+        prev_miter, prev_scale, *segment = _get_segment(prev_point, points[-1], points[0], next_point,
+                                                        thickness, prev_miter, prev_scale)
+        vertices.extend(segment)
+
+    return tuple(vertices)
+
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _get_rounded_rectangle(width: float, height: float,
+                           radius: tuple[tuple[float, float], ...],
+                           segments: tuple[int, ...]) -> tuple[float, ...]:
+    """Get the triangles of a rounded rectangle, with its bottom left corner at the origin."""
+    points = []
+    # arc_x, arc_y, start_angle
+    arc_positions = [
+        # bottom-left
+        (radius[0][0], radius[0][1], math.pi * 3 / 2),
+        # top-left
+        (radius[1][0], height - radius[1][1], math.pi),
+        # top-right
+        (width - radius[2][0], height - radius[2][1], math.pi / 2),
+        # bottom-right
+        (width - radius[3][0], radius[3][1], 0),
+    ]
+
+    for (rx, ry), (arc_x, arc_y, arc_start), arc_segments in zip(radius, arc_positions, segments):
+        tau_segs = -math.pi / 2 / arc_segments
+        points.extend([(arc_x + rx * math.cos(i * tau_segs + arc_start),
+                        arc_y + ry * math.sin(i * tau_segs + arc_start)) for i in range(arc_segments + 1)])
+
+    center_x = width / 2
+    center_y = height / 2
+    vertices = []
+    for i, point in enumerate(points):
+        vertices.extend((center_x, center_y, *points[i - 1], *point))
+    return tuple(vertices)
+
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _get_star(num_spikes: int, inner_radius: float, outer_radius: float) -> tuple[float, ...]:
+    """Get the triangles of a star."""
+    # get angle covered by each line (= half a spike)
+    d_theta = math.pi / num_spikes
+
+    # calculate alternating points on outer and outer circles
+    points = []
+    for i in range(num_spikes):
+        points.append((outer_radius * math.cos(2 * i * d_theta),
+                       outer_radius * math.sin(2 * i * d_theta)))
+        points.append((inner_radius * math.cos((2 * i + 1) * d_theta),
+                       inner_radius * math.sin((2 * i + 1) * d_theta)))
+
+    # create a list of doubled-up points from the points
+    vertices = []
+    for i, point in enumerate(points):
+        vertices.extend((0.0, 0.0, *points[i - 1], *point))
+    return tuple(vertices)
+
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _get_polygon_indices(outline: tuple[float, ...]) -> tuple[int, ...]:
+    """Get the triangle indices of a polygon outline, given as flat vertices.
+
+    Indices do not change when a polygon is moved, so outlines should be
+    given relative to one of their points.
+    """
+    return tuple(earcut.earcut(outline))
+
+
+@tracks_state
 class _ShapeGroup(Group):
     """Shared Shape rendering Group.
 
@@ -280,13 +633,17 @@ class _ShapeGroup(Group):
         self.blend_dest = blend_dest
 
     def set_state(self) -> None:
-        self.program.bind()
-        glEnable(GL_BLEND)
-        glBlendFunc(self.blend_src, self.blend_dest)
+        state_cache = get_state_cache()
+        state_cache.use_program(self.program.id)
+        state_cache.enable_blend(self.blend_src, self.blend_dest)
 
     def unset_state(self) -> None:
-        glDisable(GL_BLEND)
-        self.program.unbind()
+        state_cache = get_state_cache()
+        state_cache.disable_blend()
+        state_cache.stop_program()
+
+    def state_key(self) -> Hashable:
+        return self.program.id, self.blend_src, self.blend_dest
 
     def __eq__(self, other: Group | _ShapeGroup) -> None:
         return (other.__class__ is self.__class__ and
@@ -321,11 +678,13 @@ class ShapeBase(ABC):
     _anchor_x: float = 0.0
     _anchor_y: float = 0.0
     _batch: Batch | None = None
+    _batch_tracks_bounds: bool = False
     _group: _ShapeGroup | Group | None = None
     _num_verts: int = 0
     _user_group: Group | None = None
     _vertex_list = None
     _draw_mode: int = GL_TRIANGLES
+    _extent: tuple[float, float, float, float] | None = None
     group_class: Group = _ShapeGroup
 
     def __init__(self,
@@ -356,13 +715,16 @@ class ShapeBase(ABC):
         self._blend_src = blend_src
         self._blend_dest = blend_dest
         self._batch = batch
+        self._batch_tracks_bounds = self._tracks_bounds(batch)
         self._user_group = group
         self._program = program or get_default_shader()
         self._group = self.get_shape_group()
         self._create_vertex_list()
+        self._update_bounds()
 
     def __del__(self) -> None:
         if self._vertex_list is not None:
+            self._remove_bounds()
             self._vertex_list.delete()
             self._vertex_list = None
 
@@ -394,6 +756,47 @@ class ShapeBase(ABC):
 
     def _update_translation(self) -> None:
         self._vertex_list.translation[:] = (self._x, self._y) * self._num_verts
+        self._update_bounds()
+
+    @staticmethod
+    def _tracks_bounds(batch: Batch | None) -> bool:
+        """Check if a batch needs the bounding boxes or sort keys of its shapes."""
+        return batch is not None and (batch.culling or batch.sort_by is not None)
+
+    def _update_bounds(self, vertices: Sequence[float] | None = None) -> None:
+        """Report the bounding box of the shape to its batch, if it culls, and its sort key, if it sorts.
+
+        Subclasses should pass the new vertices whenever they change.
+        Otherwise, they are generated again with ``_get_vertices``.
+        """
+        if not self._batch_tracks_bounds:
+            return
+        batch = self._batch
+        if batch.sort_by is not None:
+            batch.set_sort_key(self._vertex_list, batch.get_sort_key(self._x, self._y, self._z))
+        if not batch.culling:
+            return
+
+        if vertices is not None or self._extent is None:
+            if vertices is None:
+                vertices = self._get_vertices()
+            xs = vertices[0::2]
+            ys = vertices[1::2]
+            self._extent = min(xs), min(ys), max(xs), max(ys)
+
+        x1, y1, x2, y2 = self._extent
+        if self._rotation:
+            # Any rotation around the position stays within this radius:
+            radius = max(math.hypot(x, y) for x in (x1, x2) for y in (y1, y2))
+            x1 = y1 = -radius
+            x2 = y2 = radius
+
+        batch.set_bounds(self._vertex_list, self._x + x1, self._y + y1, x2 - x1, y2 - y1)
+
+    def _remove_bounds(self) -> None:
+        if self._batch_tracks_bounds:
+            self._batch.remove_bounds(self._vertex_list)
+            self._batch.remove_sort_key(self._vertex_list)
 
     def _create_vertex_list(self) -> None:
         """Build internal vertex list.
@@ -465,8 +868,10 @@ class ShapeBase(ABC):
             return
 
         # Recreate vertex list.
+        self._remove_bounds()
         self._vertex_list.delete()
         self._create_vertex_list()
+        self._update_bounds()
 
     @property
     def rotation(self) -> float:
@@ -500,6 +905,7 @@ class ShapeBase(ABC):
     def rotation(self, rotation: float) -> None:
         self._rotation = rotation
         self._vertex_list.rotation[:] = (rotation,) * self._num_verts
+        self._update_bounds()
 
     def draw(self) -> None:
         """Debug method to draw a single shape at its current position.
@@ -527,6 +933,7 @@ class ShapeBase(ABC):
         without using the current method, but is a very advanced technique.
         """
         if self._vertex_list is not None:
+            self._remove_bounds()
             self._vertex_list.delete()
             self._vertex_list = None
 
@@ -581,6 +988,7 @@ class ShapeBase(ABC):
     def z(self, value: float) -> None:
         self._z = value
         self._vertex_list.zposition = (value,) * self._num_verts
+        self._update_bounds()
 
     @property
     def position(self) -> tuple[float, float]:
@@ -780,9 +1188,14 @@ class ShapeBase(ABC):
             self._batch.migrate(self._vertex_list, self._draw_mode, self._group, batch)
             self._batch = batch
         else:
+            self._remove_bounds()
             self._vertex_list.delete()
             self._batch = batch
             self._create_vertex_list()
+        self._batch_tracks_bounds = self._tracks_bounds(batch)
+        # The extent is only kept up to date while tracked:
+        self._extent = None
+        self._update_bounds()
 
 
 class Arc(ShapeBase):
@@ -879,55 +1292,14 @@ class Arc(ShapeBase):
         if not self._visible:
             return (0, 0) * self._num_verts
 
-        x = -self._anchor_x
-        y = -self._anchor_y
-        r = self._radius
-        segment_radians = math.radians(self._angle) / self._segments
-        start_radians = math.radians(self._start_angle - self._rotation)
-
-        # Calculate the outer points of the arc:
-        points = [(x + (r * math.cos((i * segment_radians) + start_radians)),
-                   y + (r * math.sin((i * segment_radians) + start_radians))) for i in range(self._segments + 1)]
-
-        # Create a list of quads from the points
-        vertices = []
-        prev_miter = None
-        prev_scale = None
-        for i in range(len(points) - 1):
-            prev_point = None
-            next_point = None
-            if i > 0:
-                prev_point = points[i - 1]
-            elif self._closed:
-                prev_point = points[-1]
-            elif abs(self._angle - math.tau) <= 1e-9:
-                prev_point = points[-2]
-
-            if i + 2 < len(points):
-                next_point = points[i + 2]
-            elif self._closed:
-                next_point = points[0]
-            elif abs(self._angle - math.tau) <= 1e-9:
-                next_point = points[1]
-
-            prev_miter, prev_scale, *segment = _get_segment(prev_point, points[i], points[i + 1], next_point,
-                                                            self._thickness, prev_miter, prev_scale)
-            vertices.extend(segment)
-
-        if self._closed:
-            prev_point = None
-            next_point = None
-            if len(points) > 2:
-                prev_point = points[-2]
-                next_point = points[1]
-            prev_miter, prev_scale, *segment = _get_segment(prev_point, points[-1], points[0], next_point,
-                                                            self._thickness, prev_miter, prev_scale)
-            vertices.extend(segment)
-
-        return vertices
+        arc = _get_arc(self._radius, self._segments, self._angle, self._start_angle - self._rotation,
+                       self._closed, self._thickness)
+        return _transform_vertices(arc, -self._anchor_x, -self._anchor_y)
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def radius(self) -> float:
@@ -1081,7 +1453,9 @@ class BezierCurve(ShapeBase):
         return vertices
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def points(self) -> list[tuple[float, float]]:
@@ -1188,25 +1562,13 @@ class Circle(ShapeBase):
         if not self._visible:
             return (0, 0) * self._num_verts
 
-        x = -self._anchor_x
-        y = -self._anchor_y
         r = self._radius
-        tau_segs = math.pi * 2 / self._segments
-
-        # Calculate the outer points of the circle:
-        points = [(x + (r * math.cos(i * tau_segs)),
-                   y + (r * math.sin(i * tau_segs))) for i in range(self._segments)]
-
-        # Create a list of triangles from the points:
-        vertices = []
-        for i, point in enumerate(points):
-            triangle = x, y, *points[i - 1], *point
-            vertices.extend(triangle)
-
-        return vertices
+        return _transform_vertices(_get_unit_circle(self._segments), -self._anchor_x, -self._anchor_y, r, r)
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def radius(self) -> float:
@@ -1307,24 +1669,13 @@ class Ellipse(ShapeBase):
         if not self._visible:
             return (0, 0) * self._num_verts
 
-        x = -self._anchor_x
-        y = -self._anchor_y
-        tau_segs = math.pi * 2 / self._segments
-
-        # Calculate the points of the ellipse by formula:
-        points = [(x + self._a * math.cos(i * tau_segs),
-                   y + self._b * math.sin(i * tau_segs)) for i in range(self._segments)]
-
-        # Create a list of triangles from the points:
-        vertices = []
-        for i, point in enumerate(points):
-            triangle = x, y, *points[i - 1], *point
-            vertices.extend(triangle)
-
-        return vertices
+        return _transform_vertices(_get_unit_circle(self._segments), -self._anchor_x, -self._anchor_y,
+                                   self._a, self._b)
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def a(self) -> float:
@@ -1451,26 +1802,14 @@ class Sector(ShapeBase):
         if not self._visible:
             return (0, 0) * self._num_verts
 
-        x = -self._anchor_x
-        y = -self._anchor_y
         r = self._radius
-        segment_radians = math.radians(self._angle) / self._segments
-        start_radians = math.radians(self._start_angle)
-
-        # Calculate the outer points of the sector.
-        points = [(x + (r * math.cos((i * segment_radians) + start_radians)),
-                   y + (r * math.sin((i * segment_radians) + start_radians))) for i in range(self._segments + 1)]
-
-        # Create a list of triangles from the points
-        vertices = []
-        for i, point in enumerate(points[1:], start=1):
-            triangle = x, y, *points[i - 1], *point
-            vertices.extend(triangle)
-
-        return vertices
+        sector = _get_unit_sector(self._segments, self._angle, self._start_angle)
+        return _transform_vertices(sector, -self._anchor_x, -self._anchor_y, r, r)
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def angle(self) -> float:
@@ -1616,7 +1955,9 @@ class Line(ShapeBase):
         return ax, ay, bx, by, cx, cy, ax, ay, cx, cy, dx, dy
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def thickness(self) -> float:
@@ -1729,7 +2070,9 @@ class Rectangle(ShapeBase):
             return x1, y1, x2, y1, x2, y2, x1, y1, x2, y2, x1, y2
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def width(self) -> float:
@@ -1882,7 +2225,9 @@ class BorderedRectangle(ShapeBase):
                 bx1, by1, bx2, by1, bx2, by2, bx1, by2)
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def border(self) -> float:
@@ -2101,7 +2446,9 @@ class Box(ShapeBase):
         return x1, y1, x2, y2, x2, y3, x1, y4, x3, y2, x4, y1, x4, y4, x3, y3
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def width(self) -> float:
@@ -2260,42 +2607,14 @@ class RoundedRectangle(pyglet.shapes.ShapeBase):
         if not self._visible:
             return (0, 0) * self._num_verts
 
-        x = -self._anchor_x
-        y = -self._anchor_y
-
-        points = []
-        # arc_x, arc_y, start_angle
-        arc_positions = [
-            # bottom-left
-            (x + self._radius[0][0],
-             y + self._radius[0][1], math.pi * 3 / 2),
-            # top-left
-            (x + self._radius[1][0],
-             y + self._height - self._radius[1][1], math.pi),
-            # top-right
-            (x + self._width - self._radius[2][0],
-             y + self._height - self._radius[2][1], math.pi / 2),
-            # bottom-right
-            (x + self._width - self._radius[3][0],
-             y + self._radius[3][1], 0),
-        ]
-
-        for (rx, ry), (arc_x, arc_y, arc_start), segments in zip(self._radius, arc_positions, self._segments):
-            tau_segs = -math.pi / 2 / segments
-            points.extend([(arc_x + rx * math.cos(i * tau_segs + arc_start),
-                            arc_y + ry * math.sin(i * tau_segs + arc_start)) for i in range(segments + 1)])
-
-        center_x = self._width / 2
-        center_y = self._height / 2
-        vertices = []
-        for i, point in enumerate(points):
-            triangle = center_x, center_y, *points[i - 1], *point
-            vertices.extend(triangle)
-
-        return vertices
+        rectangle = _get_rounded_rectangle(self._width, self._height,
+                                           tuple(tuple(radius) for radius in self._radius), tuple(self._segments))
+        return _transform_vertices(rectangle, -self._anchor_x, -self._anchor_y)
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def width(self) -> float:
@@ -2421,7 +2740,9 @@ class Triangle(ShapeBase):
             return x1, y1, x2, y2, x3, y3
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def x2(self) -> float:
@@ -2549,32 +2870,13 @@ class Star(ShapeBase):
         if not self._visible:
             return (0, 0) * self._num_verts
 
-        x = -self._anchor_x
-        y = -self._anchor_y
-        r_i = self._inner_radius
-        r_o = self._outer_radius
-
-        # get angle covered by each line (= half a spike)
-        d_theta = math.pi / self._num_spikes
-
-        # calculate alternating points on outer and outer circles
-        points = []
-        for i in range(self._num_spikes):
-            points.append((x + (r_o * math.cos(2 * i * d_theta)),
-                           y + (r_o * math.sin(2 * i * d_theta))))
-            points.append((x + (r_i * math.cos((2 * i + 1) * d_theta)),
-                           y + (r_i * math.sin((2 * i + 1) * d_theta))))
-
-        # create a list of doubled-up points from the points
-        vertices = []
-        for i, point in enumerate(points):
-            triangle = x, y, *points[i - 1], *point
-            vertices.extend(triangle)
-
-        return vertices
+        star = _get_star(self._num_spikes, self._inner_radius, self._outer_radius)
+        return _transform_vertices(star, -self._anchor_x, -self._anchor_y)
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def outer_radius(self) -> float:
@@ -2661,9 +2963,11 @@ class Polygon(ShapeBase):
 
     def _create_vertex_list(self) -> None:
         vertices = self._get_vertices()
+        x0, y0 = self._coordinates[0]
+        outline = tuple(coord for x, y in self._coordinates for coord in (x - x0, y - y0))
         self._vertex_list = self._program.vertex_list_indexed(
             self._num_verts, self._draw_mode,
-            earcut.earcut(vertices),
+            _get_polygon_indices(outline),
             self._batch, self._group,
             position=('f', vertices),
             colors=('Bn', self._rgba * self._num_verts),
@@ -2684,7 +2988,9 @@ class Polygon(ShapeBase):
         return earcut.flatten([coords])["vertices"]
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
 
 class MultiLine(ShapeBase):
@@ -2785,7 +3091,9 @@ class MultiLine(ShapeBase):
         return triangles
 
     def _update_vertices(self) -> None:
-        self._vertex_list.position[:] = self._get_vertices()
+        vertices = self._get_vertices()
+        self._vertex_list.position[:] = vertices
+        self._update_bounds(vertices)
 
     @property
     def thickness(self) -> float:
@@ -2798,5 +3106,1118 @@ class MultiLine(ShapeBase):
         self._update_vertices()
 
 
+# A unit square, made of two triangles:
+_UNIT_RECTANGLE = (0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 1.0, 0.0, 1.0)
+
+
+def _get_mesh_domain(batch: Batch, group: Group, program: ShaderProgram, key: Hashable,
+                     vertices: Sequence[float], formats: dict[str, str]) -> InstancedVertexDomain:
+    """Get the instanced domain drawing a mesh in a batch and group, creating it if needed.
+
+    Each instance of the domain is one shape, with the instance attributes
+    named in ``formats``. The mesh is only stored once.
+    """
+    shared_key = (group, tuple(formats.items()), key)
+    domain = batch._shared_domains.get(shared_key)  # noqa: SLF001
+    if domain is not None and domain._shared_source is not None:  # noqa: SLF001
+        return domain
+
+    # The mesh is copied from a regular vertex list, which is then deleted:
+    count = len(vertices) // 2
+    source = program.vertex_list(count, GL_TRIANGLES, batch, group, position=('f', vertices),
+                                 **formats)
+    layout = source.domain.attribute_meta
+    attributes = VertexLayout({name: {**meta, 'instance': name in formats}
+                               for name, meta in layout.items()})
+    domain = batch.get_domain(False, True, GL_TRIANGLES, group, attributes, source.domain.usage)
+    domain.set_shared_source(source, (batch, group, GL_TRIANGLES, layout, source.domain.usage))
+    source.delete()
+
+    batch._shared_domains[shared_key] = domain  # noqa: SLF001
+    return domain
+
+
+class InstancedShapeBase(ShapeBase):
+    """Base class of shapes drawn as instances of a mesh shared with similar shapes.
+
+    Regular shapes store every vertex, with the color, position and rotation
+    repeated for each one. An instanced shape stores a single record instead:
+    its position, rotation, color, scale and anchor. The vertex shader
+    scales, anchors and moves a mesh shared by all shapes of the same kind,
+    so a 64 segment circle costs one record instead of 192 vertices, and
+    changing its color or position uploads a few bytes.
+
+    Shapes share a mesh if they are in the same batch and group, and have the
+    same mesh parameters, such as the number of segments. Changing those
+    parameters moves the shape to another mesh. Circles and ellipses share
+    their meshes.
+
+    Instanced shapes are not culled or sorted by their batch, and must use a
+    program with the attributes of :py:data:`instanced_vertex_source`.
+    ``draw`` draws every shape sharing the mesh.
+
+    .. versionadded:: 2.1.16
+    """
+
+    #: The format of each instance attribute. Subclasses with their own
+    #: program may add more, and return their values from ``_get_instance_data``.
+    _instance_formats: ClassVar[dict[str, str]] = {
+        'translation': 'f', 'zposition': 'f', 'rotation': 'f', 'colors': 'Bn', 'scale': 'f', 'anchor': 'f',
+    }
+
+    def __init__(self,
+                 blend_src: int = GL_SRC_ALPHA,
+                 blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+                 batch: Batch | None = None,
+                 group: Group | None = None,
+                 program: ShaderProgram | None = None,
+                 ) -> None:
+        """Initialize attributes that all instanced shapes require.
+
+        Args:
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch object.
+            group:
+                Optional group object.
+            program:
+                Optional ShaderProgram object. Defaults to
+                :py:func:`get_default_instanced_shader`.
+        """
+        self._mesh_key = self._get_mesh_key()
+        super().__init__(len(self._get_mesh()) // 2, blend_src, blend_dest, batch, group,
+                         program or get_default_instanced_shader())
+
+    @abstractmethod
+    def _get_mesh_key(self) -> Hashable:
+        """Get a key identifying the shape's mesh. Shapes with equal keys must have equal meshes."""
+
+    @abstractmethod
+    def _get_mesh(self) -> Sequence[float]:
+        """Get the triangles of the shape's mesh, before scaling, as flat vertices."""
+
+    @abstractmethod
+    def _get_scale(self) -> tuple[float, float]:
+        """Get the scale applied to the mesh."""
+
+    def _create_vertex_list(self) -> None:
+        batch = self._batch or pyglet.graphics.get_default_batch()
+        domain = _get_mesh_domain(batch, self._group, self._program, self._mesh_key, self._get_mesh(),
+                                  self._instance_formats)
+        self._vertex_list = domain.add_shared(**self._get_instance_data())
+
+    def _get_instance_data(self) -> dict[str, Sequence]:
+        """Get the value of each instance attribute."""
+        scale, anchor = self._get_scale_and_anchor()
+        return {
+            'translation': (self._x, self._y),
+            'zposition': (self._z,),
+            'rotation': (self._rotation,),
+            'colors': self._rgba,
+            'scale': scale,
+            'anchor': anchor,
+        }
+
+    def _get_scale_and_anchor(self) -> tuple[tuple[float, float], tuple[float, float]]:
+        if not self._visible:
+            return (0.0, 0.0), (0.0, 0.0)
+        return self._get_scale(), (self._anchor_x, self._anchor_y)
+
+    def _recreate_vertex_list(self) -> None:
+        self._vertex_list.delete()
+        self._create_vertex_list()
+
+    def _update_mesh(self) -> None:
+        """Move to another mesh if the mesh parameters have changed, or update the scale."""
+        key = self._get_mesh_key()
+        if key != self._mesh_key:
+            self._mesh_key = key
+            self._num_verts = len(self._get_mesh()) // 2
+            self._recreate_vertex_list()
+        else:
+            self._update_vertices()
+
+    def _update_vertices(self) -> None:
+        self._vertex_list.scale, self._vertex_list.anchor = self._get_scale_and_anchor()
+
+    def _update_color(self) -> None:
+        self._vertex_list.colors = self._rgba
+
+    def _update_translation(self) -> None:
+        self._vertex_list.translation = (self._x, self._y)
+
+    def _update_bounds(self, vertices: Sequence[float] | None = None) -> None:
+        """Instanced shapes are neither culled nor sorted."""
+
+    def _remove_bounds(self) -> None:
+        pass
+
+    @ShapeBase.rotation.setter
+    def rotation(self, rotation: float) -> None:
+        self._rotation = rotation
+        self._vertex_list.rotation = (rotation,)
+
+    @ShapeBase.z.setter
+    def z(self, value: float) -> None:
+        self._z = value
+        self._vertex_list.zposition = (value,)
+
+    @ShapeBase.blend_mode.setter
+    def blend_mode(self, modes: tuple[int, int]) -> None:
+        self._blend_src, self._blend_dest = modes
+        self._group = self.get_shape_group()
+        self._recreate_vertex_list()
+
+    @ShapeBase.program.setter
+    def program(self, program: ShaderProgram) -> None:
+        self._program = program
+        self._group = self.get_shape_group()
+        self._recreate_vertex_list()
+
+    @ShapeBase.group.setter
+    def group(self, group: Group) -> None:
+        self._user_group = group
+        self._group = self.get_shape_group()
+        self._recreate_vertex_list()
+
+    @ShapeBase.batch.setter
+    def batch(self, batch: Batch | None) -> None:
+        self._batch = batch
+        self._recreate_vertex_list()
+
+
+def _get_instanced_segments(radius: float) -> int:
+    """Get the default number of segments of an instanced curve.
+
+    As for the tessellated shapes, this grows with the radius, but is rounded
+    up to a power of two so that curves of similar sizes share a mesh.
+    """
+    return max(16, 1 << (int(radius / 1.25) - 1).bit_length())
+
+
+class InstancedCircle(InstancedShapeBase):
+    """A :py:class:`Circle` drawn as an instance of a mesh shared with other circles.
+
+    See :py:class:`InstancedShapeBase`. Circles share a mesh if they have
+    the same number of segments.
+    """
+
+    __contains__ = Circle.__contains__
+
+    def __init__(
+            self,
+            x: float, y: float,
+            radius: float,
+            segments: int | None = None,
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an instanced circle.
+
+        Args:
+            x:
+                X coordinate of the circle.
+            y:
+                Y coordinate of the circle.
+            radius:
+                The desired radius.
+            segments:
+                The number of triangles the circle is made from. Defaults
+                to ``int(radius / 1.25)``, rounded up to a power of two of
+                at least 16, so that circles of similar sizes share a mesh.
+            color:
+                The RGB or RGBA color of the circle.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._radius = radius
+        self._segments = segments or _get_instanced_segments(radius)
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(blend_src, blend_dest, batch, group, program)
+
+    def _get_mesh_key(self) -> Hashable:
+        return 'circle', self._segments
+
+    def _get_mesh(self) -> Sequence[float]:
+        return _get_unit_circle(self._segments)
+
+    def _get_scale(self) -> tuple[float, float]:
+        return self._radius, self._radius
+
+    @property
+    def radius(self) -> float:
+        """Get/set the radius of the circle."""
+        return self._radius
+
+    @radius.setter
+    def radius(self, value: float) -> None:
+        self._radius = value
+        self._update_vertices()
+
+    @property
+    def segments(self) -> int:
+        """Get/set the number of triangles of the circle."""
+        return self._segments
+
+    @segments.setter
+    def segments(self, value: int) -> None:
+        self._segments = value
+        self._update_mesh()
+
+
+class InstancedEllipse(InstancedShapeBase):
+    """An :py:class:`Ellipse` drawn as an instance of a mesh shared with other ellipses.
+
+    See :py:class:`InstancedShapeBase`. Ellipses share a mesh with ellipses
+    and circles that have the same number of segments.
+    """
+
+    __contains__ = Ellipse.__contains__
+
+    def __init__(
+            self,
+            x: float, y: float,
+            a: float, b: float,
+            segments: int | None = None,
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an instanced ellipse.
+
+        Args:
+            x:
+                X coordinate of the ellipse.
+            y:
+                Y coordinate of the ellipse.
+            a:
+                Semi-major axes of the ellipse.
+            b:
+                Semi-minor axes of the ellipse.
+            segments:
+                The number of triangles the ellipse is made from. Defaults
+                to ``int(max(a, b) / 1.25)``, rounded up to a power of two of
+                at least 16, so that ellipses of similar sizes share a mesh.
+            color:
+                The RGB or RGBA color of the ellipse.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._a = a
+        self._b = b
+        self._segments = segments or _get_instanced_segments(max(a, b))
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(blend_src, blend_dest, batch, group, program)
+
+    def _get_mesh_key(self) -> Hashable:
+        return 'circle', self._segments
+
+    def _get_mesh(self) -> Sequence[float]:
+        return _get_unit_circle(self._segments)
+
+    def _get_scale(self) -> tuple[float, float]:
+        return self._a, self._b
+
+    @property
+    def a(self) -> float:
+        """Get/set the semi-major axes of the ellipse."""
+        return self._a
+
+    @a.setter
+    def a(self, value: float) -> None:
+        self._a = value
+        self._update_vertices()
+
+    @property
+    def b(self) -> float:
+        """Get/set the semi-minor axes of the ellipse."""
+        return self._b
+
+    @b.setter
+    def b(self, value: float) -> None:
+        self._b = value
+        self._update_vertices()
+
+
+class InstancedRectangle(InstancedShapeBase):
+    """A :py:class:`Rectangle` drawn as an instance of a quad shared with all other rectangles.
+
+    See :py:class:`InstancedShapeBase`.
+    """
+
+    __contains__ = Rectangle.__contains__
+
+    def __init__(
+            self,
+            x: float, y: float,
+            width: float, height: float,
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an instanced rectangle.
+
+        The rectangle's anchor point defaults to the ``(x, y)`` coordinates,
+        which are at the bottom left.
+
+        Args:
+            x:
+                The X coordinate of the rectangle.
+            y:
+                The Y coordinate of the rectangle.
+            width:
+                The width of the rectangle.
+            height:
+                The height of the rectangle.
+            color:
+                The RGB or RGBA color of the rectangle.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._width = width
+        self._height = height
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(blend_src, blend_dest, batch, group, program)
+
+    def _get_mesh_key(self) -> Hashable:
+        return 'rectangle'
+
+    def _get_mesh(self) -> Sequence[float]:
+        return _UNIT_RECTANGLE
+
+    def _get_scale(self) -> tuple[float, float]:
+        return self._width, self._height
+
+    @property
+    def width(self) -> float:
+        """Get/set the width of the rectangle."""
+        return self._width
+
+    @width.setter
+    def width(self, value: float) -> None:
+        self._width = value
+        self._update_vertices()
+
+    @property
+    def height(self) -> float:
+        """Get/set the height of the rectangle."""
+        return self._height
+
+    @height.setter
+    def height(self, value: float) -> None:
+        self._height = value
+        self._update_vertices()
+
+
+class InstancedSector(InstancedShapeBase):
+    """A :py:class:`Sector` drawn as an instance of a mesh shared with similar sectors.
+
+    See :py:class:`InstancedShapeBase`. Sectors share a mesh if they have
+    the same number of segments, angle and start angle. Changing an angle
+    moves the sector to another mesh, so prefer :py:attr:`rotation` for
+    spinning sectors.
+    """
+
+    __contains__ = Sector.__contains__
+
+    def __init__(
+            self,
+            x: float, y: float,
+            radius: float,
+            segments: int | None = None,
+            angle: float = 360.0,
+            start_angle: float = 0.0,
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an instanced sector of a circle.
+
+        Args:
+            x:
+                X coordinate of the sector.
+            y:
+                Y coordinate of the sector.
+            radius:
+                The desired radius.
+            segments:
+                The number of triangles the sector is made from. Defaults
+                to ``int(radius / 1.25)``, rounded up to a power of two of
+                at least 16, so that sectors of similar sizes share a mesh.
+            angle:
+                The angle of the sector, in degrees.
+            start_angle:
+                The start angle of the sector, in degrees.
+            color:
+                The RGB or RGBA color of the sector.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._radius = radius
+        self._segments = segments or _get_instanced_segments(radius)
+        self._angle = angle
+        self._start_angle = start_angle
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(blend_src, blend_dest, batch, group, program)
+
+    def _get_mesh_key(self) -> Hashable:
+        return 'sector', self._segments, self._angle, self._start_angle
+
+    def _get_mesh(self) -> Sequence[float]:
+        return _get_unit_sector(self._segments, self._angle, self._start_angle)
+
+    def _get_scale(self) -> tuple[float, float]:
+        return self._radius, self._radius
+
+    @property
+    def radius(self) -> float:
+        """Get/set the radius of the sector."""
+        return self._radius
+
+    @radius.setter
+    def radius(self, value: float) -> None:
+        self._radius = value
+        self._update_vertices()
+
+    @property
+    def angle(self) -> float:
+        """The angle of the sector, in degrees."""
+        return self._angle
+
+    @angle.setter
+    def angle(self, value: float) -> None:
+        self._angle = value
+        self._update_mesh()
+
+    @property
+    def start_angle(self) -> float:
+        """The start angle of the sector, in degrees."""
+        return self._start_angle
+
+    @start_angle.setter
+    def start_angle(self, angle: float) -> None:
+        self._start_angle = angle
+        self._update_mesh()
+
+
+# The distance function of each SDF shape, as selected in `sdf_fragment_source`:
+_SDF_ELLIPSE = 0.0
+_SDF_ROUNDED_BOX = 1.0
+_SDF_ARC = 2.0
+
+
+class SDFShapeBase(InstancedShapeBase):
+    """Base class of curved shapes drawn as a single quad, with a signed distance field.
+
+    Tessellated shapes approximate curves with straight segments, which show
+    as corners on large shapes and as aliased edges on small ones. An SDF
+    shape is instead drawn as one quad covering it, and the fragment shader
+    computes the distance of each pixel to the shape's edge. This gives
+    smooth, anti-aliased curves and borders at any size, without a
+    ``segments`` parameter, and without multisampling.
+
+    All SDF shapes in the same batch and group share one quad, and are drawn
+    together in a single draw call, as for :py:class:`InstancedShapeBase`.
+    Each shape costs one record, and changing any of its parameters only
+    updates that record.
+
+    The anti-aliased edge is drawn in a margin of a few pixels around the
+    shape. Its size follows the scale of the window's view, but assumes a
+    projection mapping one unit to one pixel, as the default projection does.
+
+    SDF shapes must use a program with the attributes of
+    :py:data:`sdf_vertex_source`, and the distance functions of
+    :py:data:`sdf_fragment_source`.
+
+    .. versionadded:: 2.1.16
+    """
+
+    _instance_formats: ClassVar[dict[str, str]] = {
+        **InstancedShapeBase._instance_formats,
+        'border_colors': 'Bn', 'sdf_params': 'f', 'sdf_shape': 'f', 'border': 'f',
+    }
+
+    #: The distance function used by the fragment shader.
+    _sdf_shape: ClassVar[float]
+
+    def __init__(self,
+                 border: float = 0.0,
+                 border_color: tuple[int, int, int, int] | tuple[int, int, int] = (100, 100, 100),
+                 blend_src: int = GL_SRC_ALPHA,
+                 blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+                 batch: Batch | None = None,
+                 group: Group | None = None,
+                 program: ShaderProgram | None = None,
+                 ) -> None:
+        """Initialize attributes that all SDF shapes require.
+
+        Args:
+            border:
+                The thickness of the border, extending inward from the edge.
+                Defaults to ``0.0``, for no border.
+            border_color:
+                The RGB color of the border. As for
+                :py:class:`BorderedRectangle`, an alpha value sets the
+                alpha of the whole shape.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch object.
+            group:
+                Optional group object.
+            program:
+                Optional ShaderProgram object. Defaults to
+                :py:func:`get_default_sdf_shader`.
+        """
+        self._border = border
+        r, g, b, *a = border_color
+        self._border_rgb = r, g, b
+        if a:
+            self._rgba = *self._rgba[:3], a[0]
+        super().__init__(blend_src, blend_dest, batch, group, program or get_default_sdf_shader())
+
+    @abstractmethod
+    def _get_box(self) -> tuple[float, float, float, float]:
+        """Get the ``(left, bottom, width, height)`` of the shape, relative to its position."""
+
+    @abstractmethod
+    def _get_sdf_params(self) -> tuple[float, float, float, float]:
+        """Get the parameters of the shape's distance function."""
+
+    def _get_mesh_key(self) -> Hashable:
+        return 'sdf'
+
+    def _get_mesh(self) -> Sequence[float]:
+        return _UNIT_RECTANGLE
+
+    def _get_scale(self) -> tuple[float, float]:
+        # The vertex shader grows the quad by a margin for the anti-aliased edge:
+        _, _, width, height = self._get_box()
+        return width, height
+
+    def _get_scale_and_anchor(self) -> tuple[tuple[float, float], tuple[float, float]]:
+        if not self._visible:
+            return (0.0, 0.0), (0.0, 0.0)
+        left, bottom, _, _ = self._get_box()
+        return self._get_scale(), (self._anchor_x - left, self._anchor_y - bottom)
+
+    def _get_border_rgba(self) -> tuple[int, int, int, int]:
+        return *self._border_rgb, self._rgba[3]
+
+    def _get_instance_data(self) -> dict[str, Sequence]:
+        return {
+            **super()._get_instance_data(),
+            'border_colors': self._get_border_rgba(),
+            'sdf_params': self._get_sdf_params(),
+            'sdf_shape': (self._sdf_shape,),
+            'border': (self._border,),
+        }
+
+    def _update_vertices(self) -> None:
+        super()._update_vertices()
+        self._vertex_list.sdf_params = self._get_sdf_params()
+
+    def _update_color(self) -> None:
+        self._vertex_list.colors = self._rgba
+        self._vertex_list.border_colors = self._get_border_rgba()
+
+    @property
+    def border(self) -> float:
+        """The border thickness of the shape.
+
+        This extends inward from the edge of the shape toward the center.
+        A thickness of ``0.0`` draws no border.
+        """
+        return self._border
+
+    @border.setter
+    def border(self, thickness: float) -> None:
+        self._border = thickness
+        self._vertex_list.border = (thickness,)
+
+    @property
+    def border_color(self) -> tuple[int, int, int, int]:
+        """Get/set the shape's border color.
+
+        To set the color of the interior fill, see :py:attr:`.color`.
+        As for :py:class:`BorderedRectangle`, setting the alpha on this
+        property will change the alpha of the entire shape.
+        """
+        return self._get_border_rgba()
+
+    @border_color.setter
+    def border_color(self, values: tuple[int, int, int, int] | tuple[int, int, int]) -> None:
+        r, g, b, *a = values
+        self._border_rgb = r, g, b
+        if a:
+            self._rgba = *self._rgba[:3], a[0]
+        self._update_color()
+
+
+class SDFCircle(SDFShapeBase):
+    """A :py:class:`Circle` drawn with a signed distance field.
+
+    See :py:class:`SDFShapeBase`.
+    """
+
+    __contains__ = Circle.__contains__
+    _sdf_shape = _SDF_ELLIPSE
+
+    def __init__(
+            self,
+            x: float, y: float,
+            radius: float,
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            border: float = 0.0,
+            border_color: tuple[int, int, int, int] | tuple[int, int, int] = (100, 100, 100),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an SDF circle.
+
+        The circle's anchor point ``(x, y)`` defaults to the center of the circle.
+
+        Args:
+            x:
+                X coordinate of the circle.
+            y:
+                Y coordinate of the circle.
+            radius:
+                The desired radius.
+            color:
+                The RGB or RGBA color of the circle.
+            border:
+                The thickness of the border. Defaults to ``0.0``, for no border.
+            border_color:
+                The RGB color of the border.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._radius = radius
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(border, border_color, blend_src, blend_dest, batch, group, program)
+
+    def _get_box(self) -> tuple[float, float, float, float]:
+        return -self._radius, -self._radius, self._radius * 2, self._radius * 2
+
+    def _get_sdf_params(self) -> tuple[float, float, float, float]:
+        return 0.0, 0.0, 0.0, 0.0
+
+    @property
+    def radius(self) -> float:
+        """Get/set the radius of the circle."""
+        return self._radius
+
+    @radius.setter
+    def radius(self, value: float) -> None:
+        self._radius = value
+        self._update_vertices()
+
+
+class SDFEllipse(SDFShapeBase):
+    """An :py:class:`Ellipse` drawn with a signed distance field.
+
+    See :py:class:`SDFShapeBase`. The distance to an ellipse is approximated,
+    so borders are slightly thinner along the major axis of elongated
+    ellipses.
+    """
+
+    __contains__ = Ellipse.__contains__
+    _sdf_shape = _SDF_ELLIPSE
+
+    def __init__(
+            self,
+            x: float, y: float,
+            a: float, b: float,
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            border: float = 0.0,
+            border_color: tuple[int, int, int, int] | tuple[int, int, int] = (100, 100, 100),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an SDF ellipse.
+
+        The ellipse's anchor point ``(x, y)`` defaults to the center of the ellipse.
+
+        Args:
+            x:
+                X coordinate of the ellipse.
+            y:
+                Y coordinate of the ellipse.
+            a:
+                Semi-major axes of the ellipse.
+            b:
+                Semi-minor axes of the ellipse.
+            color:
+                The RGB or RGBA color of the ellipse.
+            border:
+                The thickness of the border. Defaults to ``0.0``, for no border.
+            border_color:
+                The RGB color of the border.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._a = a
+        self._b = b
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(border, border_color, blend_src, blend_dest, batch, group, program)
+
+    def _get_box(self) -> tuple[float, float, float, float]:
+        return -self._a, -self._b, self._a * 2, self._b * 2
+
+    def _get_sdf_params(self) -> tuple[float, float, float, float]:
+        return 0.0, 0.0, 0.0, 0.0
+
+    @property
+    def a(self) -> float:
+        """Get/set the semi-major axes of the ellipse."""
+        return self._a
+
+    @a.setter
+    def a(self, value: float) -> None:
+        self._a = value
+        self._update_vertices()
+
+    @property
+    def b(self) -> float:
+        """Get/set the semi-minor axes of the ellipse."""
+        return self._b
+
+    @b.setter
+    def b(self, value: float) -> None:
+        self._b = value
+        self._update_vertices()
+
+
+class SDFRoundedRectangle(SDFShapeBase):
+    """A :py:class:`RoundedRectangle` drawn with a signed distance field.
+
+    See :py:class:`SDFShapeBase`. Unlike :py:class:`RoundedRectangle`, the
+    corners are circular: each corner has a single radius.
+    """
+
+    __contains__ = RoundedRectangle.__contains__
+    _sdf_shape = _SDF_ROUNDED_BOX
+
+    def __init__(
+            self,
+            x: float, y: float,
+            width: float, height: float,
+            radius: float | tuple[float, float, float, float],
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            border: float = 0.0,
+            border_color: tuple[int, int, int, int] | tuple[int, int, int] = (100, 100, 100),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an SDF rectangle with rounded corners.
+
+        The rectangle's anchor point defaults to the ``(x, y)``
+        coordinates, which are at the bottom left.
+
+        Args:
+            x:
+                The X coordinate of the rectangle.
+            y:
+                The Y coordinate of the rectangle.
+            width:
+                The width of the rectangle.
+            height:
+                The height of the rectangle.
+            radius:
+                One or four radii of the rounded corners. Four radii are given
+                clockwise: bottom-left, top-left, top-right, bottom-right.
+                Radii are limited to half of the shorter side.
+            color:
+                The RGB or RGBA color of the rectangle.
+            border:
+                The thickness of the border. Defaults to ``0.0``, for no border.
+            border_color:
+                The RGB color of the border.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._width = width
+        self._height = height
+        self._radius = self._get_radii(radius)
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(border, border_color, blend_src, blend_dest, batch, group, program)
+
+    @staticmethod
+    def _get_radii(radius: float | tuple[float, float, float, float]) -> tuple[float, float, float, float]:
+        if isinstance(radius, (int, float)):
+            return (radius,) * 4
+        if len(radius) != 4:
+            msg = f"Expected a radius for each of the 4 corners, got {len(radius)}."
+            raise ValueError(msg)
+        return tuple(radius)
+
+    def _get_box(self) -> tuple[float, float, float, float]:
+        return 0.0, 0.0, self._width, self._height
+
+    def _get_sdf_params(self) -> tuple[float, float, float, float]:
+        return self._radius
+
+    @property
+    def width(self) -> float:
+        """Get/set the width of the rectangle."""
+        return self._width
+
+    @width.setter
+    def width(self, value: float) -> None:
+        self._width = value
+        self._update_vertices()
+
+    @property
+    def height(self) -> float:
+        """Get/set the height of the rectangle."""
+        return self._height
+
+    @height.setter
+    def height(self, value: float) -> None:
+        self._height = value
+        self._update_vertices()
+
+    @property
+    def radius(self) -> tuple[float, float, float, float]:
+        """Get/set the radii of the corners.
+
+        Radii are returned clockwise: bottom-left, top-left, top-right,
+        bottom-right. A single value sets all four.
+        """
+        return self._radius
+
+    @radius.setter
+    def radius(self, value: float | tuple[float, float, float, float]) -> None:
+        self._radius = self._get_radii(value)
+        self._update_vertices()
+
+
+class SDFArc(SDFShapeBase):
+    """An :py:class:`Arc` drawn with a signed distance field.
+
+    See :py:class:`SDFShapeBase`. Unlike :py:class:`Arc`, the ends of an
+    open arc are rounded, and arcs cannot be closed with a line. Changing
+    the angles only updates the shape's record, so arcs can be animated
+    freely, such as for progress indicators.
+    """
+
+    _sdf_shape = _SDF_ARC
+
+    def __init__(
+            self,
+            x: float, y: float,
+            radius: float,
+            angle: float = 360.0,
+            start_angle: float = 0.0,
+            thickness: float = 1.0,
+            color: tuple[int, int, int, int] | tuple[int, int, int] = (255, 255, 255, 255),
+            border: float = 0.0,
+            border_color: tuple[int, int, int, int] | tuple[int, int, int] = (100, 100, 100),
+            blend_src: int = GL_SRC_ALPHA,
+            blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+            batch: Batch | None = None,
+            group: Group | None = None,
+            program: ShaderProgram | None = None,
+    ) -> None:
+        """Create an SDF arc.
+
+        The arc's anchor point ``(x, y)`` defaults to its center.
+
+        Args:
+            x:
+                X coordinate of the arc's center.
+            y:
+                Y coordinate of the arc's center.
+            radius:
+                The radius of the middle of the arc's line.
+            angle:
+                The angle of the arc, in degrees. Defaults to 360.0, which is
+                a full circle.
+            start_angle:
+                The start angle of the arc, in degrees. Defaults to 0.
+            thickness:
+                The thickness of the arc's line.
+            color:
+                The RGB or RGBA color of the arc.
+            border:
+                The thickness of the border. Defaults to ``0.0``, for no border.
+            border_color:
+                The RGB color of the border.
+            blend_src:
+                OpenGL blend source mode; for example, ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example, ``GL_ONE_MINUS_SRC_ALPHA``.
+            batch:
+                Optional batch to add the shape to.
+            group:
+                Optional parent group of the shape.
+            program:
+                Optional shader program of the shape.
+        """
+        self._x = x
+        self._y = y
+        self._radius = radius
+        self._angle = angle
+        self._start_angle = start_angle
+        self._thickness = thickness
+        r, g, b, *a = color
+        self._rgba = r, g, b, a[0] if a else 255
+        super().__init__(border, border_color, blend_src, blend_dest, batch, group, program)
+
+    def _get_box(self) -> tuple[float, float, float, float]:
+        outer_radius = self._radius + self._thickness / 2
+        return -outer_radius, -outer_radius, outer_radius * 2, outer_radius * 2
+
+    def _get_sdf_params(self) -> tuple[float, float, float, float]:
+        return self._radius, self._thickness, self._start_angle, self._angle
+
+    @property
+    def radius(self) -> float:
+        """Get/set the radius of the arc."""
+        return self._radius
+
+    @radius.setter
+    def radius(self, value: float) -> None:
+        self._radius = value
+        self._update_vertices()
+
+    @property
+    def thickness(self) -> float:
+        """Get/set the thickness of the arc's line."""
+        return self._thickness
+
+    @thickness.setter
+    def thickness(self, value: float) -> None:
+        self._thickness = value
+        self._update_vertices()
+
+    @property
+    def angle(self) -> float:
+        """Get/set the angle of the arc, in degrees."""
+        return self._angle
+
+    @angle.setter
+    def angle(self, value: float) -> None:
+        self._angle = value
+        self._update_vertices()
+
+    @property
+    def start_angle(self) -> float:
+        """Get/set the start angle of the arc, in degrees."""
+        return self._start_angle
+
+    @start_angle.setter
+    def start_angle(self, angle: float) -> None:
+        self._start_angle = angle
+        self._update_vertices()
+
+
 __all__ = ('Arc', 'Box', 'BezierCurve', 'Circle', 'Ellipse', 'Line', 'MultiLine', 'Rectangle',
-           'BorderedRectangle', 'Triangle', 'Star', 'Polygon', 'Sector', 'ShapeBase')
+           'BorderedRectangle', 'Triangle', 'Star', 'Polygon', 'Sector', 'ShapeBase',
+           'InstancedShapeBase', 'InstancedCircle', 'InstancedEllipse', 'InstancedRectangle', 'InstancedSector',
+           'SDFShapeBase', 'SDFCircle', 'SDFEllipse', 'SDFRoundedRectangle', 'SDFArc')
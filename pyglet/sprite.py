@@ -66,31 +66,25 @@ sprites within batches.
 """
 from __future__ import annotations
 
+import array
+import math
 import sys
 import warnings
-from typing import TYPE_CHECKING, ClassVar, Literal
+import weakref
+from typing import TYPE_CHECKING, ClassVar, Hashable, Literal, Sequence
 
 import pyglet
 from pyglet import clock, event, graphics, image
-from pyglet.gl import (
-    GL_BLEND,
-    GL_ONE_MINUS_SRC_ALPHA,
-    GL_SRC_ALPHA,
-    GL_TEXTURE0,
-    GL_TRIANGLES,
-    glActiveTexture,
-    glBindTexture,
-    glBlendFunc,
-    glDisable,
-    glEnable,
-)
+from pyglet.gl import GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA, GL_TRIANGLES
+from pyglet.graphics.state import get_state_cache, tracks_state
 
 _is_pyglet_doc_run = hasattr(sys, "is_pyglet_doc_run") and sys.is_pyglet_doc_run
 
 if TYPE_CHECKING:
     from pyglet.graphics import Batch, Group
     from pyglet.graphics.shader import ShaderProgram
-    from pyglet.image import AbstractImage, Animation, Texture
+    from pyglet.graphics.vertexdomain import IndexedVertexDomain, IndexedVertexList
+    from pyglet.image import AbstractImage, Animation, Texture, TextureArray
 
 vertex_source: str = """#version 150 core
     in vec3 translate;
@@ -107,6 +101,7 @@ vertex_source: str = """#version 150 core
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     mat4 m_scale = mat4(1.0);
@@ -159,6 +154,77 @@ fragment_array_source: str = """#version 150 core
 """
 
 
+#: The most frames an animation of a :py:class:`ShaderAnimatedSprite` can have.
+#: This is the length of the ``frame_ends`` uniform of ``animated_vertex_source``.
+_max_animation_frames = 128
+
+animated_vertex_source: str = """#version 150 core
+    in vec3 translate;
+    in vec4 colors;
+    in vec3 tex_coords;
+    in vec2 scale;
+    in vec3 position;
+    in float rotation;
+    in float anim_start;
+    in float anim_frame;
+
+    out vec4 vertex_colors;
+    out vec3 texture_coords;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+        float time;
+    } window;
+
+    // The time at which each frame ends, from the start of the animation:
+    uniform float frame_ends[128];
+    uniform int frame_count;
+    uniform int looping;
+
+    mat4 m_scale = mat4(1.0);
+    mat4 m_rotation = mat4(1.0);
+    mat4 m_translate = mat4(1.0);
+
+    float get_frame()
+    {
+        // A frame that is not negative is paused:
+        if (anim_frame >= 0.0) {
+            return anim_frame;
+        }
+        float elapsed = window.time - anim_start;
+        if (looping != 0) {
+            elapsed = mod(elapsed, frame_ends[frame_count - 1]);
+        }
+        for (int i = 0; i < frame_count; i++) {
+            if (elapsed < frame_ends[i]) {
+                return float(i);
+            }
+        }
+        return float(frame_count - 1);
+    }
+
+    void main()
+    {
+        m_scale[0][0] = scale.x;
+        m_scale[1][1] = scale.y;
+        m_translate[3][0] = translate.x;
+        m_translate[3][1] = translate.y;
+        m_translate[3][2] = translate.z;
+        m_rotation[0][0] =  cos(-radians(rotation));
+        m_rotation[0][1] =  sin(-radians(rotation));
+        m_rotation[1][0] = -sin(-radians(rotation));
+        m_rotation[1][1] =  cos(-radians(rotation));
+
+        gl_Position = window.projection * window.view * m_translate * m_rotation * m_scale * vec4(position, 1.0);
+
+        vertex_colors = colors;
+        texture_coords = vec3(tex_coords.xy, get_frame());
+    }
+"""
+
+
 def get_default_shader() -> ShaderProgram:
     """Create and return the default sprite shader.
 
@@ -177,6 +243,16 @@ def get_default_array_shader() -> ShaderProgram:
                                                     (fragment_array_source, 'fragment'))
 
 
+def get_default_animated_shader() -> ShaderProgram:
+    """Create and return the default shader of :py:class:`~pyglet.sprite.ShaderAnimatedSprite`.
+
+    This method allows the module to be imported without an OpenGL Context.
+    """
+    return pyglet.gl.current_context.create_program((animated_vertex_source, 'vertex'),
+                                                    (fragment_array_source, 'fragment'))
+
+
+@tracks_state
 class SpriteGroup(graphics.Group):
     """Shared Sprite rendering Group.
 
@@ -213,21 +289,22 @@ class SpriteGroup(graphics.Group):
         self.program = program
 
     def set_state(self) -> None:
-        self.program.use()
-
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(self.texture.target, self.texture.id)
-
-        glEnable(GL_BLEND)
-        glBlendFunc(self.blend_src, self.blend_dest)
+        state_cache = get_state_cache()
+        state_cache.use_program(self.program.id)
+        state_cache.bind_texture(self.texture.target, self.texture.id)
+        state_cache.enable_blend(self.blend_src, self.blend_dest)
 
     def unset_state(self) -> None:
-        glDisable(GL_BLEND)
-        self.program.stop()
+        state_cache = get_state_cache()
+        state_cache.disable_blend()
+        state_cache.stop_program()
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.texture})"
 
+    def state_key(self) -> Hashable:
+        return self.program.id, self.texture.target, self.texture.id, self.blend_src, self.blend_dest
+
     def __eq__(self, other: SpriteGroup) -> bool:
         return (other.__class__ is self.__class__ and
                 self.program is other.program and
@@ -243,6 +320,54 @@ class SpriteGroup(graphics.Group):
                      self.blend_src, self.blend_dest))
 
 
+@tracks_state
+class AnimatedSpriteGroup(SpriteGroup):
+    """Shared rendering Group of :py:class:`~pyglet.sprite.ShaderAnimatedSprite`.
+
+    In addition to the state of a :py:class:`SpriteGroup`, the frame timing
+    of the animation in ``texture`` is set on the program. Each animation has
+    its own texture array, so groups with equal textures have equal timing.
+    """
+
+    def __init__(self, texture: TextureArray, frame_ends: Sequence[float], looping: bool,
+                 blend_src: int, blend_dest: int, program: ShaderProgram, parent: Group | None = None) -> None:
+        """Create an animated sprite group.
+
+        Args:
+            texture:
+                The texture array holding one frame of the animation per layer.
+            frame_ends:
+                The time at which each frame ends, from the start of the
+                animation.
+            looping:
+                If the animation starts over after the last frame.
+            blend_src:
+                OpenGL blend source mode; for example,
+                ``GL_SRC_ALPHA``.
+            blend_dest:
+                OpenGL blend destination mode; for example,
+                ``GL_ONE_MINUS_SRC_ALPHA``.
+            program:
+                A ShaderProgram with the uniforms of :py:data:`animated_vertex_source`.
+            parent:
+                Optional parent group.
+        """
+        super().__init__(texture, blend_src, blend_dest, program, parent)
+        self.frame_ends = frame_ends
+        self.looping = looping
+
+    def set_state(self) -> None:
+        super().set_state()
+        frame_ends = list(self.frame_ends)
+        frame_ends.extend([0.0] * (_max_animation_frames - len(frame_ends)))
+        # The program is already current, and equal values are not uploaded again:
+        self.program.set_uniforms({
+            'frame_ends': frame_ends,
+            'frame_count': len(self.frame_ends),
+            'looping': int(self.looping),
+        })
+
+
 class Sprite(event.EventDispatcher):
     """Manipulate an on-screen image.
 
@@ -250,6 +375,7 @@ class Sprite(event.EventDispatcher):
     """
 
     _batch = None
+    _batch_tracks_bounds = False
     _animation = None
     _frame_index = 0
     _paused = False
@@ -260,6 +386,7 @@ class Sprite(event.EventDispatcher):
     _scale_y = 1.0
     _visible = True
     _vertex_list = None
+    _animation_controller = None
 
     #: Default class used to create the rendering group.
     group_class: ClassVar[type[SpriteGroup | Group]] = SpriteGroup
@@ -272,7 +399,8 @@ class Sprite(event.EventDispatcher):
                  batch: Batch | None = None,
                  group: Group | None = None,
                  subpixel: bool = False,
-                 program: ShaderProgram | None = None) -> None:
+                 program: ShaderProgram | None = None,
+                 animation_controller: AnimationController | None = None) -> None:
         """Create a Sprite instance.
 
         Args:
@@ -300,20 +428,24 @@ class Sprite(event.EventDispatcher):
             program:
                 A specific shader program to initialize the sprite with. By default, a pre-made shader will be chosen
                 based on the texture type passed.
+            animation_controller:
+                Advance the sprite's animations with this controller, rather
+                than scheduling each frame change on the clock.
 
         .. versionadded:: 2.0.16
            The *program* parameter.
+
+        .. versionadded:: 2.1.16
+           The *animation_controller* parameter.
         """
         self._x = x
         self._y = y
         self._z = z
+        self._animation_controller = animation_controller
 
         if isinstance(img, image.Animation):
             self._animation = img
             self._texture = img.frames[0].image.get_texture()
-            self._next_dt = img.frames[0].duration
-            if self._next_dt:
-                clock.schedule_once(self._animate, self._next_dt)
         else:
             self._texture = img.get_texture()
 
@@ -325,6 +457,7 @@ class Sprite(event.EventDispatcher):
 
         self._program = program
         self._batch = batch
+        self._batch_tracks_bounds = self._tracks_bounds(batch)
         self._blend_src = blend_src
         self._blend_dest = blend_dest
         self._user_group = group
@@ -332,9 +465,13 @@ class Sprite(event.EventDispatcher):
         self._subpixel = subpixel
         self._create_vertex_list()
 
+        if self._animation is not None:
+            self._start_animation()
+
     def __del__(self) -> None:
         try:
             if self._vertex_list is not None:
+                self._remove_bounds()
                 self._vertex_list.delete()
         except Exception:  # noqa: BLE001, S110
             pass
@@ -347,7 +484,8 @@ class Sprite(event.EventDispatcher):
         finalizer as soon as the sprite falls out of scope.
         """
         if self._animation:
-            clock.unschedule(self._animate)
+            self._stop_animation()
+        self._remove_bounds()
         self._vertex_list.delete()
         self._vertex_list = None
         self._texture = None
@@ -374,6 +512,21 @@ class Sprite(event.EventDispatcher):
         else:
             self.dispatch_event('on_animation_end')
 
+    def _start_animation(self) -> None:
+        """Start advancing the animation from the current frame."""
+        if self._animation_controller is not None:
+            self._animation_controller._attach(self)  # noqa: SLF001
+            return
+        self._next_dt = self._animation.frames[self._frame_index].duration
+        if self._next_dt:
+            clock.schedule_once(self._animate, self._next_dt)
+
+    def _stop_animation(self) -> None:
+        if self._animation_controller is not None:
+            self._animation_controller._detach(self)  # noqa: SLF001
+        else:
+            clock.unschedule(self._animate)
+
     @property
     def blend_mode(self) -> tuple[int, int]:
         """The current blend mode applied to this sprite.
@@ -416,6 +569,7 @@ class Sprite(event.EventDispatcher):
             return
 
         # Recreate vertex list.
+        self._remove_bounds()
         self._vertex_list.delete()
         self._create_vertex_list()
 
@@ -438,9 +592,13 @@ class Sprite(event.EventDispatcher):
         if batch is not None and self._batch is not None:
             self._batch.migrate(self._vertex_list, GL_TRIANGLES, self._group, batch)
             self._batch = batch
+            self._batch_tracks_bounds = self._tracks_bounds(batch)
+            self._update_bounds()
         else:
+            self._remove_bounds()
             self._vertex_list.delete()
             self._batch = batch
+            self._batch_tracks_bounds = self._tracks_bounds(batch)
             self._create_vertex_list()
 
     @property
@@ -475,22 +633,21 @@ class Sprite(event.EventDispatcher):
     @image.setter
     def image(self, img: AbstractImage | Animation) -> None:
         if self._animation is not None:
-            clock.unschedule(self._animate)
+            self._stop_animation()
             self._animation = None
 
         if isinstance(img, image.Animation):
             self._animation = img
             self._frame_index = 0
             self._set_texture(img.frames[0].image.get_texture())
-            self._next_dt = img.frames[0].duration
-            if self._next_dt:
-                clock.schedule_once(self._animate, self._next_dt)
+            self._start_animation()
         else:
             self._set_texture(img.get_texture())
         self._update_position()
 
     def _set_texture(self, texture: Texture) -> None:
         if texture.id is not self._texture.id:
+            self._remove_bounds()
             self._vertex_list.delete()
             self._texture = texture
             self._group = self.get_sprite_group()
@@ -508,6 +665,7 @@ class Sprite(event.EventDispatcher):
             scale=('f', (self._scale * self._scale_x, self._scale * self._scale_y) * 4),
             rotation=('f', (self._rotation,) * 4),
             tex_coords=('f', self._texture.tex_coords))
+        self._update_bounds()
 
     def _get_vertices(self) -> tuple:
         if not self._visible:
@@ -527,6 +685,49 @@ class Sprite(event.EventDispatcher):
 
     def _update_position(self) -> None:
         self._vertex_list.position[:] = self._get_vertices()
+        self._update_bounds()
+
+    @staticmethod
+    def _tracks_bounds(batch: Batch | None) -> bool:
+        """Check if a batch needs the bounding boxes or sort keys of its sprites."""
+        return batch is not None and (batch.culling or batch.sort_by is not None)
+
+    def _update_bounds(self) -> None:
+        """Report the bounding box of the sprite to its batch, if it culls, and its sort key, if it sorts."""
+        if not self._batch_tracks_bounds:
+            return
+        batch = self._batch
+        if batch.sort_by is not None:
+            batch.set_sort_key(self._vertex_list, batch.get_sort_key(self._x, self._y, self._z))
+        if not batch.culling:
+            return
+
+        img = self._texture
+        scale_x = self._scale * self._scale_x
+        scale_y = self._scale * self._scale_y
+        x1 = -img.anchor_x * scale_x
+        y1 = -img.anchor_y * scale_y
+        x2 = x1 + img.width * scale_x
+        y2 = y1 + img.height * scale_y
+
+        if self._rotation:
+            # Rotate the corners clockwise, as the shader does.
+            angle = -math.radians(self._rotation)
+            cos = math.cos(angle)
+            sin = math.sin(angle)
+            xs = [x * cos - y * sin for x in (x1, x2) for y in (y1, y2)]
+            ys = [x * sin + y * cos for x in (x1, x2) for y in (y1, y2)]
+            x1, x2, y1, y2 = min(xs), max(xs), min(ys), max(ys)
+        else:
+            x1, x2 = min(x1, x2), max(x1, x2)
+            y1, y2 = min(y1, y2), max(y1, y2)
+
+        batch.set_bounds(self._vertex_list, self._x + x1, self._y + y1, x2 - x1, y2 - y1)
+
+    def _remove_bounds(self) -> None:
+        if self._batch_tracks_bounds:
+            self._batch.remove_bounds(self._vertex_list)
+            self._batch.remove_sort_key(self._vertex_list)
 
     def get_sprite_group(self) -> SpriteGroup | Group:
         """Creates and returns a group to be used to render the sprite.
@@ -549,6 +750,7 @@ class Sprite(event.EventDispatcher):
     def position(self, position: tuple[float, float, float]) -> None:
         self._x, self._y, self._z = position
         self._vertex_list.translate[:] = position * 4
+        self._update_bounds()
 
     @property
     def x(self) -> float:
@@ -559,6 +761,7 @@ class Sprite(event.EventDispatcher):
     def x(self, x: float) -> None:
         self._x = x
         self._vertex_list.translate[:] = (x, self._y, self._z) * 4
+        self._update_bounds()
 
     @property
     def y(self) -> float:
@@ -569,6 +772,7 @@ class Sprite(event.EventDispatcher):
     def y(self, y: float) -> None:
         self._y = y
         self._vertex_list.translate[:] = (self._x, y, self._z) * 4
+        self._update_bounds()
 
     @property
     def z(self) -> float:
@@ -579,6 +783,7 @@ class Sprite(event.EventDispatcher):
     def z(self, z: float) -> None:
         self._z = z
         self._vertex_list.translate[:] = (self._x, self._y, z) * 4
+        self._update_bounds()
 
     @property
     def rotation(self) -> float:
@@ -593,6 +798,7 @@ class Sprite(event.EventDispatcher):
     def rotation(self, rotation: float) -> None:
         self._rotation = rotation
         self._vertex_list.rotation[:] = (self._rotation,) * 4
+        self._update_bounds()
 
     @property
     def scale(self) -> float:
@@ -607,6 +813,7 @@ class Sprite(event.EventDispatcher):
     def scale(self, scale: float) -> None:
         self._scale = scale
         self._vertex_list.scale[:] = (scale * self._scale_x, scale * self._scale_y) * 4
+        self._update_bounds()
 
     @property
     def scale_x(self) -> float:
@@ -621,6 +828,7 @@ class Sprite(event.EventDispatcher):
     def scale_x(self, scale_x: float) -> None:
         self._scale_x = scale_x
         self._vertex_list.scale[:] = (self._scale * scale_x, self._scale * self._scale_y) * 4
+        self._update_bounds()
 
     @property
     def scale_y(self) -> float:
@@ -635,6 +843,7 @@ class Sprite(event.EventDispatcher):
     def scale_y(self, scale_y: float) -> None:
         self._scale_y = scale_y
         self._vertex_list.scale[:] = (self._scale * self._scale_x, self._scale * scale_y) * 4
+        self._update_bounds()
 
     def update(self, x: float | None = None, y: float | None = None, z: float | None = None,
                rotation: float | None = None, scale: float | None = None,
@@ -703,6 +912,8 @@ class Sprite(event.EventDispatcher):
         if scales_outdated:
             self._vertex_list.scale[:] = (self._scale * self._scale_x, self._scale * self._scale_y) * 4
 
+        self._update_bounds()
+
     @property
     def width(self) -> float:
         """Scaled width of the sprite.
@@ -803,12 +1014,9 @@ class Sprite(event.EventDispatcher):
         if not hasattr(self, '_animation') or pause == self._paused:
             return
         if pause is True:
-            clock.unschedule(self._animate)
+            self._stop_animation()
         else:
-            frame = self._animation.frames[self._frame_index]
-            self._next_dt = frame.duration
-            if self._next_dt:
-                clock.schedule_once(self._animate, self._next_dt)
+            self._start_animation()
         self._paused = pause
 
     @property
@@ -863,3 +1071,623 @@ class Sprite(event.EventDispatcher):
 
 
 Sprite.register_event_type('on_animation_end')
+
+
+class _AnimationTrack:
+    """The sprites showing one animation in step, and the time left on their frame."""
+    __slots__ = 'animation', 'frame_index', 'remaining', 'sprites'
+
+    def __init__(self, animation: Animation, frame_index: int) -> None:
+        self.animation = animation
+        self.frame_index = frame_index
+        self.remaining = animation.frames[frame_index].duration
+        # Used as an ordered set:
+        self.sprites: dict[Sprite, None] = {}
+
+    def add(self, sprite: Sprite) -> None:
+        if sprite._frame_index != self.frame_index:  # noqa: SLF001
+            sprite.frame_index = self.frame_index
+        self.sprites[sprite] = None
+
+    def advance(self, dt: float) -> bool:
+        """Advance time, and show the new frame if it changed. Returns ``False`` once the animation has ended."""
+        if self.remaining is None:
+            return False
+        self.remaining -= dt
+        if self.remaining > 0:
+            return True
+
+        frames = self.animation.frames
+        index = self.frame_index
+        for _ in range(len(frames)):
+            index += 1
+            if index >= len(frames):
+                index = 0
+                self._dispatch_end(index)
+            duration = frames[index].duration
+            if duration is None:
+                self.remaining = None
+                break
+            self.remaining += duration
+            if self.remaining > 0:
+                break
+        else:
+            # Far behind, or the frames have no duration. Don't try to catch up.
+            self.remaining = frames[index].duration
+
+        self.frame_index = index
+        self._show(index)
+        if self.remaining is None:
+            # As in `Sprite._animate`, the end is dispatched once the last frame is shown:
+            self._dispatch_end(index)
+            return False
+        return True
+
+    def _dispatch_end(self, index: int) -> None:
+        # Handlers may delete sprites, or change their image:
+        for sprite in list(self.sprites):
+            sprite._frame_index = index  # noqa: SLF001
+            sprite.dispatch_event('on_animation_end')
+
+    def _show(self, index: int) -> None:
+        texture = self.animation.frames[index].image.get_texture()
+        starts_by_domain = {}
+        for sprite in self.sprites:
+            sprite._frame_index = index  # noqa: SLF001
+            vertex_list = sprite._vertex_list  # noqa: SLF001
+            # Instanced sprites share their texture coordinates, and must detach first:
+            shared = isinstance(vertex_list, graphics.vertexdomain.SharedVertexList)
+            if shared or texture.id != sprite._texture.id:  # noqa: SLF001
+                sprite._set_texture(texture)  # noqa: SLF001
+                continue
+            sprite._texture = texture  # noqa: SLF001
+            try:
+                starts_by_domain[vertex_list.domain].append(vertex_list.start)
+            except KeyError:
+                starts_by_domain[vertex_list.domain] = [vertex_list.start]
+
+        # Frames in the same texture, as from an atlas, only change texture coordinates:
+        if starts_by_domain:
+            tex_coords = array.array('f', texture.tex_coords)
+            for domain, starts in starts_by_domain.items():
+                domain.set_attribute_bulk('tex_coords', starts, tex_coords * len(starts))
+
+
+class AnimationController:
+    """Advances the animations of many sprites from a single scheduled function.
+
+    Each animated :py:class:`Sprite` normally schedules every frame change on
+    the clock. With thousands of sprites, the clock's schedule becomes the
+    main cost of animating them. Sprites created with an
+    ``animation_controller``, or added to one, are instead advanced by the
+    controller once per clock tick.
+
+    Sprites sharing an :py:class:`~pyglet.image.Animation` in one controller
+    play it in step: a sprite that is added or unpaused joins at the frame
+    the others are showing. When the frames share a texture, such as frames
+    from an atlas, the texture coordinates of all sprites showing the
+    animation are updated together. Use separate controllers for sprites
+    that should play the same animation out of step.
+
+    ``on_animation_end`` is still dispatched for each sprite.
+
+    .. versionadded:: 2.1.16
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self._tracks: dict[Animation, _AnimationTrack] = {}
+
+    def add(self, sprite: Sprite) -> None:
+        """Advance the animations of a sprite with this controller.
+
+        Passing ``animation_controller`` when creating the sprite is faster, as
+        the sprite never schedules itself on the clock.
+        """
+        if sprite._animation_controller is self:  # noqa: SLF001
+            return
+        animating = sprite._animation is not None and not sprite._paused  # noqa: SLF001
+        if animating:
+            sprite._stop_animation()  # noqa: SLF001
+        sprite._animation_controller = self  # noqa: SLF001
+        if animating:
+            self._attach(sprite)
+
+    def remove(self, sprite: Sprite) -> None:
+        """Stop advancing the animations of a sprite, which then schedules them itself."""
+        if sprite._animation_controller is not self:  # noqa: SLF001
+            return
+        animating = sprite._animation is not None and not sprite._paused  # noqa: SLF001
+        if animating:
+            self._detach(sprite)
+        sprite._animation_controller = None  # noqa: SLF001
+        if animating:
+            sprite._start_animation()  # noqa: SLF001
+
+    def __len__(self) -> int:
+        return sum(len(track.sprites) for track in self._tracks.values())
+
+    def _attach(self, sprite: Sprite) -> None:
+        animation = sprite._animation  # noqa: SLF001
+        track = self._tracks.get(animation)
+        if track is None:
+            if animation.frames[sprite._frame_index].duration is None:  # noqa: SLF001
+                return  # Stopped on its final frame.
+            if not self._tracks:
+                clock.schedule(self._update)
+            track = self._tracks[animation] = _AnimationTrack(animation, sprite._frame_index)  # noqa: SLF001
+        track.add(sprite)
+
+    def _detach(self, sprite: Sprite) -> None:
+        track = self._tracks.get(sprite._animation)  # noqa: SLF001
+        if track is None:
+            return
+        track.sprites.pop(sprite, None)
+        if not track.sprites:
+            self._remove_track(track)
+
+    def _remove_track(self, track: _AnimationTrack) -> None:
+        if self._tracks.get(track.animation) is track:
+            del self._tracks[track.animation]
+            if not self._tracks:
+                clock.unschedule(self._update)
+
+    def _update(self, dt: float) -> None:
+        for track in list(self._tracks.values()):
+            if not track.advance(dt):
+                self._remove_track(track)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(tracks={len(self._tracks)}, sprites={len(self)})"
+
+
+class SpriteBatchView:
+    """Many sprites of one image, with their state kept in contiguous arrays.
+
+    Moving thousands of :py:class:`Sprite` objects each frame is dominated
+    by the cost of setting their attributes one by one. A sprite batch view
+    instead owns flat arrays of the ``positions``, ``rotations``, ``scales``
+    and ``colors`` of all of its sprites. Change the arrays in place, then
+    call :py:meth:`update` to write them to the vertex buffers, one pass per
+    attribute::
+
+        view = SpriteBatchView(ball_image, 10000, batch=batch)
+        for i in range(len(view)):
+            view.positions[i * 3] = i % 100 * 10
+
+        def update(dt):
+            positions = view.positions
+            positions[1::3] = array.array('f', (y - dt * 10 for y in positions[1::3]))
+            view.update('positions')
+
+    The arrays support the buffer protocol, so they can also be wrapped by
+    NumPy without copying, as in ``numpy.frombuffer(view.positions, 'f4')``.
+
+    The sprites are not culled or sorted by their batch, and have no
+    animation. Use :py:class:`Sprite` for individual sprites.
+
+    .. versionadded:: 2.1.16
+    """
+    #: Flat array of ``x, y, z`` for each sprite.
+    positions: array.array
+    #: Clockwise rotation of each sprite, in degrees.
+    rotations: array.array
+    #: Flat array of the ``scale_x, scale_y`` of each sprite.
+    scales: array.array
+    #: Flat array of the ``r, g, b, a`` of each sprite, from 0 to 255.
+    colors: array.array
+
+    _attributes: ClassVar[dict[str, tuple[str, int]]] = {
+        # array name: (vertex attribute, components)
+        'positions': ('translate', 3),
+        'rotations': ('rotation', 1),
+        'scales': ('scale', 2),
+        'colors': ('colors', 4),
+    }
+
+    def __init__(self,
+                 img: AbstractImage,
+                 count: int,
+                 blend_src: int = GL_SRC_ALPHA,
+                 blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+                 batch: Batch | None = None,
+                 group: Group | None = None,
+                 program: ShaderProgram | None = None) -> None:
+        """Create a number of sprites, all at the origin.
+
+        Args:
+            img:
+                Image to display.
+            count:
+                The number of sprites.
+            blend_src:
+                OpenGL blend source mode.
+            blend_dest:
+                OpenGL blend destination mode.
+            batch:
+                Optional batch to add the sprites to.
+            group:
+                Optional parent group of the sprites.
+            program:
+                A specific shader program to draw the sprites with. By default, a
+                pre-made shader will be chosen based on the texture type passed.
+        """
+        texture = img.get_texture()
+        if not program:
+            if isinstance(img, image.TextureArrayRegion):
+                program = get_default_array_shader()
+            else:
+                program = get_default_shader()
+
+        self.positions = array.array('f', bytes(4 * 3 * count))
+        self.rotations = array.array('f', bytes(4 * count))
+        self.scales = array.array('f', [1.0]) * (2 * count)
+        self.colors = array.array('B', [255]) * (4 * count)
+
+        x1 = -texture.anchor_x
+        y1 = -texture.anchor_y
+        x2 = x1 + texture.width
+        y2 = y1 + texture.height
+
+        self._count = count
+        self._group = Sprite.group_class(texture, blend_src, blend_dest, program, group)
+        self._vertex_lists = program.vertex_lists_indexed(
+            count, 4, GL_TRIANGLES, [0, 1, 2, 0, 2, 3], batch, self._group,
+            position=('f', (x1, y1, 0, x2, y1, 0, x2, y2, 0, x1, y2, 0)),
+            colors=('Bn', self._expand(self.colors, 4)),
+            translate=('f', self._expand(self.positions, 3)),
+            scale=('f', self._expand(self.scales, 2)),
+            rotation=('f', self._expand(self.rotations, 1)),
+            tex_coords=('f', texture.tex_coords))
+
+        self._generation = None
+        self._contiguous = False
+        self._draw_key = None
+        self._draw_regions = {}
+
+    @property
+    def vertex_lists(self) -> list[IndexedVertexList]:
+        """The vertex list of each sprite. Read-only."""
+        return self._vertex_lists
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _expand(values: array.array, components: int) -> array.array:
+        """Repeat the components of each sprite for its four vertices."""
+        stride = components * 4
+        result = array.array(values.typecode, bytes(values.itemsize * len(values) * 4))
+        for component in range(components):
+            column = values[component::components]
+            for vertex in range(4):
+                result[vertex * components + component::stride] = column
+        return result
+
+    def _is_contiguous(self) -> bool:
+        # Vertex lists only move when their domain's allocations change:
+        domain = self._vertex_lists[0].domain
+        generation = domain.allocator.generation
+        if generation != self._generation:
+            self._generation = generation
+            first = self._vertex_lists[0].start
+            self._contiguous = all(vertex_list.domain is domain and vertex_list.start == first + i * 4
+                                   for i, vertex_list in enumerate(self._vertex_lists))
+        return self._contiguous
+
+    def update(self, *names: str) -> None:
+        """Write the arrays to the vertex buffers.
+
+        Args:
+            names:
+                The arrays to write: any of ``'positions'``, ``'rotations'``,
+                ``'scales'`` and ``'colors'``. Defaults to all of them.
+        """
+        if not self._count:
+            return
+
+        vertex_lists = self._vertex_lists
+        domain = vertex_lists[0].domain
+        contiguous = self._is_contiguous()
+        for name in names or self._attributes:
+            attribute, components = self._attributes[name]
+            data = self._expand(getattr(self, name), components)
+            if contiguous:
+                domain.set_attribute_region(attribute, vertex_lists[0].start, self._count * 4, data)
+            else:
+                for vertex_list, start in zip(vertex_lists, range(0, len(data), components * 4)):
+                    vertex_list.set_attribute_data(attribute, data[start:start + components * 4])
+
+    def set_sprite(self, index: int, x: float | None = None, y: float | None = None, z: float | None = None,
+                   rotation: float | None = None, scale_x: float | None = None, scale_y: float | None = None,
+                   color: Sequence[int] | None = None) -> None:
+        """Change the arrays for one sprite. Call :py:meth:`update` to apply the changes.
+
+        Args:
+            index:
+                The index of the sprite.
+            x:
+                New X coordinate.
+            y:
+                New Y coordinate.
+            z:
+                New Z coordinate.
+            rotation:
+                New clockwise rotation, in degrees.
+            scale_x:
+                New horizontal scale.
+            scale_y:
+                New vertical scale.
+            color:
+                New RGB or RGBA color, from 0 to 255.
+        """
+        if x is not None:
+            self.positions[index * 3] = x
+        if y is not None:
+            self.positions[index * 3 + 1] = y
+        if z is not None:
+            self.positions[index * 3 + 2] = z
+        if rotation is not None:
+            self.rotations[index] = rotation
+        if scale_x is not None:
+            self.scales[index * 2] = scale_x
+        if scale_y is not None:
+            self.scales[index * 2 + 1] = scale_y
+        if color is not None:
+            self.colors[index * 4:index * 4 + len(color)] = array.array('B', color)
+
+    def delete(self) -> None:
+        """Remove all of the sprites from video memory."""
+        for vertex_list in self._vertex_lists:
+            vertex_list.delete()
+        self._vertex_lists = []
+        self._count = 0
+
+    def _get_draw_regions(self) -> dict[IndexedVertexDomain, tuple[list[int], list[int]]]:
+        # As for `_is_contiguous`, the regions only change with the allocations of the domain:
+        domain = self._vertex_lists[0].domain
+        key = domain, domain.index_allocator.generation
+        if key != self._draw_key:
+            self._draw_key = key
+            regions = {}
+            for vertex_list in sorted(self._vertex_lists, key=lambda vl: (id(vl.domain), vl.index_start)):
+                starts, sizes = regions.setdefault(vertex_list.domain, ([], []))
+                start, size = vertex_list.index_start, vertex_list.index_count
+                # Adjacent sprites are drawn as one region:
+                if starts and starts[-1] + sizes[-1] == start:
+                    sizes[-1] += size
+                else:
+                    starts.append(start)
+                    sizes.append(size)
+            self._draw_regions = regions
+        return self._draw_regions
+
+    def draw(self) -> None:
+        """Draw the sprites, if they are not in a batch.
+
+        The sprites are drawn in a single call, or one per domain if some
+        were moved to another.
+        """
+        if not self._count:
+            return
+
+        regions = self._get_draw_regions()
+        self._group.set_state_recursive()
+        for domain, (starts, sizes) in regions.items():
+            domain.commit()
+            domain.draw_regions(GL_TRIANGLES, starts, sizes)
+        self._group.unset_state_recursive()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(count={self._count})"
+
+
+# The texture array and frame timing of each animation shown by a ShaderAnimatedSprite:
+_animation_arrays: weakref.WeakKeyDictionary[Animation, tuple[TextureArray, tuple[float, ...], bool]] = \
+    weakref.WeakKeyDictionary()
+
+
+def _get_animation_array(animation: Animation) -> tuple[TextureArray, tuple[float, ...], bool]:
+    """Get the texture array, frame end times and looping of an animation, uploading it once."""
+    try:
+        return _animation_arrays[animation]
+    except KeyError:
+        pass
+
+    frames = animation.frames
+    if len(frames) > _max_animation_frames:
+        msg = f"ShaderAnimatedSprite supports animations of up to {_max_animation_frames} frames, not {len(frames)}."
+        raise ValueError(msg)
+    images = [frame.image.get_image_data() for frame in frames]
+    width, height = images[0].width, images[0].height
+    if any(img.width != width or img.height != height for img in images):
+        msg = "All frames of an animation shown by a ShaderAnimatedSprite must be the same size."
+        raise ValueError(msg)
+
+    texture_array = image.TextureArray.create(width, height, max_depth=len(images))
+    texture_array.allocate(*images)
+
+    frame_ends = []
+    end = 0.0
+    for frame in frames:
+        end += frame.duration or 0.0
+        frame_ends.append(end)
+    # Animations ending on a frame without duration stay on it:
+    looping = frames[-1].duration is not None and end > 0.0
+
+    result = _animation_arrays[animation] = texture_array, tuple(frame_ends), looping
+    return result
+
+
+class ShaderAnimatedSprite(Sprite):
+    """A sprite whose Animation is advanced by the vertex shader.
+
+    The frames of the animation are uploaded once into a
+    :py:class:`~pyglet.image.TextureArray`, shared by all sprites showing that
+    animation. Each sprite only stores the time its animation started, and
+    the vertex shader picks the frame from ``window.time``, so advancing
+    the animation costs no CPU time at all, however many sprites there are::
+
+        sprites = [ShaderAnimatedSprite(explosion, x=x, y=y, batch=batch) for x, y in positions]
+
+    Sprites showing the same animation share a group, and are drawn together.
+    The shader reads ``window.time``, which is updated by
+    :py:meth:`~pyglet.window.Window.draw`.
+
+    All frames must be the same size, and an animation can have at most 128
+    frames. Only Animations can be shown, and ``on_animation_end`` is not
+    dispatched, as the end of an animation is only known to the GPU.
+
+    .. versionadded:: 2.1.16
+    """
+
+    #: Default class used to create the rendering group.
+    group_class: ClassVar[type[AnimatedSpriteGroup]] = AnimatedSpriteGroup
+
+    # The shader time the animation started at, and the paused frame, or -1.0 if playing:
+    _anim_start = 0.0
+    _anim_frame = -1.0
+
+    def __init__(self,
+                 img: Animation,
+                 x: float = 0, y: float = 0, z: float = 0,
+                 blend_src: int = GL_SRC_ALPHA,
+                 blend_dest: int = GL_ONE_MINUS_SRC_ALPHA,
+                 batch: Batch | None = None,
+                 group: Group | None = None,
+                 subpixel: bool = False,
+                 program: ShaderProgram | None = None) -> None:
+        """Create a sprite showing an Animation.
+
+        Args:
+            img:
+                The Animation to show. The frames are uploaded to a texture
+                array the first time the animation is used.
+            x:
+                X coordinate of the sprite.
+            y:
+                Y coordinate of the sprite.
+            z:
+                Z coordinate of the sprite.
+            blend_src:
+                OpenGL blend source mode.  The default is suitable for
+                compositing sprites drawn from back-to-front.
+            blend_dest:
+                OpenGL blend destination mode.  The default is suitable for
+                compositing sprites drawn from back-to-front.
+            batch:
+                Optional batch to add the sprite to.
+            group:
+                Optional parent group of the sprite.
+            subpixel:
+                Allow floating-point coordinates for the sprite. By default,
+                coordinates are restricted to integer values.
+            program:
+                A specific shader program to initialize the sprite with. By
+                default, :py:func:`get_default_animated_shader` is used.
+        """
+        if not isinstance(img, image.Animation):
+            msg = f"ShaderAnimatedSprite can only show an Animation, not {img}."
+            raise TypeError(msg)
+        self._set_animation_array(img)
+        super().__init__(img, x, y, z, blend_src, blend_dest, batch, group, subpixel,
+                         program or get_default_animated_shader())
+
+    def _set_animation_array(self, animation: Animation) -> None:
+        self._array, self._frame_ends, self._looping = _get_animation_array(animation)
+
+    def get_sprite_group(self) -> AnimatedSpriteGroup:
+        """Creates and returns a group to be used to render the sprite.
+
+        The group holds the texture array and frame timing of the animation.
+        """
+        return self.group_class(self._array, self._frame_ends, self._looping,
+                                self._blend_src, self._blend_dest, self._program, self._user_group)
+
+    def _create_vertex_list(self) -> None:
+        self._vertex_list = self.program.vertex_list_indexed(
+            4, GL_TRIANGLES, [0, 1, 2, 0, 2, 3], self._batch, self._group,
+            position=('f', self._get_vertices()),
+            colors=('Bn', self._rgba * 4),
+            translate=('f', (self._x, self._y, self._z) * 4),
+            scale=('f', (self._scale * self._scale_x, self._scale * self._scale_y) * 4),
+            rotation=('f', (self._rotation,) * 4),
+            tex_coords=('f', self._array.items[0].tex_coords),
+            anim_start=('f', (self._anim_start,) * 4),
+            anim_frame=('f', (self._anim_frame,) * 4))
+        self._update_bounds()
+
+    def _write_animation(self) -> None:
+        if self._vertex_list is not None:
+            self._vertex_list.anim_start[:] = (self._anim_start,) * 4
+            self._vertex_list.anim_frame[:] = (self._anim_frame,) * 4
+
+    def _get_current_frame(self) -> int:
+        """Get the frame shown now, computed as the shader does."""
+        if self._anim_frame >= 0.0:
+            return int(self._anim_frame)
+        frame_ends = self._frame_ends
+        elapsed = pyglet.window.get_shader_time() - self._anim_start
+        if self._looping:
+            elapsed %= frame_ends[-1]
+        for i, end in enumerate(frame_ends):
+            if elapsed < end:
+                return i
+        return len(frame_ends) - 1
+
+    def _start_animation(self) -> None:
+        """Play the animation from the start of the current frame."""
+        frame_start = self._frame_ends[self._frame_index - 1] if self._frame_index else 0.0
+        self._anim_start = pyglet.window.get_shader_time() - frame_start
+        self._anim_frame = -1.0
+        self._write_animation()
+
+    def _stop_animation(self) -> None:
+        """Keep showing the current frame."""
+        self._frame_index = self._get_current_frame()
+        self._anim_frame = float(self._frame_index)
+        self._write_animation()
+
+    @property
+    def image(self) -> Animation:
+        """The Animation to display.
+
+        .. note:: Changing this uploads the frames of the new animation, if
+                  no other sprite has shown it yet.
+        """
+        return self._animation
+
+    @image.setter
+    def image(self, img: Animation) -> None:
+        if not isinstance(img, image.Animation):
+            msg = f"ShaderAnimatedSprite can only show an Animation, not {img}."
+            raise TypeError(msg)
+        self._set_animation_array(img)
+        self._animation = img
+        self._texture = img.frames[0].image.get_texture()
+        self._frame_index = 0
+        self._anim_frame = 0.0 if self._paused else -1.0
+        self._remove_bounds()
+        self._vertex_list.delete()
+        self._group = self.get_sprite_group()
+        self._create_vertex_list()
+        if not self._paused:
+            self._start_animation()
+
+    @property
+    def frame_index(self) -> int:
+        """The current Animation frame.
+
+        The frame is computed from the time the animation started, as the
+        shader does. Setting it shows that frame immediately, and plays on
+        from there unless the sprite is paused.
+        """
+        return self._get_current_frame()
+
+    @frame_index.setter
+    def frame_index(self, index: int) -> None:
+        self._frame_index = max(0, min(index, len(self._animation.frames) - 1))
+        if self._paused:
+            self._anim_frame = float(self._frame_index)
+            self._write_animation()
+        else:
+            self._start_animation()
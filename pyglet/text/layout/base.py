@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 import re
 import sys
 from abc import ABC, abstractmethod
@@ -8,6 +9,7 @@ from typing import (
     Any,
     Callable,
     ClassVar,
+    Hashable,
     Iterator,
     Pattern,
     Protocol,
@@ -17,22 +19,16 @@ import pyglet
 from pyglet import graphics
 from pyglet.font.base import GlyphPosition
 from pyglet.gl import (
-    GL_BLEND,
     GL_DEPTH_ATTACHMENT,
     GL_DEPTH_COMPONENT,
     GL_LINES,
     GL_NEAREST,
     GL_ONE_MINUS_SRC_ALPHA,
     GL_SRC_ALPHA,
-    GL_TEXTURE0,
     GL_TRIANGLES,
-    glActiveTexture,
-    glBindTexture,
-    glBlendFunc,
-    glDisable,
-    glEnable,
 )
 from pyglet.graphics import Group
+from pyglet.graphics.state import get_state_cache, tracks_state
 from pyglet.text import runlist
 
 if TYPE_CHECKING:
@@ -65,6 +61,7 @@ layout_vertex_source = """#version 330 core
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     void main()
@@ -152,6 +149,7 @@ decoration_vertex_source = """#version 330 core
     {
         mat4 projection;
         mat4 view;
+        float time;
     } window;
 
     void main()
@@ -751,6 +749,7 @@ class _InvalidRange:
         return self.end > self.start
 
 
+@tracks_state
 class TextLayoutGroup(graphics.Group):
     """Create a text layout rendering group.
 
@@ -765,22 +764,24 @@ class TextLayoutGroup(graphics.Group):
         self.program = program
 
     def set_state(self) -> None:
-        self.program.use()
+        state_cache = get_state_cache()
+        state_cache.use_program(self.program.id)
         self.program["scissor"] = False
 
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(self.texture.target, self.texture.id)
-
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        state_cache.bind_texture(self.texture.target, self.texture.id)
+        state_cache.enable_blend(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
     def unset_state(self) -> None:
-        glDisable(GL_BLEND)
-        self.program.stop()
+        state_cache = get_state_cache()
+        state_cache.disable_blend()
+        state_cache.stop_program()
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.texture})"
 
+    def state_key(self) -> Hashable:
+        return self.program.id, self.texture.target, self.texture.id
+
     def __eq__(self, other: object) -> bool:
         return (other.__class__ is self.__class__ and
                 self.parent is other.parent and
@@ -793,6 +794,7 @@ class TextLayoutGroup(graphics.Group):
         return hash((id(self.parent), self.program.id, self.order, self.texture.target, self.texture.id))
 
 
+@tracks_state
 class TextDecorationGroup(Group):
     """Create a text decoration rendering group.
 
@@ -806,15 +808,16 @@ class TextDecorationGroup(Group):
         self.program = program
 
     def set_state(self) -> None:
-        self.program.use()
+        state_cache = get_state_cache()
+        state_cache.use_program(self.program.id)
         self.program["scissor"] = False
 
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        state_cache.enable_blend(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
     def unset_state(self) -> None:
-        glDisable(GL_BLEND)
-        self.program.stop()
+        state_cache = get_state_cache()
+        state_cache.disable_blend()
+        state_cache.stop_program()
 
 
 # Just have one object for empty positions in layout. It won't be modified.
@@ -1021,6 +1024,7 @@ class TextLayout:
         if self._batch == batch:
             return
 
+        self._remove_bounds()
         if batch is None:
             self._batch = graphics.Batch()
             self._own_batch = True
@@ -1112,6 +1116,7 @@ class TextLayout:
     def _update_rotation(self) -> None:
         for box in self._boxes:
             box.update_rotation(self._rotation)
+        self._update_bounds()
 
     @property
     def position(self) -> tuple[float, float, float]:
@@ -1133,6 +1138,33 @@ class TextLayout:
     def _update_translation(self) -> None:
         for box in self._boxes:
             box.update_translation(self._x, self._y, self._z)
+        self._update_bounds()
+
+    def _update_bounds(self) -> None:
+        """Report the bounding box of the layout to its batch, if it culls."""
+        batch = self._batch
+        if not self._vertex_lists or not batch.culling:
+            return
+
+        left = self._anchor_left
+        bottom = self._anchor_bottom
+        right = left + max(self._content_width, self._width or 0)
+        top = bottom + max(self._content_height, self._height or 0)
+        if self._rotation:
+            # Any rotation around the position stays within this radius:
+            radius = max(math.hypot(x, y) for x in (left, right) for y in (bottom, top))
+            left = bottom = -radius
+            right = top = radius
+
+        x = self._x + left
+        y = self._y + bottom
+        for vertex_list in self._vertex_lists:
+            batch.set_bounds(vertex_list, x, y, right - left, top - bottom)
+
+    def _remove_bounds(self) -> None:
+        if self._vertex_lists and self._batch.culling:
+            for vertex_list in self._vertex_lists:
+                self._batch.remove_bounds(vertex_list)
 
     def _update_anchor(self) -> None:
         self._anchor_left = self._get_left_anchor()
@@ -1146,6 +1178,8 @@ class TextLayout:
                 box.update_anchor(acc_anchor_x, anchor_y)
                 acc_anchor_x += box.advance
 
+        self._update_bounds()
+
     @property
     def visible(self) -> bool:
         """True if the layout will be visible when drawn."""
@@ -1385,6 +1419,7 @@ class TextLayout:
 
     def delete(self) -> None:
         """Deletes all vertices and boxes associated with the layout."""
+        self._remove_bounds()
         for box in self._boxes:
             box.delete(self)
 
@@ -1450,6 +1485,7 @@ class TextLayout:
         if not self._update_enabled:
             return
 
+        self._remove_bounds()
         for box in self._boxes:
             box.delete(self)
 
@@ -1483,6 +1519,8 @@ class TextLayout:
             self._boxes.extend(line.boxes)
             self._create_vertex_lists(line.x, line.y, self._anchor_left, anchor_top, line.start, line.boxes, context)
 
+        self._update_bounds()
+
     def _update_color(self, start: int, end: int) -> None:
         # This function usually is only called by Labels/HTML when updating just colors.
         colors_iter = self._document.get_style_runs("color")
@@ -3,17 +3,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, ClassVar
 
 from pyglet import graphics
-from pyglet.gl import (
-    GL_BLEND,
-    GL_ONE_MINUS_SRC_ALPHA,
-    GL_SRC_ALPHA,
-    GL_TEXTURE0,
-    glActiveTexture,
-    glBindTexture,
-    glBlendFunc,
-    glDisable,
-    glEnable,
-)
+from pyglet.gl import GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA
+from pyglet.graphics.state import get_state_cache, tracks_state
 from pyglet.text.layout.base import TextLayout
 
 if TYPE_CHECKING:
@@ -24,6 +15,7 @@ if TYPE_CHECKING:
     from pyglet.text.document import AbstractDocument
 
 
+@tracks_state
 class ScrollableTextLayoutGroup(graphics.Group):
     """Default rendering group for :py:class:`~pyglet.text.layout.ScrollableTextLayout`.
 
@@ -41,19 +33,18 @@ class ScrollableTextLayoutGroup(graphics.Group):
         self.program = program
 
     def set_state(self) -> None:
-        self.program.use()
+        state_cache = get_state_cache()
+        state_cache.use_program(self.program.id)
         self.program["scissor"] = True
         self.program["scissor_area"] = self.scissor_area
 
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(self.texture.target, self.texture.id)
-
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        state_cache.bind_texture(self.texture.target, self.texture.id)
+        state_cache.enable_blend(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
     def unset_state(self) -> None:
-        glDisable(GL_BLEND)
-        self.program.stop()
+        state_cache = get_state_cache()
+        state_cache.disable_blend()
+        state_cache.stop_program()
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.texture})"
@@ -65,6 +56,7 @@ class ScrollableTextLayoutGroup(graphics.Group):
         return id(self)
 
 
+@tracks_state
 class ScrollableTextDecorationGroup(graphics.Group):
     """Create a text decoration rendering group.
 
@@ -79,16 +71,17 @@ class ScrollableTextDecorationGroup(graphics.Group):
         self.program = program
 
     def set_state(self) -> None:
-        self.program.use()
+        state_cache = get_state_cache()
+        state_cache.use_program(self.program.id)
         self.program["scissor"] = True
         self.program["scissor_area"] = self.scissor_area
 
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        state_cache.enable_blend(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
     def unset_state(self) -> None:
-        glDisable(GL_BLEND)
-        self.program.stop()
+        state_cache = get_state_cache()
+        state_cache.disable_blend()
+        state_cache.stop_program()
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(scissor={self.scissor_area})"
@@ -90,6 +90,7 @@ above, "Working with multiple screens")::
 from __future__ import annotations
 
 import sys
+import time
 from abc import abstractmethod
 from collections import deque
 from typing import TYPE_CHECKING, Any, Callable, Sequence
@@ -111,6 +112,24 @@ if TYPE_CHECKING:
 
 _is_pyglet_doc_run = hasattr(sys, 'is_pyglet_doc_run') and sys.is_pyglet_doc_run
 
+_shader_time_origin = time.perf_counter()
+
+
+def get_shader_time() -> float:
+    """Get the current time, as set in ``window.time`` of the ``WindowBlock``.
+
+    This is the number of seconds since pyglet.window was imported. Shaders
+    read the time as a 32-bit float, so it is kept small to stay precise:
+    a raw :py:func:`time.perf_counter` may already be too large to resolve
+    a single frame.
+
+    Use this for timestamps that are compared with ``window.time`` in a
+    shader, such as the start time of an animation.
+
+    .. versionadded:: 2.1.16
+    """
+    return time.perf_counter() - _shader_time_origin
+
 
 class WindowException(Exception):
     """The root exception for all window-related errors."""
@@ -411,6 +430,8 @@ class BaseWindow(EventDispatcher, metaclass=_WindowMetaclass):
 
     # Create a default ShaderProgram, so the Window instance can
     # update the `WindowBlock` UBO shared by all default shaders.
+    # It holds the per-frame globals: the projection & view matrices,
+    # and the time, which is updated once per frame.
     _default_vertex_source = """#version 150 core
         in vec4 position;
 
@@ -418,6 +439,7 @@ class BaseWindow(EventDispatcher, metaclass=_WindowMetaclass):
         {
             mat4 projection;
             mat4 view;
+            float time;
         } window;
 
         void main()
@@ -603,7 +625,8 @@ class BaseWindow(EventDispatcher, metaclass=_WindowMetaclass):
             shader.Shader(self._default_vertex_source, 'vertex'),
             shader.Shader(self._default_fragment_source, 'fragment'))
 
-        self.ubo = self._default_program.uniform_blocks['WindowBlock'].create_ubo()
+        manager = self.context.ubo_manager
+        self.ubo = manager.get_frame_ubo(self._default_program.uniform_blocks['WindowBlock'])
 
         self._viewport = 0, 0, *self.get_framebuffer_size()
 
@@ -707,12 +730,27 @@ class BaseWindow(EventDispatcher, metaclass=_WindowMetaclass):
         :py:meth:`~pyglet.window.Window.on_refresh`
         events. Finally, it calls the :py:meth:`~pyglet.window.Window.flip`
         method to swap the front and back OpenGL buffers.
+
+        Before dispatching the events, the ``time`` member of the
+        ``WindowBlock`` uniform block is set to :py:func:`get_shader_time`,
+        with a single upload shared by all shaders.
         """
         self.switch_to()
+        self.update_frame_globals()
         self.dispatch_event('on_draw')
         self.dispatch_event('on_refresh', dt)
         self.flip()
 
+    def update_frame_globals(self) -> None:
+        """Update the per-frame globals in the ``WindowBlock`` uniform block.
+
+        This is called by :py:meth:`~pyglet.window.Window.draw`. Call it
+        before drawing if you run your own loop, and your shaders use
+        ``window.time``.
+        """
+        with self.ubo as window_block:
+            window_block.time = get_shader_time()
+
     def draw_mouse_cursor(self) -> None:
         """Draw the custom mouse cursor.
 
@@ -1923,5 +1961,6 @@ __all__ = (
     "NoSuchDisplayException",
     "NoSuchConfigException",
     "MouseCursorException",
-
+    # functions
+    "get_shader_time",
 )
@@ -436,3 +436,107 @@ def test_mix_resize():
     for region in regions:
         allocator.dealloc(region)
     assert allocator.get_free_size() == allocator.capacity
+
+
+def test_generation_changes_on_modification():
+    allocator = allocation.Allocator(100)
+    generation = allocator.generation
+
+    start = allocator.alloc(10)
+    assert allocator.generation != generation
+    generation = allocator.generation
+
+    allocator.get_allocated_regions()
+    allocator.set_capacity(200)
+    assert allocator.generation == generation
+
+    start = allocator.realloc(start, 10, 20)
+    assert allocator.generation != generation
+    generation = allocator.generation
+
+    allocator.dealloc(start, 20)
+    assert allocator.generation != generation
+    generation = allocator.generation
+
+    # Zero sized operations do not change anything:
+    allocator.alloc(0)
+    allocator.dealloc(0, 0)
+    assert allocator.generation == generation
+
+
+def test_tracking_allocator_compact():
+    allocator = allocation.TrackingAllocator(100)
+    starts = [allocator.alloc(size) for size in (5, 3, 7, 2)]
+    allocator.dealloc(starts[0], 5)
+    allocator.dealloc(starts[2], 7)
+    generation = allocator.generation
+
+    moves = allocator.compact()
+
+    assert moves == [(5, 0, 3), (15, 3, 2)]
+    assert allocator.get_allocated_regions() == ([0], [5])
+    assert allocator.regions == {0: 3, 3: 2}
+    assert allocator.generation != generation
+
+
+def test_tracking_allocator_realloc():
+    allocator = allocation.TrackingAllocator(100)
+    first = allocator.alloc(4)
+    second = allocator.alloc(4)
+
+    # Truncate, expand in place, and move:
+    allocator.realloc(second, 4, 2)
+    assert allocator.regions == {first: 4, second: 2}
+    allocator.realloc(second, 2, 6)
+    assert allocator.regions == {first: 4, second: 6}
+    new_first = allocator.realloc(first, 4, 8)
+    assert allocator.regions == {second: 6, new_first: 8}
+
+    allocator.realloc(new_first, 8, 0)
+    assert allocator.regions == {second: 6}
+    assert allocator.compact() == [(second, 0, 6)]
+
+
+def test_growth_policy_grow():
+    policy = allocation.GrowthPolicy()
+    assert policy.grow(16, 17) == 32
+    assert policy.grow(16, 100) == 128
+
+    # Geometric growth until a step reaches 64, then linear:
+    policy = allocation.GrowthPolicy(max_step=64)
+    assert policy.grow(16, 60) == 64
+    assert policy.grow(64, 65) == 128
+    assert policy.grow(128, 300) == 320
+
+
+def test_growth_policy_shrink():
+    assert allocation.GrowthPolicy().shrink(1024, 10) == 1024
+
+    policy = allocation.GrowthPolicy(shrink_threshold=0.25)
+    assert policy.shrink(1024, 300) == 1024
+    assert policy.shrink(1024, 100) == 256
+    assert policy.shrink(1024, 0) == 16
+    assert policy.shrink(16, 0) == 16
+
+
+def test_used_size():
+    allocator = allocation.Allocator(100)
+    assert allocator.get_used_size() == 0
+    first = allocator.alloc(10)
+    second = allocator.alloc(10)
+    assert allocator.get_used_size() == 20
+    allocator.dealloc(second, 10)
+    assert allocator.get_used_size() == 10
+    allocator.dealloc(first, 10)
+    assert allocator.get_used_size() == 0
+
+
+def test_tracking_allocator_split():
+    allocator = allocation.TrackingAllocator(100)
+    start = allocator.alloc(12)
+    allocator.split(start, 4, 3)
+    assert allocator.regions == {0: 4, 4: 4, 8: 4}
+
+    allocator.dealloc(4, 4)
+    assert allocator.compact() == [(8, 4, 4)]
+    assert allocator.regions == {0: 4, 4: 4}
@@ -0,0 +1,454 @@
+import array
+from ctypes import byref, c_float
+
+import pytest
+
+import pyglet
+from pyglet.gl import (
+    GL_BLEND,
+    GL_CURRENT_PROGRAM,
+    GL_DYNAMIC_DRAW,
+    GL_TRIANGLE_STRIP,
+    GL_TRIANGLES,
+    GLint,
+    glGetIntegerv,
+    glIsEnabled,
+)
+from pyglet.graphics import Batch, Group, ShaderGroup, get_default_shader, shader, state, vertexdomain
+from pyglet.graphics.stats import RenderStats
+
+
+class StateGroup(Group):
+    """A group setting a named state, which other groups may share."""
+
+    def __init__(self, name, order=0, parent=None):
+        super().__init__(order, parent)
+        self.name = name
+        self.calls = []
+
+    def set_state(self):
+        self.calls.append('set')
+
+    def unset_state(self):
+        self.calls.append('unset')
+
+    def state_key(self):
+        return self.name
+
+    def __eq__(self, other):
+        return (self.__class__ is other.__class__ and self.name == other.name and
+                self.order == other.order and self.parent == other.parent)
+
+    def __hash__(self):
+        return hash((self.name, self.order, self.parent))
+
+
+def _vertex_list(batch, group):
+    program = get_default_shader()
+    return program.vertex_list(3, GL_TRIANGLES, batch=batch, group=group,
+                               position=('f', (0, 0, 0, 1, 0, 0, 1, 1, 0)),
+                               colors=('f', (1, 1, 1, 1) * 3))
+
+
+def _opcodes(batch):
+    return [opcode for opcode, _, _ in batch._draw_commands]
+
+
+def test_draw_list_is_flat():
+    batch = Batch()
+    group = ShaderGroup(get_default_shader())
+    vlist = _vertex_list(batch, group)
+
+    batch.draw()
+
+    commit, set_state, draw, unset_state = batch._draw_commands
+    assert commit == (pyglet.graphics._CMD_COMMIT, vlist.domain, 0)
+    assert set_state == (pyglet.graphics._CMD_SET_STATE, group, 0)
+    assert draw == (pyglet.graphics._CMD_DRAW, vlist.domain, GL_TRIANGLES)
+    assert unset_state == (pyglet.graphics._CMD_UNSET_STATE, group, 0)
+    assert len(batch._draw_list) == len(batch._draw_commands)
+
+
+def test_draw_list_only_rebuilt_when_dirty():
+    batch = Batch()
+    _vertex_list(batch, ShaderGroup(get_default_shader()))
+
+    batch.draw()
+    draw_list = batch._draw_list
+    batch.draw()
+    assert batch._draw_list is draw_list
+
+    batch.invalidate()
+    batch.draw()
+    assert batch._draw_list is not draw_list
+
+
+def test_equal_adjacent_state_elided():
+    batch = Batch()
+    first = StateGroup('shared', order=0)
+    second = StateGroup('shared', order=1)
+    third = StateGroup('other', order=2)
+    for group in (first, second, third):
+        _vertex_list(batch, group)
+
+    batch.draw()
+
+    # The unset/set pair between `first` and `second` is redundant:
+    assert _opcodes(batch) == [
+        pyglet.graphics._CMD_COMMIT,
+        pyglet.graphics._CMD_COMMIT,
+        pyglet.graphics._CMD_COMMIT,
+        pyglet.graphics._CMD_SET_STATE,
+        pyglet.graphics._CMD_DRAW,
+        pyglet.graphics._CMD_DRAW,
+        pyglet.graphics._CMD_UNSET_STATE,
+        pyglet.graphics._CMD_SET_STATE,
+        pyglet.graphics._CMD_DRAW,
+        pyglet.graphics._CMD_UNSET_STATE,
+    ]
+    assert first.calls == ['set']
+    assert second.calls == ['unset']
+    assert third.calls == ['set', 'unset']
+
+
+def test_equal_adjacent_state_elided_in_children():
+    batch = Batch()
+    parents = [Group(order=0), Group(order=1)]
+    children = [StateGroup('shared', parent=parent) for parent in parents]
+    for child in children:
+        _vertex_list(batch, child)
+
+    batch.draw()
+
+    # The plain parents set no state, so the children become adjacent:
+    assert _opcodes(batch) == [
+        pyglet.graphics._CMD_COMMIT,
+        pyglet.graphics._CMD_COMMIT,
+        pyglet.graphics._CMD_SET_STATE,
+        pyglet.graphics._CMD_SET_STATE,
+        pyglet.graphics._CMD_DRAW,
+        pyglet.graphics._CMD_DRAW,
+        pyglet.graphics._CMD_UNSET_STATE,
+        pyglet.graphics._CMD_UNSET_STATE,
+    ]
+    assert children[0].calls == ['set']
+    assert children[1].calls == ['unset']
+
+
+def test_state_key_of_subclass_overriding_state():
+    class UniformGroup(ShaderGroup):
+        def set_state(self):
+            super().set_state()
+
+    program = get_default_shader()
+    assert state.get_state_key(ShaderGroup(program)) == program.id
+    assert state.get_state_key(Group()) == ()
+    # Subclasses setting more state than their base have no key of their own:
+    assert state.get_state_key(UniformGroup(program)) is None
+
+
+def _indexed_vertex_list(batch, color, position=(0, 0, 0, 1, 0, 0, 1, 1, 0)):
+    program = get_default_shader()
+    return program.vertex_list_indexed(3, GL_TRIANGLES, [0, 1, 2], batch=batch,
+                                       position=('f', position), colors=('f', color * 3))
+
+
+def test_instance_identical():
+    batch = Batch(instance_attributes=('colors',))
+    vlists = [_indexed_vertex_list(batch, (i / 10, 0, 0, 1)) for i in range(5)]
+    other = _indexed_vertex_list(batch, (1, 1, 1, 1), position=(0, 0, 0, 2, 0, 0, 2, 2, 0))
+    original_domain = other.domain
+
+    batch.instance_identical()
+    batch.draw()
+
+    domain = vlists[0].domain
+    assert isinstance(vlists[0], vertexdomain.SharedIndexedVertexList)
+    assert all(vlist.domain is domain for vlist in vlists)
+    assert domain._instances == 5
+    assert other.domain is original_domain
+    assert vlists[3].colors[:] == pytest.approx([0.3, 0, 0, 1] * 3)
+    assert vlists[3].indices == [0, 1, 2]
+
+    # Per-vertex data is accepted for instance attributes:
+    vlists[3].colors = (0, 1, 0, 1)
+    assert vlists[3].colors[:] == [0, 1, 0, 1] * 3
+    vlists[3].colors[:] = (1, 1, 0, 1) * 3
+    assert vlists[3].colors[:4] == [1, 1, 0, 1]
+
+    # Removing an instance moves the last one into its slot:
+    removed, last = domain._shared_lists[0], domain._shared_lists[-1]
+    color = last.colors[:]
+    removed.delete()
+    assert last.instance_index == 0
+    assert last.colors[:] == color
+    assert domain._instances == 4
+
+
+def test_instance_identical_detach():
+    batch = Batch(instance_attributes=('colors',))
+    vlists = [_indexed_vertex_list(batch, (i / 10, 0, 0, 1)) for i in range(3)]
+    batch.instance_identical()
+    domain = vlists[0].domain
+
+    # Writing the same shared data keeps the instance:
+    vlists[2].position = (0, 0, 0, 1, 0, 0, 1, 1, 0)
+    assert vlists[2].domain is domain
+
+    # Different shared data detaches it back into a regular domain:
+    vlists[2].position = (5, 5, 0, 6, 5, 0, 6, 6, 0)
+    assert type(vlists[2]) is not vertexdomain.SharedIndexedVertexList
+    assert vlists[2].domain is not domain
+    assert vlists[2].colors[:] == pytest.approx([0.2, 0, 0, 1] * 3)
+    assert list(vlists[2].position[:]) == [5, 5, 0, 6, 5, 0, 6, 6, 0]
+    assert vlists[2].indices == [0, 1, 2]
+
+    # Migrating detaches as well:
+    batch.migrate(vlists[0], GL_TRIANGLES, Group(), batch)
+    assert not isinstance(vlists[0], vertexdomain.SharedVertexList)
+
+    vlists[1].delete()
+    assert domain.is_empty
+    batch.draw()
+
+
+def test_culling_skips_vertex_lists_outside_viewport():
+    batch = Batch(culling=True, cull_cell_size=64)
+    program = get_default_shader()
+    vlists = []
+    for i in range(4):
+        x = i * 100
+        vlist = program.vertex_list_indexed(3, GL_TRIANGLES, [0, 1, 2], batch=batch,
+                                            position=('f', (x, 0, 0, x + 10, 0, 0, x + 10, 10, 0)),
+                                            colors=('f', (1, 1, 1, 1) * 3))
+        batch.set_bounds(vlist, x, 0, 10, 10)
+        vlists.append(vlist)
+    domain = vlists[0].domain
+
+    batch.viewport = (95, -5, 120, 20)
+    assert batch._get_visible_regions() == {domain: ([3], [6])}
+    batch.draw()
+
+    # A vertex list without bounds is always drawn:
+    batch.remove_bounds(vlists[3])
+    assert batch._get_visible_regions() == {domain: ([3], [9])}
+
+    batch.viewport = None
+    batch.draw()
+
+
+def test_culling_sprites_and_shapes():
+    batch = Batch(culling=True)
+    image = pyglet.image.SolidColorImagePattern((255, 255, 255, 255)).create_image(16, 16)
+    near = pyglet.sprite.Sprite(image, x=10, y=10, batch=batch)
+    far = pyglet.sprite.Sprite(image, x=1000, y=1000, batch=batch)
+    rectangle = pyglet.shapes.Rectangle(2000, 2000, 50, 20, batch=batch)
+
+    batch.viewport = (0, 0, 100, 100)
+    visible = batch._cull_grid.query(*batch.viewport)
+    assert visible == {near._vertex_list}
+
+    far.position = (50, 50, 0)
+    rectangle.rotation = 45
+    rectangle.position = (90, 90)
+    visible = batch._cull_grid.query(*batch.viewport)
+    assert visible == {near._vertex_list, far._vertex_list, rectangle._vertex_list}
+    batch.draw()
+
+    near.delete()
+    rectangle.delete()
+    assert len(batch._cull_grid) == 1
+
+
+def test_vertex_layout_is_shared():
+    batch = Batch()
+    group = ShaderGroup(get_default_shader())
+    first = _vertex_list(batch, group)
+    second = _vertex_list(batch, group)
+
+    layout = first.domain.attribute_meta
+    assert isinstance(layout, shader.VertexLayout)
+    assert second.domain is first.domain
+    assert list(batch.group_map[group]) == [(False, 0, GL_TRIANGLES, GL_DYNAMIC_DRAW, layout)]
+
+    # Equal metadata gives the same layout, and plain dicts still find the domain:
+    assert shader.VertexLayout({name: dict(meta) for name, meta in layout.items()}) is layout
+    assert layout.replace('colors', format='Bn') is not layout
+    attributes = {name: dict(meta) for name, meta in layout.items()}
+    assert batch.get_domain(False, False, GL_TRIANGLES, group, attributes) is first.domain
+
+
+def test_vertex_lists_bulk_create():
+    batch = Batch(compacting=True)
+    program = get_default_shader()
+    positions = array.array('f', [float(i) for i in range(5 * 9)])
+    vlists = program.vertex_lists_indexed(5, 3, GL_TRIANGLES, [0, 1, 2], batch=batch,
+                                          position=('f', positions), colors=('f', (1, 0, 0, 1) * 3))
+
+    domain = vlists[0].domain
+    assert [vlist.start for vlist in vlists] == [0, 3, 6, 9, 12]
+    assert all(vlist.domain is domain for vlist in vlists)
+    assert list(vlists[2].position) == [float(i) for i in range(18, 27)]
+    assert list(vlists[4].colors) == [1, 0, 0, 1] * 3
+    assert vlists[3].indices == [0, 1, 2]
+
+    # Each vertex list is still independent:
+    vlists[1].delete()
+    vlists[0].resize(4, 3)
+    batch.compact()
+    assert list(vlists[2].position) == [float(i) for i in range(18, 27)]
+    batch.draw()
+
+
+@pytest.mark.parametrize('make_array', [
+    lambda values: (c_float * len(values))(*values),
+    lambda values: array.array('f', values),
+])
+def test_vertex_lists_bulk_create_repeats_buffer(make_array):
+    batch = Batch()
+    program = get_default_shader()
+    position = [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 0.0]
+    vlists = program.vertex_lists(4, 3, GL_TRIANGLES, batch=batch,
+                                  position=('f', make_array(position)),
+                                  colors=('f', make_array([1.0, 0.0, 0.0, 1.0] * 3)))
+
+    assert len(vlists) == 4
+    for vlist in vlists:
+        assert list(vlist.position) == position
+        assert list(vlist.colors) == [1, 0, 0, 1] * 3
+    batch.draw()
+
+
+def test_state_cache_skips_shared_state():
+    batch = Batch()
+    pattern = pyglet.image.SolidColorImagePattern((255, 255, 255, 255))
+    sprites = [pyglet.sprite.Sprite(pattern.create_image(8, 8), batch=batch) for _ in range(2)]
+    assert sprites[0]._group != sprites[1]._group
+    # Groups with their own `set_state` are not tracked:
+    assert state.is_tracked(sprites[0]._group)
+    assert not state.is_tracked(StateGroup('custom'))
+
+    state_cache = state.get_state_cache()
+    batch.draw()
+    state_cache.reset_stats()
+    batch.draw()
+
+    # The second sprite group only binds its texture. Released state is reset at the end:
+    assert state_cache.skipped == 3
+    assert state_cache.calls == 8
+    assert not state_cache.active
+    assert not glIsEnabled(GL_BLEND)
+    program = GLint()
+    glGetIntegerv(GL_CURRENT_PROGRAM, byref(program))
+    assert program.value == 0
+
+
+def test_state_cache_skips_shared_state_under_plain_groups():
+    batch = Batch()
+    pattern = pyglet.image.SolidColorImagePattern((255, 255, 255, 255))
+    parents = [Group(order=0), Group(order=1)]
+    assert state.is_tracked(parents[0])
+    sprites = [pyglet.sprite.Sprite(pattern.create_image(8, 8), batch=batch, group=parent)
+               for parent in parents for _ in range(2)]
+
+    state_cache = state.get_state_cache()
+    batch.draw()
+    state_cache.reset_stats()
+    batch.draw()
+
+    # Plain parent groups set no state, so they do not flush the cache:
+    assert len(sprites) == 4
+    assert state_cache.skipped > 0
+    assert not glIsEnabled(GL_BLEND)
+
+def test_render_stats():
+    batch = Batch()
+    group = ShaderGroup(get_default_shader())
+    vlists = [_vertex_list(batch, group) for _ in range(3)]
+    batch.draw()
+
+    batch.stats = RenderStats()
+    vlists[1].delete()
+    vlists[2].colors[:4] = (0, 0, 0, 1)
+    batch.draw()
+    batch.draw()
+
+    stats = batch.stats
+    domain = vlists[0].domain
+    assert stats.frames == 2
+    # The deleted vertex list splits the domain into two regions, drawn with one multi-draw:
+    assert stats.draw_calls == 2
+    assert stats.multi_draw_calls == 2
+    assert stats.primcount == 4
+    assert stats.group_state_changes == 4
+    # Only the changed colors are uploaded, on the first draw:
+    assert stats.bytes_uploaded == 3 * 4 * 4
+    assert stats.upload_calls == 1
+    assert stats.fragmentation[domain] == domain.allocator.get_fragmentation() > 0
+    assert stats.draw_time > 0
+    assert stats.as_dict()['max_fragmentation'] == stats.fragmentation[domain]
+
+    stats.reset()
+    assert stats.frames == stats.draw_calls == stats.bytes_uploaded == 0
+
+
+def test_sorted_draw_order():
+    batch = Batch(sort_by='z')
+    batch.stats = RenderStats()
+    image = pyglet.image.SolidColorImagePattern((255, 255, 255, 128)).create_image(8, 8)
+    sprites = [pyglet.sprite.Sprite(image, z=z, batch=batch) for z in (2, 0, 1)]
+    domain = sprites[0]._vertex_list.domain
+    batch.draw()
+
+    order = batch._sort_orders[domain]
+    starts = [sprite._vertex_list.start for sprite in sprites]
+    # Each sprite's indices, ordered by z:
+    assert list(order.buffer.data[:18]) == [start + i for z_order in (1, 2, 0)
+                                            for start in (starts[z_order],) for i in (0, 1, 2, 0, 2, 3)]
+    assert batch.stats.draw_calls == 1
+
+    # Only the sprites that changed places are written again:
+    order.buffer.reset_stats()
+    sprites[1].z = 3
+    batch.draw()
+    assert [vertex_list for vertex_list, _, _ in order._written] == [sprites[i]._vertex_list for i in (2, 0, 1)]
+    assert order.buffer.bytes_uploaded == 3 * 6 * 4
+
+    # No changes, nothing is sorted or uploaded:
+    order.buffer.reset_stats()
+    batch.draw()
+    assert not order.dirty
+    assert order.buffer.bytes_uploaded == 0
+
+    sprites[2].delete()
+    batch.draw()
+    assert [vertex_list for vertex_list, _, _ in order._written] == [sprites[i]._vertex_list for i in (0, 1)]
+    assert sprites[2]._vertex_list is None
+
+
+def test_sorted_draw_order_skips_strips():
+    batch = Batch(sort_by='z')
+    program = get_default_shader()
+    strips = [program.vertex_list(4, GL_TRIANGLE_STRIP, batch=batch,
+                                  position=('f', (0, 0, z, 1, 0, z, 0, 1, z, 1, 1, z)),
+                                  colors=('f', (1, 1, 1, 1) * 4)) for z in (1, 0)]
+    triangle = _vertex_list(batch, None)
+    for z, strip in enumerate(strips):
+        batch.set_sort_key(strip, z)
+    batch.draw()
+
+    # Joining the strips would connect them, so each is still drawn as its own region:
+    domain = strips[0].domain
+    assert domain not in batch._sort_orders
+    assert triangle.domain in batch._sort_orders
+    assert (domain.draw_committed, (GL_TRIANGLE_STRIP,)) in batch._draw_list
+
+
+def test_sorted_draw_order_by_y():
+    batch = Batch(sort_by='y')
+    rectangles = [pyglet.shapes.Rectangle(0, y, 10, 10, batch=batch) for y in (0, 20, 10)]
+    batch.draw()
+
+    order = batch._sort_orders[rectangles[0]._vertex_list.domain]
+    # Lower shapes are drawn last:
+    assert order._order == [rectangles[i]._vertex_list for i in (1, 2, 0)]
@@ -1,3 +1,5 @@
+import struct
+
 import pytest
 
 import pyglet
@@ -541,3 +543,130 @@ def test_shader_uniform_float_array():
 
     assert test_data == fetched_data
 
+
+
+def test_shader_program_binary_cache(tmp_path, monkeypatch):
+    monkeypatch.setitem(pyglet.options, 'shader_cache_path', str(tmp_path))
+    if pyglet.graphics.shader._get_program_cache_file(()) is None:
+        pytest.skip("Program binaries are not supported by this context.")
+
+    vertex_source = """#version 150 core
+        in vec3 position;
+        uniform float scale;
+
+        void main()
+        {
+            gl_Position = vec4(position * scale, 1.0);
+        }
+    """
+    fragment_source = """#version 150 core
+        out vec4 final_colors;
+        uniform vec4 color;
+
+        void main()
+        {
+            final_colors = color;
+        }
+    """
+
+    def create_program():
+        return pyglet.graphics.shader.ShaderProgram(
+            pyglet.graphics.shader.Shader(vertex_source, "vertex"),
+            pyglet.graphics.shader.Shader(fragment_source, "fragment"),
+        )
+
+    first = create_program()
+    assert len(list(tmp_path.glob('*.bin'))) == 1
+
+    # The second program is loaded from the cache, without compiling the shaders:
+    vertex_shader = pyglet.graphics.shader.Shader(vertex_source, "vertex")
+    second = pyglet.graphics.shader.ShaderProgram(
+        vertex_shader, pyglet.graphics.shader.Shader(fragment_source, "fragment"),
+    )
+    assert vertex_shader._id is None
+    assert second.attributes == first.attributes
+    assert second.uniforms == first.uniforms
+
+    with second:
+        second['color'] = (0.25, 0.5, 0.75, 1.0)
+        assert second['color'] == pytest.approx((0.25, 0.5, 0.75, 1.0))
+
+    # A corrupt file is replaced:
+    cache_file, = tmp_path.glob('*.bin')
+    cache_file.write_bytes(b'{"version": 1, "format": 0, "attributes": {}, "uniforms": []}\ngarbage')
+    third = create_program()
+    assert third.uniforms == first.uniforms
+    assert not cache_file.read_bytes().endswith(b'garbage')
+
+
+def test_shader_uniform_redundant_set_skipped():
+    vertex_source = """#version 150 core
+        in vec3 position;
+        uniform float scale;
+        uniform float offsets[4];
+
+        void main()
+        {
+            gl_Position = vec4(position * scale + offsets[3], 1.0);
+        }
+    """
+    fragment_source = """#version 150 core
+        out vec4 final_colors;
+        uniform vec4 color;
+
+        void main()
+        {
+            final_colors = color;
+        }
+    """
+    program = pyglet.graphics.shader.ShaderProgram(
+        pyglet.graphics.shader.Shader(vertex_source, "vertex"),
+        pyglet.graphics.shader.Shader(fragment_source, "fragment"),
+    )
+    scale_location = program.uniforms['scale']['location']
+
+    program['scale'] = 2.0
+    # Change the value behind the shadow copy's back:
+    with program:
+        pyglet.gl.glUniform1f(scale_location, 3.0)
+    program['scale'] = 2.0
+    assert program['scale'] == 3.0
+    program['scale'] = 4.0
+    assert program['scale'] == 4.0
+
+    with program.uniform_updates() as uniforms:
+        uniforms['color'] = [0.5, 0.5, 0.5, 1.0]
+        uniforms['offsets'] = (1.0, 2.0, 3.0, 4.0)
+        uniforms['scale'] = 5.0
+    assert program['color'] == pytest.approx((0.5, 0.5, 0.5, 1.0))
+    assert program['offsets'][:] == (1.0, 2.0, 3.0, 4.0)
+    assert program['scale'] == 5.0
+
+    program.set_uniforms({'offsets': (1.0, 2.0, 3.0, 4.0), 'color': (1.0, 0.0, 0.0, 1.0)})
+    assert program['color'] == pytest.approx((1.0, 0.0, 0.0, 1.0))
+    program['offsets'][2] = 7.0
+    assert program['offsets'][:] == (1.0, 2.0, 7.0, 4.0)
+
+
+def test_window_block_frame_globals():
+    window = pyglet.window.Window(64, 64, visible=False)
+    try:
+        window.switch_to()
+        assert window.context.ubo_manager.frame_ubo is window.ubo
+
+        window.update_frame_globals()
+        frame_time = window.ubo.view.time
+        assert frame_time > 0
+
+        data = window.ubo.read()
+        offset = type(window.ubo.view).time.offset
+        assert struct.unpack_from('f', data, offset)[0] == pytest.approx(frame_time)
+
+        # Custom programs read the same globals from the reserved binding:
+        program = pyglet.graphics.shader.ShaderProgram(
+            pyglet.graphics.shader.Shader(window._default_vertex_source, "vertex"),
+            pyglet.graphics.shader.Shader(window._default_fragment_source, "fragment"),
+        )
+        assert program.uniform_blocks['WindowBlock'].binding == window.ubo.binding == 0
+    finally:
+        window.close()
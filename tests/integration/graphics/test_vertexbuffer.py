@@ -0,0 +1,99 @@
+import ctypes
+
+from pyglet.gl import GL_ARRAY_BUFFER, GLfloat, glBindBuffer, glGetBufferSubData
+from pyglet.graphics.vertexbuffer import BackedBufferObject
+
+
+def _create(floats):
+    return BackedBufferObject(floats * 4, GLfloat, 4, 1)
+
+
+def _gpu_contents(buffer):
+    data = (GLfloat * (buffer.size // 4))()
+    glBindBuffer(GL_ARRAY_BUFFER, buffer.id)
+    glGetBufferSubData(GL_ARRAY_BUFFER, 0, buffer.size, data)
+    return list(data)
+
+
+def test_scattered_changes_uploaded_separately():
+    buffer = _create(4096)
+    buffer.set_region(0, 4, [1] * 4)
+    buffer.set_region(4092, 4, [2] * 4)
+
+    buffer.commit()
+
+    assert buffer.upload_calls == 2
+    assert buffer.bytes_uploaded == 32
+    contents = _gpu_contents(buffer)
+    assert contents[:4] == [1] * 4
+    assert contents[-4:] == [2] * 4
+
+
+def test_nearby_changes_coalesced():
+    buffer = _create(4096)
+    buffer.set_region(8, 4, [1] * 4)
+    buffer.set_region(0, 4, [1] * 4)
+    buffer.set_region(4, 2, [1] * 2)
+
+    buffer.commit()
+
+    assert buffer.upload_calls == 1
+    assert buffer.bytes_uploaded == 48
+
+    buffer.reset_stats()
+    buffer.commit()
+    assert buffer.upload_calls == 0
+    assert buffer.bytes_uploaded == 0
+
+
+def test_full_upload_fallback():
+    buffer = _create(4096)
+    for start in range(0, 4096, 1024):
+        buffer.set_region(start, 900, [3] * 900)
+
+    buffer.commit()
+
+    assert buffer.upload_calls == 1
+    assert buffer.bytes_uploaded == buffer.size
+
+
+def test_too_many_ranges_uploaded_as_span():
+    buffer = _create(8192)
+    buffer.max_dirty_ranges = 2
+    for start in (0, 2048, 4096):
+        buffer.set_region(start, 1, [4])
+
+    buffer.commit()
+
+    assert buffer.upload_calls == 1
+    assert buffer.bytes_uploaded == 4097 * 4
+    assert _gpu_contents(buffer)[4096] == 4
+
+
+def test_scattered_changes_merged_as_made():
+    buffer = _create(8192)
+    buffer.max_dirty_ranges = 2
+    # Changes in descending order never extend the previous range:
+    for start in range(8000, 0, -100):
+        buffer.set_region(start, 1, [7])
+        assert len(buffer._dirty_ranges) <= 9
+
+    buffer.commit()
+
+    assert buffer.upload_calls == 1
+    assert _gpu_contents(buffer)[100] == 7
+    assert _gpu_contents(buffer)[8000] == 7
+
+
+def test_resize_clamps_dirty_ranges():
+    buffer = _create(64)
+    buffer.set_region(60, 4, [5] * 4)
+    buffer.resize(32 * 4)
+    buffer.commit()
+    assert buffer.bytes_uploaded == 0
+
+    buffer.set_region(0, 1, [6])
+    buffer.resize(64 * 4)
+    assert buffer._dirty_ranges == [[0, 4], [128, 256]]
+    buffer.commit()
+    assert _gpu_contents(buffer)[0] == 6
@@ -0,0 +1,277 @@
+import array
+from ctypes import byref
+
+import pytest
+
+from pyglet.gl import (
+    GL_ARRAY_BUFFER,
+    GL_DRAW_INDIRECT_BUFFER_BINDING,
+    GL_STREAM_DRAW,
+    GL_TRIANGLES,
+    GLfloat,
+    GLint,
+    glBindBuffer,
+    glGetBufferSubData,
+    glGetIntegerv,
+)
+from pyglet.graphics import Batch, Group, allocation, get_default_shader
+from pyglet.graphics.vertexbuffer import StreamingBufferObject
+
+
+def _create(batch, indexed=False):
+    program = get_default_shader()
+    data = {'position': ('f', (0, 0, 0, 1, 0, 0, 1, 1, 0)), 'colors': ('f', (1, 1, 1, 1) * 3)}
+    if indexed:
+        return program.vertex_list_indexed(3, GL_TRIANGLES, [0, 1, 2], batch=batch, **data)
+    return program.vertex_list(3, GL_TRIANGLES, batch=batch, **data)
+
+
+def test_draw_arguments_cached():
+    batch = Batch()
+    vlists = [_create(batch) for _ in range(3)]
+    domain = vlists[0].domain
+
+    batch.draw()
+    starts = domain._draw_starts
+    assert domain._draw_primcount == 1
+    assert list(domain._draw_sizes) == [9]
+
+    # No allocator changes, so the arrays are reused:
+    batch.draw()
+    assert domain._draw_starts is starts
+
+    vlists[1].delete()
+    batch.draw()
+    assert domain._draw_starts is not starts
+    assert domain._draw_primcount == 2
+    assert list(domain._draw_starts) == [0, 6]
+    assert list(domain._draw_sizes) == [3, 3]
+
+
+def test_indexed_draw_arguments_cached():
+    batch = Batch()
+    vlists = [_create(batch, indexed=True) for _ in range(3)]
+    domain = vlists[0].domain
+    # Without indirect drawing, multiple regions are drawn from client arrays:
+    domain._use_indirect = False
+
+    batch.draw()
+    starts = domain._draw_starts
+    assert domain._draw_primcount == 1
+
+    batch.draw()
+    assert domain._draw_starts is starts
+
+    vlists[1].delete()
+    batch.draw()
+    assert domain._draw_primcount == 2
+    assert list(domain._draw_sizes) == [3, 3]
+    assert domain._draw_offset == 0
+
+
+def test_indexed_draw_indirect():
+    batch = Batch()
+    vlists = [_create(batch, indexed=True) for _ in range(5)]
+    domain = vlists[0].domain
+    if not domain._use_indirect:
+        pytest.skip('glMultiDrawElementsIndirect is not supported.')
+
+    batch.draw()
+    assert domain._indirect_buffer is None
+
+    vlists[1].delete()
+    batch.draw()
+    indirect = domain._indirect_buffer
+    assert indirect.command_count == 2
+    assert list(indirect.data[:10]) == [3, 1, 0, 0, 0, 9, 1, 6, 0, 0]
+
+    # The indirect buffer is not left bound after drawing:
+    binding = GLint()
+    glGetIntegerv(GL_DRAW_INDIRECT_BUFFER_BINDING, byref(binding))
+    assert binding.value == 0
+
+    # Only the changed commands are uploaded again, and the first is kept:
+    indirect.reset_stats()
+    vlists[3].delete()
+    batch.draw()
+    assert indirect.command_count == 3
+    assert list(indirect.data[5:15]) == [3, 1, 6, 0, 0, 3, 1, 12, 0, 0]
+    assert indirect.bytes_uploaded == 2 * indirect.stride
+    assert indirect.upload_calls == 1
+
+    # No allocator changes, so nothing is uploaded:
+    indirect.reset_stats()
+    batch.draw()
+    assert indirect.bytes_uploaded == 0
+
+
+def _positions(vertex_list):
+    return list(vertex_list.position[:])
+
+
+def test_compact():
+    batch = Batch(compacting=True)
+    vlists = [_create(batch) for _ in range(20)]
+    domain = vlists[0].domain
+    for i, vlist in enumerate(vlists):
+        vlist.position[:] = [i] * 9
+
+    for vlist in vlists[:16:2]:
+        vlist.delete()
+    remaining = vlists[1:16:2] + vlists[16:]
+
+    batch.draw()
+    assert domain._draw_primcount > 1
+
+    batch.compact()
+    batch.draw()
+
+    assert domain._draw_primcount == 1
+    assert domain.allocator.capacity == 64
+    assert sorted(vlist.start for vlist in remaining) == list(range(0, 36, 3))
+    for vlist in remaining:
+        assert _positions(vlist) == [vlists.index(vlist)] * 9
+
+
+def test_compact_indexed():
+    batch = Batch(compacting=True)
+    vlists = [_create(batch, indexed=True) for _ in range(6)]
+    domain = vlists[0].domain
+    for i, vlist in enumerate(vlists):
+        vlist.position[:] = [i] * 9
+
+    for vlist in vlists[::2]:
+        vlist.delete()
+    remaining = vlists[1::2]
+
+    domain.compact()
+
+    assert domain.allocator.get_allocated_regions() == ([0], [9])
+    assert domain.index_allocator.get_allocated_regions() == ([0], [9])
+    for vlist in remaining:
+        assert vlist.indices == [0, 1, 2]
+        assert _positions(vlist) == [vlists.index(vlist)] * 9
+
+
+def test_resize_preserves_data():
+    batch = Batch()
+    vlists = [_create(batch) for _ in range(6)]
+    domain = vlists[0].domain
+    for i, vlist in enumerate(vlists):
+        vlist.position[:] = [i] * 9
+    assert domain.allocator.capacity == 32
+
+    domain.resize(256)
+    for buffer, _ in domain.buffer_attributes:
+        assert buffer.size == 256 * buffer.stride
+    for i, vlist in enumerate(vlists):
+        assert _positions(vlist) == [i] * 9
+
+
+def test_shrink_on_delete():
+    batch = Batch(growth_policy=allocation.GrowthPolicy(shrink_threshold=0.25))
+    vlists = [_create(batch, indexed=True) for _ in range(40)]
+    domain = vlists[0].domain
+    assert domain.allocator.capacity == 128
+    assert domain.index_allocator.capacity == 128
+
+    for vlist in vlists[:0:-1]:
+        vlist.delete()
+
+    assert domain.allocator.capacity == 16
+    assert domain.index_allocator.capacity == 16
+    assert _positions(vlists[0]) == [0, 0, 0, 1, 0, 0, 1, 1, 0]
+
+
+def test_default_policy_never_shrinks():
+    batch = Batch()
+    vlists = [_create(batch) for _ in range(40)]
+    domain = vlists[0].domain
+    for vlist in vlists[1:]:
+        vlist.delete()
+    assert domain.allocator.capacity == 128
+
+
+def test_streaming_domain():
+    program = get_default_shader()
+    batch = Batch()
+    dynamic = _create(batch)
+    vlist = program.vertex_list(3, GL_TRIANGLES, batch=batch, usage=GL_STREAM_DRAW,
+                                position=('f', (0, 0, 0, 1, 0, 0, 1, 1, 0)), colors=('f', (1, 1, 1, 1) * 3))
+    domain = vlist.domain
+    assert domain is not dynamic.domain
+    assert domain.usage == GL_STREAM_DRAW
+
+    buffer = domain.attrib_name_buffers['position']
+    assert isinstance(buffer, StreamingBufferObject)
+
+    # Each commit with changes moves on to the next section of the ring:
+    offsets = []
+    for i in range(4):
+        vlist.position[:] = [i] * 9
+        batch.draw()
+        offsets.append(buffer.ptr)
+    assert offsets == [buffer.size, buffer.size * 2, 0, buffer.size]
+
+    # Without changes, the current section is kept:
+    batch.draw()
+    assert buffer.ptr == buffer.size
+
+    # Streaming domains are kept on migration:
+    batch.migrate(vlist, GL_TRIANGLES, Group(), batch)
+    assert vlist.domain.usage == GL_STREAM_DRAW
+    assert _positions(vlist) == [3] * 9
+
+
+def test_streaming_domain_resize():
+    program = get_default_shader()
+    batch = Batch()
+    vlists = [program.vertex_list(3, GL_TRIANGLES, batch=batch, usage=GL_STREAM_DRAW,
+                                  position=('f', [i] * 9), colors=('f', (1, 1, 1, 1) * 3)) for i in range(20)]
+    domain = vlists[0].domain
+    assert domain.allocator.capacity == 64
+
+    batch.draw()
+    buffer = domain.attrib_name_buffers['position']
+    data = (GLfloat * (buffer.size // 4))()
+    glBindBuffer(GL_ARRAY_BUFFER, buffer.id)
+    glGetBufferSubData(GL_ARRAY_BUFFER, buffer.ptr, buffer.size, data)
+    for i, vlist in enumerate(vlists):
+        assert list(data[vlist.start * 3:vlist.start * 3 + 9]) == [i] * 9
+
+
+def test_set_attribute_bulk():
+    batch = Batch()
+    vlists = [_create(batch) for _ in range(4)]
+    domain = vlists[0].domain
+    batch.draw()
+
+    targets = [vlists[3], vlists[1]]
+    data = array.array('f', [1] * 9 + [2] * 9)
+    domain.set_attribute_bulk('position', [vlist.start for vlist in targets], data)
+
+    assert _positions(vlists[3]) == [1] * 9
+    assert _positions(vlists[1]) == [2] * 9
+    assert _positions(vlists[0]) == [0, 0, 0, 1, 0, 0, 1, 1, 0]
+
+    with pytest.raises(ValueError):
+        domain.set_attribute_bulk('position', [0, 3], array.array('f', [0] * 10))
+    with pytest.raises(ValueError):
+        domain.set_attribute_bulk('position', [0, 3], array.array('d', [0] * 18))
+
+
+def test_attribute_view_and_region():
+    batch = Batch()
+    vlists = [_create(batch) for _ in range(3)]
+    domain = vlists[0].domain
+    batch.draw()
+
+    view = domain.get_attribute_view('position')
+    assert len(view) == 27
+    view[9:18] = array.array('f', [5] * 9)
+    buffer = domain.attrib_name_buffers['position']
+    assert buffer._dirty_ranges == [[0, 27 * 4]]
+    assert _positions(vlists[1]) == [5] * 9
+
+    domain.set_attribute_region('colors', vlists[2].start, 3, array.array('f', [0.5] * 12))
+    assert list(vlists[2].colors[:]) == [0.5] * 12
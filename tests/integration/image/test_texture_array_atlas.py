@@ -0,0 +1,49 @@
+import unittest
+
+import pyglet
+from pyglet.image import ImageData
+from pyglet.image.atlas import AllocatorException, TextureArrayAtlas, TextureArrayBin
+from pyglet.window import Window
+
+
+class TestTextureArrayAtlas(unittest.TestCase):
+    """Test packing images into the layers of a TextureArray."""
+
+    def create_image(self, width, height, color):
+        return ImageData(width, height, 'RGBA', bytes((color, color, color, 255)) * (width * height))
+
+    def setUp(self):
+        self.w = Window(visible=False)
+
+    def tearDown(self) -> None:
+        self.w.close()
+
+    def test_pack_layers(self):
+        atlas = TextureArrayAtlas(64, 64, max_depth=2)
+        regions = [atlas.add(self.create_image(32, 32, i)) for i in range(8)]
+
+        self.assertEqual([region.z for region in regions], [0] * 4 + [1] * 4)
+        self.assertTrue(all(region.owner is atlas.texture for region in regions))
+        self.assertEqual(regions[5].tex_coords[2], 1)
+        self.assertRaises(AllocatorException, atlas.add, self.create_image(32, 32, 0))
+
+    def test_keeps_anchor(self):
+        atlas = TextureArrayAtlas(64, 64, max_depth=1)
+        image = self.create_image(16, 16, 10)
+        image.anchor_x = image.anchor_y = 8
+        region = atlas.add(image)
+
+        self.assertEqual((region.anchor_x, region.anchor_y), (8, 8))
+        data = region.get_image_data().get_data('RGBA', 16 * 4)
+        self.assertEqual(data, bytes((10, 10, 10, 255)) * (16 * 16))
+
+    def test_packed_bin_shares_sprite_group(self):
+        texture_bin = TextureArrayBin(64, 64, max_depth=2, packed=True)
+        regions = [texture_bin.add(self.create_image(32, 32, i)) for i in range(9)]
+        self.assertEqual(len(texture_bin.arrays), 2)
+
+        batch = pyglet.graphics.Batch()
+        sprites = [pyglet.sprite.Sprite(region, batch=batch) for region in regions[:8]]
+        self.assertEqual(len({sprite._group for sprite in sprites}), 1)
+        self.assertEqual(len({sprite._vertex_list.domain for sprite in sprites}), 1)
+        batch.draw()
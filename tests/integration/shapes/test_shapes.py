@@ -0,0 +1,107 @@
+import pytest
+
+import pyglet
+from pyglet.graphics import Batch, vertexdomain
+from pyglet.graphics.stats import RenderStats
+
+
+def test_instanced_shapes():
+    batch = Batch()
+    batch.stats = RenderStats()
+    circles = [pyglet.shapes.InstancedCircle(i * 10, 0, 5 + i, segments=32, batch=batch) for i in range(4)]
+    rectangle = pyglet.shapes.InstancedRectangle(0, 0, 10, 20, batch=batch)
+
+    # The mesh is stored once, and each circle is one instance:
+    domain = circles[0]._vertex_list.domain
+    assert isinstance(domain, vertexdomain.InstancedVertexDomain)
+    assert all(circle._vertex_list.domain is domain for circle in circles)
+    assert domain._instances == 4
+    assert domain.allocator.get_allocated_regions()[1] == [32 * 3]
+    batch.draw()
+    assert batch.stats.draw_calls == 2
+
+    circles[1].color = (255, 0, 0)
+    circles[1].position = (50, 60)
+    circles[1].radius = 8
+    assert circles[1]._vertex_list.colors[:4] == [255, 0, 0, 255]
+    assert list(circles[1]._vertex_list.translation[:2]) == [50, 60]
+    assert list(circles[1]._vertex_list.scale[:2]) == [8, 8]
+
+    # Removing an instance keeps the others in place:
+    circles[0].delete()
+    assert list(circles[3]._vertex_list.translation[:2]) == [30, 0]
+    assert (30, 0) in circles[3]
+
+    # A different mesh is a different domain:
+    circles[2].segments = 16
+    assert circles[2]._vertex_list.domain is not domain
+    rectangle.anchor_position = (5, 10)
+    assert list(rectangle._vertex_list.anchor[:2]) == [5, 10]
+    batch.draw()
+
+
+def test_instanced_circles_of_similar_sizes_share_a_mesh():
+    batch = Batch()
+    small = [pyglet.shapes.InstancedCircle(0, 0, radius, batch=batch) for radius in (1, 10, 20)]
+    large = [pyglet.shapes.InstancedCircle(0, 0, radius, batch=batch) for radius in (30, 40)]
+
+    assert [circle.segments for circle in small + large] == [16, 16, 16, 32, 32]
+    assert small[0]._vertex_list.domain is small[2]._vertex_list.domain
+    assert large[0]._vertex_list.domain is large[1]._vertex_list.domain
+    assert pyglet.shapes.InstancedEllipse(0, 0, 40, 10, batch=batch)._segments == 32
+    assert pyglet.shapes.InstancedSector(0, 0, 100, batch=batch)._segments == 128
+
+
+def test_sdf_shapes():
+    batch = Batch()
+    batch.stats = RenderStats()
+    circle = pyglet.shapes.SDFCircle(50, 50, 20, border=2, batch=batch)
+    rectangle = pyglet.shapes.SDFRoundedRectangle(0, 0, 40, 20, 5, batch=batch)
+    arc = pyglet.shapes.SDFArc(100, 100, 30, angle=90, thickness=4, batch=batch)
+
+    # Every SDF shape is an instance of one quad, drawn in a single call:
+    domain = circle._vertex_list.domain
+    assert rectangle._vertex_list.domain is domain
+    assert arc._vertex_list.domain is domain
+    assert domain._instances == 3
+    batch.draw()
+    assert batch.stats.draw_calls == 1
+
+    # The quad covers the shape. The vertex shader adds the margin for anti-aliasing:
+    assert list(circle._vertex_list.scale[:2]) == [40, 40]
+    assert list(circle._vertex_list.anchor[:2]) == [20, 20]
+    assert list(rectangle._vertex_list.sdf_params[:4]) == [5, 5, 5, 5]
+
+    arc.angle = 180
+    rectangle.radius = (1, 2, 3, 4)
+    circle.border_color = (255, 0, 0, 128)
+    assert list(arc._vertex_list.sdf_params[:4]) == [30, 4, 0, 180]
+    assert list(rectangle._vertex_list.sdf_params[:4]) == [1, 2, 3, 4]
+    assert circle._vertex_list.border_colors[:4] == [255, 0, 0, 128]
+    assert circle.color[3] == 128
+    assert arc._vertex_list.domain is domain
+    batch.draw()
+
+
+def test_bounds_only_reported_to_batches_tracking_them():
+    culled = Batch(culling=True)
+    rectangle = pyglet.shapes.Rectangle(0, 0, 10, 10, batch=Batch())
+    assert not rectangle._batch_tracks_bounds
+
+    rectangle.batch = culled
+    rectangle.position = (40, 40)
+    assert rectangle._batch_tracks_bounds
+    assert culled._cull_grid.query(35, 35, 10, 10) == {rectangle._vertex_list}
+
+    rectangle.batch = None
+    assert not rectangle._batch_tracks_bounds
+    assert not culled._cull_grid
+
+
+def test_sdf_rounded_rectangle_rejects_wrong_radii():
+    rectangle = pyglet.shapes.SDFRoundedRectangle(0, 0, 40, 20, 5, batch=Batch())
+    with pytest.raises(ValueError):
+        rectangle.radius = (1, 2, 3)
+    assert rectangle.radius == (5, 5, 5, 5)
+    with pytest.raises(ValueError):
+        pyglet.shapes.SDFRoundedRectangle(0, 0, 40, 20, (1, 2), batch=Batch())
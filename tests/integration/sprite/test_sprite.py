@@ -0,0 +1,163 @@
+import array
+
+import pytest
+
+import pyglet
+from pyglet.graphics import Batch
+
+
+def test_sprite_batch_view():
+    batch = Batch()
+    image = pyglet.image.SolidColorImagePattern((255, 255, 255, 255)).create_image(8, 8)
+    view = pyglet.sprite.SpriteBatchView(image, 3, batch=batch)
+    assert len(view) == 3
+
+    view.positions[3:6] = array.array('f', (10, 20, 1))
+    view.set_sprite(2, x=5, rotation=45, scale_y=2, color=(255, 0, 0))
+    view.update()
+
+    first, second, third = view.vertex_lists
+    assert list(first.translate[:]) == [0, 0, 0] * 4
+    assert list(second.translate[:]) == [10, 20, 1] * 4
+    assert list(third.translate[:]) == [5, 0, 0] * 4
+    assert list(third.rotation[:]) == [45] * 4
+    assert list(third.scale[:]) == [1, 2] * 4
+    assert list(third.colors[:]) == [255, 0, 0, 255] * 4
+
+    # Only the named arrays are written:
+    view.rotations[0] = 90
+    view.scales[0] = 3
+    view.update('rotations')
+    assert list(first.rotation[:]) == [90] * 4
+    assert list(first.scale[:]) == [1, 1] * 4
+    batch.draw()
+
+    # Drawn outside of the batch, the sprites are one region of their domain:
+    assert view._get_draw_regions() == {first.domain: ([first.index_start], [3 * 6])}
+    view.draw()
+
+    view.delete()
+    assert len(view) == 0
+    assert not view.vertex_lists
+    view.draw()
+
+
+def test_animation_controller():
+    texture = pyglet.image.SolidColorImagePattern((255, 255, 255, 255)).create_image(32, 8).get_texture()
+    frames = [texture.get_region(i * 8, 0, 8, 8) for i in range(4)]
+    animation = pyglet.image.Animation.from_image_sequence(frames, 0.1)
+    batch = Batch()
+    controller = pyglet.sprite.AnimationController()
+    sprites = [pyglet.sprite.Sprite(animation, batch=batch, animation_controller=controller) for _ in range(3)]
+    ends = []
+    sprites[0].push_handlers(on_animation_end=lambda: ends.append(True))
+    assert len(controller) == 3
+
+    controller._update(0.25)
+    assert [sprite.frame_index for sprite in sprites] == [2, 2, 2]
+    assert sprites[1]._vertex_list.tex_coords[:] == pytest.approx(frames[2].tex_coords)
+
+    controller._update(0.1)
+    assert sprites[2].frame_index == 3
+    controller._update(0.1)
+    assert sprites[2].frame_index == 0
+    assert ends == [True]
+
+    # Paused and deleted sprites are no longer advanced:
+    sprites[1].paused = True
+    sprites[2].delete()
+    assert len(controller) == 1
+    controller._update(0.1)
+    assert sprites[0].frame_index == 1
+    assert sprites[1].frame_index == 0
+
+    # A sprite joins at the frame the others are showing:
+    sprites[1].paused = False
+    assert sprites[1].frame_index == 1
+
+    # Removed sprites schedule their own frames again:
+    controller.remove(sprites[0])
+    controller.remove(sprites[1])
+    assert not controller._tracks
+    sprites[0].delete()
+    sprites[1].delete()
+    batch.draw()
+
+
+def test_animation_controller_ends_on_last_frame():
+    texture = pyglet.image.SolidColorImagePattern((255, 255, 255, 255)).create_image(24, 8).get_texture()
+    frames = [texture.get_region(i * 8, 0, 8, 8) for i in range(3)]
+    animation = pyglet.image.Animation.from_image_sequence(frames, 0.1, loop=False)
+    controller = pyglet.sprite.AnimationController()
+    sprite = pyglet.sprite.Sprite(animation, batch=Batch(), animation_controller=controller)
+    seen = []
+
+    @sprite.event
+    def on_animation_end():
+        seen.append((sprite.frame_index, list(sprite._vertex_list.tex_coords[:])))
+
+    controller._update(0.15)
+    assert not seen
+    controller._update(0.1)
+
+    # Handlers see the last frame, as for sprites animated on their own:
+    assert seen == [(2, pytest.approx(frames[2].tex_coords))]
+    assert not controller._tracks
+    sprite.delete()
+
+
+def test_shader_animated_sprite():
+    colors = [(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255)]
+    frames = [pyglet.image.SolidColorImagePattern(color).create_image(8, 8) for color in colors]
+    animation = pyglet.image.Animation.from_image_sequence(frames, 10.0)
+    batch = Batch()
+    sprites = [pyglet.sprite.ShaderAnimatedSprite(animation, x=i * 10, batch=batch) for i in range(3)]
+
+    # The frames are uploaded once, and all sprites are drawn together:
+    group = sprites[0]._group
+    assert group == sprites[1]._group
+    assert group.texture is sprites[2]._group.texture
+    assert len(group.texture) == 3
+    assert group.frame_ends == (10.0, 20.0, 30.0)
+    assert group.looping
+    assert sprites[0].frame_index == 0
+    batch.draw()
+    assert list(group.program['frame_ends'][:3]) == [10.0, 20.0, 30.0]
+
+    # Playing from a frame moves the start time back, pausing freezes the frame:
+    start = sprites[1]._anim_start
+    sprites[1].frame_index = 2
+    assert sprites[1]._anim_start == pytest.approx(start - 20.0, abs=1.0)
+    assert sprites[1].frame_index == 2
+    sprites[1].paused = True
+    assert list(sprites[1]._vertex_list.anim_frame[:]) == [2.0] * 4
+    sprites[1].frame_index = 1
+    assert sprites[1].frame_index == 1
+    sprites[1].paused = False
+    assert list(sprites[1]._vertex_list.anim_frame[:]) == [-1.0] * 4
+    assert sprites[1].frame_index == 1
+
+    with pytest.raises(TypeError):
+        sprites[2].image = frames[0]
+    with pytest.raises(ValueError):
+        pyglet.sprite.ShaderAnimatedSprite(pyglet.image.Animation.from_image_sequence(
+            [frames[0], frames[1].get_region(0, 0, 4, 4)], 1.0))
+
+    sprites[2].delete()
+    batch.draw()
+
+
+def test_bounds_only_reported_to_batches_tracking_them():
+    image = pyglet.image.SolidColorImagePattern((255, 255, 255, 255)).create_image(8, 8)
+    culled = Batch(culling=True)
+    sprite = pyglet.sprite.Sprite(image, batch=Batch())
+    assert not sprite._batch_tracks_bounds
+
+    sprite.batch = culled
+    sprite.position = (20, 20, 0)
+    assert sprite._batch_tracks_bounds
+    assert culled._cull_grid.query(0, 0, 30, 30) == {sprite._vertex_list}
+
+    sprite.batch = None
+    assert not sprite._batch_tracks_bounds
+    assert not culled._cull_grid
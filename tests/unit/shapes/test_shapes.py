@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from pyglet import shapes
 from pyglet.graphics import Batch, Group
 from pyglet.shapes import *
 
@@ -127,3 +128,28 @@ def test_blend_setter(shape_keywords_only):
     shape.blend_mode = blend_mode
     assert shape._group.blend_src == 1  # noqa: SLF001
     assert shape._group.blend_dest == 1  # noqa: SLF001
+
+
+def test_identical_shapes_share_tessellation():
+    shapes._get_unit_circle.cache_clear()  # noqa: SLF001
+    first = Circle(0, 0, 10, segments=16)
+    second = Circle(50, 50, 20, segments=16)
+    assert shapes._get_unit_circle.cache_info().hits == 1  # noqa: SLF001
+
+    # Shapes scale the cached tessellation by their own radius:
+    assert second._get_vertices() == pytest.approx([2 * v for v in first._get_vertices()])  # noqa: SLF001
+
+
+def test_tessellated_default_segments():
+    assert Circle(0, 0, 100)._segments == 80  # noqa: SLF001
+    assert Arc(0, 0, 100)._segments == 80  # noqa: SLF001
+    assert Sector(0, 0, 100)._segments == 80  # noqa: SLF001
+    assert Circle(0, 0, 5)._segments == 14  # noqa: SLF001
+
+
+def test_polygon_indices_cached_by_outline():
+    shapes._get_polygon_indices.cache_clear()  # noqa: SLF001
+    Polygon((0, 0), (10, 0), (10, 10), (0, 10))
+    Polygon((100, 100), (110, 100), (110, 110), (100, 110))
+    info = shapes._get_polygon_indices.cache_info()  # noqa: SLF001
+    assert (info.hits, info.misses) == (1, 1)